@@ -1,5 +1,5 @@
 ﻿import 'react-native-gesture-handler';
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { NavigationContainer } from '@react-navigation/native';
 import { GestureHandlerRootView } from 'react-native-gesture-handler';
 import { SafeAreaProvider } from 'react-native-safe-area-context';
@@ -8,6 +8,7 @@ import { Provider as PaperProvider } from 'react-native-paper';
 import { StatusBar } from 'expo-status-bar';
 import { ActivityIndicator, View } from 'react-native';
 
+import { areSettingsHydrated, hydrateSettings } from '@/lib/settings';
 import AppNavigator from '@/navigation/AppNavigator';
 import { AuthProvider } from '@/providers/AuthProvider';
 import { CurrencyProvider } from '@/providers/CurrencyProvider';
@@ -15,23 +16,11 @@ import { ThemeProvider, useAppTheme } from '@/providers/ThemeProvider';
 
 import { PlanningSettingsProvider } from '@/providers/PlanningSettingsProvider';
 
-const AppShell = () => {
-  const { paperTheme, navigationTheme, isReady } = useAppTheme();
+// Start the settings read while React is still setting up.
+void hydrateSettings();
 
-  if (!isReady) {
-    return (
-      <View
-        style={{
-          flex: 1,
-          alignItems: 'center',
-          justifyContent: 'center',
-          backgroundColor: '#fff',
-        }}
-      >
-        <ActivityIndicator size="large" color="#2563eb" />
-      </View>
-    );
-  }
+const AppShell = () => {
+  const { paperTheme, navigationTheme } = useAppTheme();
 
   return (
     <PaperProvider theme={paperTheme}>
@@ -53,13 +42,49 @@ const Providers = () => (
   </ThemeProvider>
 );
 
+// Every provider reads its saved setting synchronously on mount, so nothing
+// below renders until the single settings read has finished.
+const SettingsGate = ({ children }: { children: React.ReactNode }) => {
+  const [hydrated, setHydrated] = useState(areSettingsHydrated);
+
+  useEffect(() => {
+    if (hydrated) return;
+    let active = true;
+    void hydrateSettings().then(() => {
+      if (active) setHydrated(true);
+    });
+    return () => {
+      active = false;
+    };
+  }, [hydrated]);
+
+  if (!hydrated) {
+    return (
+      <View
+        style={{
+          flex: 1,
+          alignItems: 'center',
+          justifyContent: 'center',
+          backgroundColor: '#fff',
+        }}
+      >
+        <ActivityIndicator size="large" color="#2563eb" />
+      </View>
+    );
+  }
+
+  return <>{children}</>;
+};
+
 export default function App() {
   return (
     <GestureHandlerRootView style={{ flex: 1 }}>
       <SafeAreaProvider>
-        <PlanningSettingsProvider>
-          <Providers />
-        </PlanningSettingsProvider>
+        <SettingsGate>
+          <PlanningSettingsProvider>
+            <Providers />
+          </PlanningSettingsProvider>
+        </SettingsGate>
       </SafeAreaProvider>
     </GestureHandlerRootView>
   );
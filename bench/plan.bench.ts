@@ -0,0 +1,202 @@
+/**
+ * End-to-end planning benchmark with no network and no API keys.
+ *
+ *   npm run bench:plan                       # compare against the baseline
+ *   npm run bench:plan -- --update-baseline  # accept the current numbers
+ *   npm run bench:plan -- --only Italy --runs 5
+ *
+ * Each scenario runs the same stages as usePlanner (geocode, places, weather,
+ * generate) against the stand-ins in bench/plan/standIns.ts, in a fresh Node
+ * process per run so caches start empty and peak memory is its own. Sweeps
+ * cover trip length and interest count for a single city, and the number of
+ * cities for a country.
+ *
+ * Options: --runs N (default 3), --latency MS (Google / Open-Meteo, default
+ * 40), --llm-latency MS (OpenAI, default 600), --tolerance PCT (default 20),
+ * --only TEXT, --update-baseline, --record (see standIns.ts).
+ *
+ * External call counts are deterministic, so any increase is a regression;
+ * times and memory are flagged when they exceed the baseline by more than the
+ * tolerance. The process exits non-zero when something regressed.
+ */
+import { spawnSync } from "child_process";
+import fs from "fs";
+import path from "path";
+
+import type { RunResult, Scenario, WorkerInput, WorkerResult } from "./plan/worker";
+
+type Row = {
+  scenario: string;
+  coldMs: number;
+  warmMs: number;
+  coldCalls: number;
+  warmCalls: number;
+  calls: RunResult["calls"];
+  days: number;
+  stops: number;
+  peakRssMb: number;
+  peakHeapMb: number;
+};
+
+type Baseline = {
+  latencyMs: number;
+  llmLatencyMs: number;
+  scenarios: Record<string, Row>;
+};
+
+const BASELINE_PATH = path.join(__dirname, "plan.baseline.json");
+const WORKER_PATH = path.join(__dirname, "plan", "worker.ts");
+
+const CITY_NIGHTS = [1, 3, 7, 14, 30];
+const CITY_INTERESTS = [1, 3, 6];
+const COUNTRY_CITIES = [2, 4, 6, 8];
+
+// Slack on top of the percentage, so tiny numbers do not flap.
+const MS_SLACK = 25;
+const MB_SLACK = 4;
+
+function parseArgs(argv: string[]) {
+  const value = (flag: string) => {
+    const i = argv.indexOf(flag);
+    return i >= 0 ? argv[i + 1] : undefined;
+  };
+  return {
+    runs: Number(value("--runs") ?? 3),
+    latencyMs: Number(value("--latency") ?? 40),
+    llmLatencyMs: Number(value("--llm-latency") ?? 600),
+    tolerance: Number(value("--tolerance") ?? 20) / 100,
+    only: value("--only"),
+    updateBaseline: argv.includes("--update-baseline"),
+    record: argv.includes("--record"),
+  };
+}
+
+function scenarios(): Scenario[] {
+  const list: Scenario[] = [];
+  for (const nights of CITY_NIGHTS) {
+    for (const interests of CITY_INTERESTS) {
+      list.push({ name: `Paris ${nights}n ${interests}i`, destination: "Paris", nights, interests, cities: 1 });
+    }
+  }
+  for (const cities of COUNTRY_CITIES) {
+    list.push({ name: `Italy 14n ${cities}c`, destination: "Italy", nights: 14, interests: 3, cities });
+  }
+  list.push({ name: "Japan 30n 6c", destination: "Japan", nights: 30, interests: 6, cities: 6 });
+  return list;
+}
+
+function runWorker(input: WorkerInput): WorkerResult {
+  const child = spawnSync(process.execPath, ["-r", "sucrase/register", WORKER_PATH, JSON.stringify(input)], {
+    cwd: path.join(__dirname, ".."),
+    encoding: "utf8",
+    env: process.env,
+  });
+  if (child.status !== 0) {
+    throw new Error(`${input.scenario.name} failed:\n${child.stderr}`);
+  }
+  const lines = child.stdout.trim().split("\n");
+  return JSON.parse(lines[lines.length - 1]) as WorkerResult;
+}
+
+function median(values: number[]) {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 ? sorted[mid] : Math.round((sorted[mid - 1] + sorted[mid]) / 2);
+}
+
+function summarise(scenario: Scenario, results: WorkerResult[]): Row {
+  const [first] = results;
+  return {
+    scenario: scenario.name,
+    coldMs: median(results.map((r) => r.cold.ms)),
+    warmMs: median(results.map((r) => r.warm.ms)),
+    coldCalls: first.cold.totalCalls,
+    warmCalls: first.warm.totalCalls,
+    calls: first.cold.calls,
+    days: first.cold.days,
+    stops: first.cold.stops,
+    peakRssMb: Math.max(...results.map((r) => r.peakRssMb)),
+    peakHeapMb: Math.max(...results.map((r) => r.peakHeapMb)),
+  };
+}
+
+function compare(row: Row, base: Row, tolerance: number, compareTimes: boolean) {
+  const problems: string[] = [];
+  if (row.coldCalls > base.coldCalls) problems.push(`cold calls ${base.coldCalls} -> ${row.coldCalls}`);
+  if (row.warmCalls > base.warmCalls) problems.push(`warm calls ${base.warmCalls} -> ${row.warmCalls}`);
+  const grew = (now: number, before: number, slack: number) => now > before * (1 + tolerance) + slack;
+  if (compareTimes && grew(row.coldMs, base.coldMs, MS_SLACK)) problems.push(`cold ${base.coldMs} -> ${row.coldMs} ms`);
+  if (compareTimes && grew(row.warmMs, base.warmMs, MS_SLACK)) problems.push(`warm ${base.warmMs} -> ${row.warmMs} ms`);
+  if (grew(row.peakHeapMb, base.peakHeapMb, MB_SLACK)) problems.push(`heap ${base.peakHeapMb} -> ${row.peakHeapMb} MB`);
+  return problems;
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const baseline: Baseline | null = fs.existsSync(BASELINE_PATH)
+    ? JSON.parse(fs.readFileSync(BASELINE_PATH, "utf8"))
+    : null;
+  // Times only mean something against a baseline taken with the same delays.
+  const compareTimes =
+    !!baseline && baseline.latencyMs === args.latencyMs && baseline.llmLatencyMs === args.llmLatencyMs;
+  if (baseline && !compareTimes) {
+    console.warn("Latency differs from the baseline; comparing call counts and memory only.");
+  }
+
+  const selected = scenarios().filter((s) => !args.only || s.name.includes(args.only));
+  const rows: Row[] = [];
+  const regressions: string[] = [];
+  for (const scenario of selected) {
+    const results = Array.from({ length: args.record ? 1 : args.runs }, () =>
+      runWorker({ scenario, latencyMs: args.latencyMs, llmLatencyMs: args.llmLatencyMs, record: args.record }),
+    );
+    const row = summarise(scenario, results);
+    rows.push(row);
+    const base = baseline?.scenarios[scenario.name];
+    if (base) {
+      compare(row, base, args.tolerance, compareTimes).forEach((problem) =>
+        regressions.push(`${scenario.name}: ${problem}`),
+      );
+    }
+  }
+
+  console.table(
+    rows.map((row) => {
+      const base = baseline?.scenarios[row.scenario];
+      return {
+        scenario: row.scenario,
+        "cold ms": row.coldMs,
+        "base ms": base?.coldMs ?? "-",
+        "warm ms": row.warmMs,
+        calls: row.coldCalls,
+        "base calls": base?.coldCalls ?? "-",
+        "warm calls": row.warmCalls,
+        nearby: row.calls["places.searchNearby"] ?? 0,
+        days: row.days,
+        stops: row.stops,
+        "rss MB": row.peakRssMb,
+        "heap MB": row.peakHeapMb,
+      };
+    }),
+  );
+
+  if (args.updateBaseline) {
+    const scenariosByName = { ...(baseline?.scenarios ?? {}) };
+    rows.forEach((row) => {
+      scenariosByName[row.scenario] = row;
+    });
+    const next: Baseline = { latencyMs: args.latencyMs, llmLatencyMs: args.llmLatencyMs, scenarios: scenariosByName };
+    fs.writeFileSync(BASELINE_PATH, `${JSON.stringify(next, null, 2)}\n`);
+    console.log(`Baseline written to ${path.relative(process.cwd(), BASELINE_PATH)}`);
+    return;
+  }
+
+  if (regressions.length) {
+    console.error(`\nRegressions against the baseline:\n  ${regressions.join("\n  ")}`);
+    process.exitCode = 1;
+  } else if (baseline) {
+    console.log("\nNo regressions against the baseline.");
+  }
+}
+
+main();
@@ -0,0 +1,99 @@
+/**
+ * In-memory stand-ins for the native modules the planning code imports, so it
+ * can run under plain Node. Import this before anything from src/.
+ */
+import Module from "module";
+
+const storage = new Map<string, string>();
+
+const asyncStorage = {
+  getItem: async (key: string) => storage.get(key) ?? null,
+  setItem: async (key: string, value: string) => {
+    storage.set(key, value);
+  },
+  removeItem: async (key: string) => {
+    storage.delete(key);
+  },
+  multiGet: async (keys: string[]) => keys.map((key) => [key, storage.get(key) ?? null]),
+  multiSet: async (pairs: Array<[string, string]>) => {
+    pairs.forEach(([key, value]) => storage.set(key, value));
+  },
+  multiRemove: async (keys: string[]) => {
+    keys.forEach((key) => storage.delete(key));
+  },
+  getAllKeys: async () => Array.from(storage.keys()),
+  clear: async () => {
+    storage.clear();
+  },
+};
+
+// Photos are never downloaded while planning; these only need to construct.
+class Directory {
+  uri: string;
+  constructor(...parts: Array<string | { uri: string }>) {
+    this.uri = parts.map((part) => (typeof part === "string" ? part : part.uri)).join("/");
+  }
+  create() {}
+}
+
+class File extends Directory {
+  exists = false;
+  size = 0;
+  delete() {}
+  static async downloadFileAsync(): Promise<never> {
+    throw new Error("No file downloads in benchmarks.");
+  }
+}
+
+const noop = () => undefined;
+
+const modules: Record<string, unknown> = {
+  "@react-native-async-storage/async-storage": { __esModule: true, default: asyncStorage },
+  "expo-constants": {
+    __esModule: true,
+    default: {
+      expoConfig: {
+        extra: {
+          GOOGLE_MAPS_API_KEY: process.env.GOOGLE_MAPS_API_KEY || "bench",
+          OPENAI_API_KEY: process.env.OPENAI_API_KEY || "bench",
+        },
+      },
+    },
+  },
+  "expo-file-system": {
+    __esModule: true,
+    Directory,
+    File,
+    Paths: { document: new Directory("file:///bench") },
+  },
+  "react-native": {
+    __esModule: true,
+    Platform: { OS: "ios", select: (options: Record<string, unknown>) => options.ios ?? options.default },
+    AppState: { currentState: "active", addEventListener: () => ({ remove: noop }) },
+    Image: { prefetch: async () => true },
+  },
+};
+
+const ModuleInternals = Module as unknown as {
+  _resolveFilename: (request: string, ...rest: unknown[]) => string;
+  _cache: Record<string, unknown>;
+};
+
+for (const [name, exports] of Object.entries(modules)) {
+  const id = `bench-shim:${name}`;
+  const shim = new Module(id);
+  shim.exports = exports;
+  shim.loaded = true;
+  ModuleInternals._cache[id] = shim;
+}
+
+const resolveFilename = ModuleInternals._resolveFilename;
+ModuleInternals._resolveFilename = function (request: string, ...rest: unknown[]) {
+  if (request in modules) return `bench-shim:${request}`;
+  return resolveFilename.call(this, request, ...rest);
+};
+
+/** Forget everything the app has persisted, as after a fresh install. */
+export function clearStorage() {
+  storage.clear();
+}
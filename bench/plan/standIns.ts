@@ -0,0 +1,348 @@
+/**
+ * Local stand-ins for every external endpoint the planner calls: Geocoding,
+ * Places searchText / searchNearby, Distance Matrix, Open-Meteo and OpenAI
+ * chat completions. `installStandIns` replaces `fetch`, counts requests per
+ * service and answers each one after a simulated delay.
+ *
+ * A request is answered from bench/plan/recordings when a recording of it
+ * exists, and otherwise from a response built deterministically out of
+ * fixtures.json, so any trip length or city count can be swept offline.
+ * With `record` set, requests go to the real APIs and their responses are
+ * saved as recordings (this needs network access and real keys in
+ * GOOGLE_MAPS_API_KEY / OPENAI_API_KEY).
+ */
+import fs from "fs";
+import path from "path";
+
+import { hashText } from "../../src/lib/hash";
+import fixtures from "./fixtures.json";
+
+export type StandInOptions = {
+  /** Mean delay of Google and Open-Meteo responses. */
+  latencyMs: number;
+  /** Mean delay of chat completions, which are far slower in practice. */
+  llmLatencyMs: number;
+  /** How many cities a country itinerary is split into. */
+  cityCount: number;
+  record?: boolean;
+};
+
+export type Service =
+  | "geocode"
+  | "places.searchText"
+  | "places.searchNearby"
+  | "distanceMatrix"
+  | "openMeteo"
+  | "openai";
+
+type Destination = (typeof fixtures.destinations)[keyof typeof fixtures.destinations];
+
+const RECORDINGS_DIR = path.join(__dirname, "recordings");
+const TEXT_SEARCH_RESULTS = 20;
+
+function serviceOf(url: string): Service {
+  if (url.includes("/maps/api/geocode/")) return "geocode";
+  if (url.includes("places:searchText")) return "places.searchText";
+  if (url.includes("places:searchNearby")) return "places.searchNearby";
+  if (url.includes("/maps/api/distancematrix/")) return "distanceMatrix";
+  if (url.includes("api.open-meteo.com")) return "openMeteo";
+  if (url.includes("api.openai.com")) return "openai";
+  throw new Error(`Benchmarks make no network requests; unexpected fetch of ${url}`);
+}
+
+// Small deterministic PRNG so every run sees the same places and delays.
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function seeded(text: string) {
+  return mulberry32(parseInt(hashText(text).slice(0, 6), 36));
+}
+
+function findDestination(query: string): Destination | undefined {
+  const name = query.split(",")[0].trim().toLowerCase();
+  return Object.values(fixtures.destinations).find((d) => d.name.toLowerCase() === name);
+}
+
+function haversineKm(a: { lat: number; lng: number }, b: { lat: number; lng: number }) {
+  const rad = Math.PI / 180;
+  const dLat = (b.lat - a.lat) * rad;
+  const dLng = (b.lng - a.lng) * rad;
+  const h =
+    Math.sin(dLat / 2) ** 2 + Math.cos(a.lat * rad) * Math.cos(b.lat * rad) * Math.sin(dLng / 2) ** 2;
+  return 2 * 6371 * Math.asin(Math.sqrt(h));
+}
+
+// Places scattered within `radiusMeters` of a centre, named after their type.
+function synthesisePlaces(seed: string, center: { lat: number; lng: number }, radiusMeters: number, types: string[], count: number) {
+  const rand = seeded(seed);
+  const names = fixtures.placeNames as Record<string, string[]>;
+  return Array.from({ length: count }, (_, i) => {
+    const type = types[i % types.length] ?? "default";
+    const pool = names[type] ?? names.default;
+    const distance = (radiusMeters / 111320) * Math.sqrt(rand());
+    const angle = rand() * 2 * Math.PI;
+    const lat = center.lat + distance * Math.sin(angle);
+    const lng = center.lng + (distance * Math.cos(angle)) / Math.cos((center.lat * Math.PI) / 180);
+    const id = `bench${hashText(`${seed}|${i}`)}`;
+    const name = `${pool[Math.floor(rand() * pool.length)]} ${i + 1}`;
+    return {
+      id,
+      name: `places/${id}`,
+      displayName: { text: name, languageCode: "en" },
+      formattedAddress: `${i + 1} Bench Street`,
+      location: { latitude: lat, longitude: lng },
+      rating: Math.round((3.8 + rand() * 1.1) * 10) / 10,
+      userRatingCount: 50 + Math.floor(rand() * 5000),
+      priceLevel: 1 + Math.floor(rand() * 3),
+      primaryType: type,
+      types: [type, "point_of_interest", "establishment"],
+      googleMapsUri: `https://maps.google.com/?cid=${id}`,
+      photos: [{ name: `places/${id}/photos/bench` }],
+    };
+  });
+}
+
+function destinationPlace(destination: Destination) {
+  const types =
+    destination.kind === "country" ? ["country", "political"] : ["locality", "political"];
+  return {
+    id: `bench-${destination.name}`,
+    name: `places/bench-${destination.name}`,
+    displayName: { text: destination.name, languageCode: "en" },
+    formattedAddress:
+      destination.kind === "country" ? destination.name : `${destination.name}, ${destination.country}`,
+    location: { latitude: destination.lat, longitude: destination.lng },
+    primaryType: types[0],
+    types,
+  };
+}
+
+function geocodeResponse(url: URL) {
+  const query = url.searchParams.get("address") ?? "";
+  const destination = findDestination(query);
+  const cityStay = Object.values(fixtures.countryCities)
+    .flat()
+    .find((c) => c.city.toLowerCase() === query.split(",")[0].trim().toLowerCase());
+  if (!destination && !cityStay) return { status: "ZERO_RESULTS", results: [] };
+
+  const kind = destination?.kind ?? "locality";
+  const name = destination?.name ?? cityStay!.city;
+  const country =
+    destination?.country ??
+    Object.entries(fixtures.countryCities).find(([, cities]) => cities.includes(cityStay!))![0];
+  const lat = destination?.lat ?? cityStay!.lat;
+  const lng = destination?.lng ?? cityStay!.lng;
+  const components = [{ long_name: country, short_name: country.slice(0, 2).toUpperCase(), types: ["country", "political"] }];
+  if (kind !== "country") components.unshift({ long_name: name, short_name: name, types: ["locality", "political"] });
+  return {
+    status: "OK",
+    results: [
+      {
+        types: [kind, "political"],
+        address_components: components,
+        formatted_address: kind === "country" ? country : `${name}, ${country}`,
+        geometry: { location: { lat, lng } },
+        place_id: `bench-${name}`,
+      },
+    ],
+  };
+}
+
+function textSearchResponse(body: any) {
+  const query: string = body.textQuery ?? "";
+  const destination = findDestination(query);
+  if (destination) return { places: [destinationPlace(destination)] };
+
+  // "<preference> in <region>", biased to a circle or anywhere in the region.
+  const [, preference = query, region = ""] = query.match(/^(.*) in (.*)$/) ?? [];
+  const circle = body.locationBias?.circle;
+  const regionFixture = findDestination(region);
+  const center = circle
+    ? { lat: circle.center.latitude, lng: circle.center.longitude }
+    : regionFixture ?? { lat: 0, lng: 0 };
+  const radius = circle?.radius ?? 50000;
+  const type = preference.includes("food") ? "restaurant" : preference.includes("museum") ? "museum" : "tourist_attraction";
+  return { places: synthesisePlaces(query, center, radius, [type], TEXT_SEARCH_RESULTS) };
+}
+
+function nearbyResponse(body: any) {
+  const circle = body.locationRestriction.circle;
+  const center = { lat: circle.center.latitude, lng: circle.center.longitude };
+  const types: string[] = body.includedTypes ?? [];
+  const seed = `${types.join(",")}|${center.lat},${center.lng}|${circle.radius}`;
+  return { places: synthesisePlaces(seed, center, circle.radius, types, body.maxResultCount ?? 20) };
+}
+
+function distanceMatrixResponse(url: URL) {
+  const mode = url.searchParams.get("mode") ?? "driving";
+  const speedKmh = mode === "walking" ? 4.5 : mode === "transit" ? 60 : 70;
+  const parse = (value: string | null) =>
+    (value ?? "")
+      .split("|")
+      .filter(Boolean)
+      .map((point) => {
+        const [lat, lng] = point.split(",").map(Number);
+        return { lat, lng };
+      });
+  const origins = parse(url.searchParams.get("origins"));
+  const destinations = parse(url.searchParams.get("destinations"));
+  return {
+    status: "OK",
+    rows: origins.map((from) => ({
+      elements: destinations.map((to) => {
+        // Roads are rarely straight; 1.3 is a typical detour factor.
+        const km = haversineKm(from, to) * 1.3;
+        return {
+          status: "OK",
+          distance: { value: Math.round(km * 1000) },
+          duration: { value: Math.round((km / speedKmh) * 3600) },
+        };
+      }),
+    })),
+  };
+}
+
+// Open-Meteo answers a comma-separated list of coordinates with a list of
+// forecasts, and a single coordinate with a bare object.
+function weatherResponse(url: URL) {
+  const start = new Date(`${url.searchParams.get("start_date")}T00:00:00Z`);
+  const end = new Date(`${url.searchParams.get("end_date")}T00:00:00Z`);
+  const latitudes = (url.searchParams.get("latitude") ?? "").split(",");
+  const longitudes = (url.searchParams.get("longitude") ?? "").split(",");
+  const time: string[] = [];
+  for (let d = new Date(start); d <= end; d.setUTCDate(d.getUTCDate() + 1)) {
+    time.push(d.toISOString().slice(0, 10));
+  }
+  const forecasts = latitudes.map((lat, i) => {
+    const rand = seeded(`${lat},${longitudes[i]}|${url.searchParams.get("start_date")}`);
+    return {
+      latitude: Number(lat),
+      longitude: Number(longitudes[i]),
+      daily: {
+        time,
+        weathercode: time.map(() => [0, 1, 2, 3, 61, 80][Math.floor(rand() * 6)]),
+        temperature_2m_max: time.map(() => Math.round(18 + rand() * 10)),
+        temperature_2m_min: time.map(() => Math.round(8 + rand() * 8)),
+        precipitation_probability_max: time.map(() => Math.round(rand() * 100)),
+      },
+    };
+  });
+  return forecasts.length > 1 ? forecasts : forecasts[0];
+}
+
+function chatResponse(body: any, cityCount: number) {
+  let content = "{}";
+  const user = body.messages?.find((m: any) => m.role === "user")?.content;
+  let request: any = null;
+  try {
+    request = JSON.parse(user);
+  } catch {
+    request = null;
+  }
+  if (request?.country) {
+    // City proposal for a country trip: the first `cityCount` fixture cities,
+    // nights spread as evenly as the total allows.
+    const cities = (fixtures.countryCities as Record<string, Array<{ city: string; lat: number; lng: number }>>)[
+      request.country
+    ] ?? [];
+    const chosen = cities.slice(0, Math.max(1, Math.min(cityCount, request.totalNights, cities.length)));
+    const base = Math.floor(request.totalNights / chosen.length);
+    const extra = request.totalNights % chosen.length;
+    content = JSON.stringify({
+      data: chosen.map((c, i) => ({
+        ...c,
+        country: request.country,
+        nights: base + (i < extra ? 1 : 0),
+      })),
+    });
+  }
+  return {
+    id: "chatcmpl-bench",
+    object: "chat.completion",
+    choices: [{ index: 0, message: { role: "assistant", content }, finish_reason: "stop" }],
+  };
+}
+
+function synthesise(service: Service, url: URL, body: any, options: StandInOptions) {
+  switch (service) {
+    case "geocode":
+      return geocodeResponse(url);
+    case "places.searchText":
+      return textSearchResponse(body);
+    case "places.searchNearby":
+      return nearbyResponse(body);
+    case "distanceMatrix":
+      return distanceMatrixResponse(url);
+    case "openMeteo":
+      return weatherResponse(url);
+    case "openai":
+      return chatResponse(body, options.cityCount);
+  }
+}
+
+// Keys are left out so recordings made with one key replay with any other.
+function recordingPath(service: Service, method: string, url: URL, body: string) {
+  const stripped = new URL(url.toString());
+  stripped.searchParams.delete("key");
+  return path.join(RECORDINGS_DIR, `${service}-${hashText(`${method} ${stripped} ${body}`)}.json`);
+}
+
+function jsonResponse(status: number, text: string) {
+  return new Response(text, { status, headers: { "Content-Type": "application/json" } });
+}
+
+function delay(ms: number, signal?: AbortSignal | null) {
+  return new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal?.addEventListener("abort", () => {
+      clearTimeout(timer);
+      reject(signal.reason ?? new Error("Aborted"));
+    });
+  });
+}
+
+/**
+ * Route `fetch` to the stand-ins. The returned counts are live and keyed by
+ * the same service names the tracing summary uses.
+ */
+export function installStandIns(options: StandInOptions) {
+  const realFetch = globalThis.fetch;
+  const calls: Partial<Record<Service, number>> = {};
+  const jitter = mulberry32(42);
+  const recordings = new Set(fs.existsSync(RECORDINGS_DIR) ? fs.readdirSync(RECORDINGS_DIR) : []);
+
+  globalThis.fetch = async (input: RequestInfo | URL, init?: RequestInit) => {
+    const url = new URL(typeof input === "string" ? input : input instanceof URL ? input.href : input.url);
+    const service = serviceOf(url.href);
+    calls[service] = (calls[service] ?? 0) + 1;
+    const method = init?.method ?? "GET";
+    const bodyText = typeof init?.body === "string" ? init.body : "";
+    const file = recordingPath(service, method, url, bodyText);
+
+    if (options.record) {
+      const response = await realFetch(input, init);
+      const text = await response.text();
+      fs.mkdirSync(RECORDINGS_DIR, { recursive: true });
+      fs.writeFileSync(file, JSON.stringify({ method, url: url.origin + url.pathname, status: response.status, body: text }));
+      return jsonResponse(response.status, text);
+    }
+
+    const mean = service === "openai" ? options.llmLatencyMs : options.latencyMs;
+    await delay(mean * (0.75 + jitter() * 0.5), init?.signal);
+    if (recordings.has(path.basename(file))) {
+      const recorded = JSON.parse(fs.readFileSync(file, "utf8"));
+      return jsonResponse(recorded.status, recorded.body);
+    }
+    const body = bodyText ? JSON.parse(bodyText) : undefined;
+    return jsonResponse(200, JSON.stringify(synthesise(service, url, body, options)));
+  };
+
+  return calls;
+}
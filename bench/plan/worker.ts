@@ -0,0 +1,162 @@
+/**
+ * Plan one trip twice in a fresh process: first with empty caches, as on a
+ * new install, then again with whatever the first run cached. Prints one JSON
+ * line with wall-clock time, external calls and peak memory.
+ *
+ * Started by plan.bench.ts; the argument is a JSON `WorkerInput`.
+ */
+import "./shims";
+
+import { performance } from "perf_hooks";
+
+import {
+  fetchPreferencePlaces,
+  fetchWeatherForecastRange,
+  generateTripItinerary,
+  geocodeCity,
+  locateForPlanning,
+} from "../../src/lib/api";
+import { createCallBudget, withCallBudget } from "../../src/lib/http";
+import type { Span } from "../../src/lib/tracing";
+import type { PreferenceOption } from "../../src/types/plans";
+import { installStandIns, Service, StandInOptions } from "./standIns";
+
+export type Scenario = {
+  name: string;
+  destination: string;
+  nights: number;
+  interests: number;
+  /** Cities a country trip is split into; ignored for single cities. */
+  cities: number;
+};
+
+export type WorkerInput = {
+  scenario: Scenario;
+  latencyMs: number;
+  llmLatencyMs: number;
+  record?: boolean;
+};
+
+export type RunResult = {
+  ms: number;
+  calls: Partial<Record<Service, number>>;
+  totalCalls: number;
+  days: number;
+  stops: number;
+};
+
+export type WorkerResult = {
+  cold: RunResult;
+  warm: RunResult;
+  peakRssMb: number;
+  peakHeapMb: number;
+};
+
+const PREFERENCES: PreferenceOption[] = [
+  "Museums",
+  "Food",
+  "Culture",
+  "Nature",
+  "Shopping",
+  "Nightlife",
+  "Relaxation",
+  "Family",
+];
+
+// Tomorrow, so the start of every trip is inside the weather forecast horizon.
+const START = new Date(`${new Date(Date.now() + 86400000).toISOString().slice(0, 10)}T00:00:00Z`);
+
+// Same stages as usePlanner, minus React state and tracing.
+function planTrip(scenario: Scenario) {
+  return planStages(scenario, withCallBudget(undefined, createCallBudget()));
+}
+
+async function planStages(scenario: Scenario, span: Span) {
+  const preferences = PREFERENCES.slice(0, scenario.interests);
+  const endDate = new Date(START);
+  endDate.setUTCDate(START.getUTCDate() + scenario.nights);
+  const startIso = START.toISOString().slice(0, 10);
+  const endIso = endDate.toISOString().slice(0, 10);
+
+  const geocoded = await geocodeCity(scenario.destination, { span });
+  const preferenceScope = geocoded.isCountry ? geocoded.country ?? geocoded.city : geocoded.city;
+  const [places, weatherByDay, located] = await Promise.all([
+    fetchPreferencePlaces(preferenceScope, preferences, geocoded, { span }),
+    fetchWeatherForecastRange(geocoded.latitude, geocoded.longitude, START, endDate, { span }),
+    locateForPlanning(geocoded.city, { span }),
+  ]);
+  return generateTripItinerary({
+    city: geocoded.city,
+    startDate: startIso,
+    endDate: endIso,
+    preferences,
+    places,
+    isCountry: geocoded.isCountry,
+    geocoded: located,
+    weatherByDay,
+  }, { span });
+}
+
+async function measure(scenario: Scenario, calls: Partial<Record<Service, number>>): Promise<RunResult> {
+  const before = { ...calls };
+  const started = performance.now();
+  const itinerary = await planTrip(scenario);
+  const ms = performance.now() - started;
+
+  const made: Partial<Record<Service, number>> = {};
+  let totalCalls = 0;
+  for (const [service, count] of Object.entries(calls) as Array<[Service, number]>) {
+    const delta = count - (before[service] ?? 0);
+    if (delta) {
+      made[service] = delta;
+      totalCalls += delta;
+    }
+  }
+  return {
+    ms: Math.round(ms),
+    calls: made,
+    totalCalls,
+    days: itinerary.days.length,
+    stops: itinerary.days.reduce((total, day) => total + day.stops.length, 0),
+  };
+}
+
+async function main() {
+  const input = JSON.parse(process.argv[2]) as WorkerInput;
+  const options: StandInOptions = {
+    latencyMs: input.latencyMs,
+    llmLatencyMs: input.llmLatencyMs,
+    cityCount: input.scenario.cities,
+    record: input.record,
+  };
+  if (!process.env.BENCH_VERBOSE) {
+    console.log = () => undefined;
+    console.warn = () => undefined;
+  }
+  const calls = installStandIns(options);
+
+  let peakHeap = process.memoryUsage().heapUsed;
+  const sampler = setInterval(() => {
+    peakHeap = Math.max(peakHeap, process.memoryUsage().heapUsed);
+  }, 5);
+
+  const cold = await measure(input.scenario, calls);
+  const warm = await measure(input.scenario, calls);
+  clearInterval(sampler);
+  peakHeap = Math.max(peakHeap, process.memoryUsage().heapUsed);
+
+  const result: WorkerResult = {
+    cold,
+    warm,
+    peakRssMb: Math.round(process.resourceUsage().maxRSS / 1024),
+    peakHeapMb: Math.round(peakHeap / (1024 * 1024)),
+  };
+  process.stdout.write(`${JSON.stringify(result)}\n`);
+  // Cache writes are debounced on timers; nothing left to wait for.
+  process.exit(0);
+}
+
+main().catch((error) => {
+  process.stderr.write(`${error?.stack ?? error}\n`);
+  process.exit(1);
+});
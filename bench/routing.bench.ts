@@ -0,0 +1,121 @@
+/**
+ * Compare the city router in src/engine/routing.ts with the original
+ * nearest-neighbour + 2-opt over raw lat/lng degrees.
+ *
+ *   npm run bench:routing
+ *
+ * Both orders are scored by great-circle length, so the legacy numbers show
+ * the cost of ranking legs by Math.hypot on degrees.
+ */
+import { buildDistanceMatrix, optimiseRoute, routeLength } from "../src/engine/routing";
+import type { LatLng } from "../src/lib/geo";
+
+const SIZES = [4, 6, 8, 10, 15, 25, 40];
+const LATITUDES = [0, 45, 65];
+const TRIALS = 40;
+
+// Small deterministic PRNG so runs are comparable across machines.
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// Copy of the pre-routing-module orderCitiesEfficiently, kept for comparison.
+function legacyOrder(cities: LatLng[]): LatLng[] {
+  if (cities.length <= 2) return cities;
+  const remaining = [...cities];
+  const route: LatLng[] = [remaining.shift()!];
+  while (remaining.length) {
+    const last = route[route.length - 1];
+    let bestIdx = 0;
+    let bestD = Number.POSITIVE_INFINITY;
+    for (let i = 0; i < remaining.length; i++) {
+      const c = remaining[i];
+      const d = Math.hypot(c.lat - last.lat, c.lng - last.lng);
+      if (d < bestD) {
+        bestD = d;
+        bestIdx = i;
+      }
+    }
+    route.push(remaining.splice(bestIdx, 1)[0]);
+  }
+  let improved = true;
+  while (improved) {
+    improved = false;
+    for (let i = 1; i < route.length - 2; i++) {
+      for (let k = i + 1; k < route.length - 1; k++) {
+        const A = route[i - 1];
+        const B = route[i];
+        const C = route[k];
+        const D = route[k + 1];
+        const d1 = Math.hypot(A.lat - B.lat, A.lng - B.lng) + Math.hypot(C.lat - D.lat, C.lng - D.lng);
+        const d2 = Math.hypot(A.lat - C.lat, A.lng - C.lng) + Math.hypot(B.lat - D.lat, B.lng - D.lng);
+        if (d2 < d1) {
+          const middle = route.slice(i, k + 1).reverse();
+          route.splice(i, middle.length, ...middle);
+          improved = true;
+        }
+      }
+    }
+  }
+  return route;
+}
+
+// Cities scattered over a country-sized box (~10° x 10°) centred on `lat`.
+function randomCities(count: number, lat: number, rand: () => number): LatLng[] {
+  return Array.from({ length: count }, () => ({
+    lat: lat + (rand() - 0.5) * 10,
+    lng: 10 + (rand() - 0.5) * 10,
+  }));
+}
+
+function time<T>(fn: () => T): [T, number] {
+  const started = process.hrtime.bigint();
+  const result = fn();
+  return [result, Number(process.hrtime.bigint() - started) / 1e6];
+}
+
+const rows: Array<Record<string, string | number>> = [];
+for (const lat of LATITUDES) {
+  for (const size of SIZES) {
+    const rand = mulberry32(size * 1000 + lat);
+    let legacyKm = 0;
+    let routedKm = 0;
+    let legacyMs = 0;
+    let routedMs = 0;
+    let wins = 0;
+    for (let trial = 0; trial < TRIALS; trial++) {
+      const cities = randomCities(size, lat, rand);
+      const matrix = buildDistanceMatrix(cities);
+      const index = new Map(cities.map((c, i) => [c, i]));
+
+      const [legacy, tLegacy] = time(() => legacyOrder(cities));
+      const [routed, tRouted] = time(() => optimiseRoute(buildDistanceMatrix(cities)));
+
+      const legacyLength = routeLength(legacy.map((c) => index.get(c)!), matrix);
+      const routedLength = routeLength(routed, matrix);
+      legacyKm += legacyLength;
+      routedKm += routedLength;
+      legacyMs += tLegacy;
+      routedMs += tRouted;
+      if (routedLength < legacyLength - 1e-6) wins++;
+    }
+    rows.push({
+      lat,
+      cities: size,
+      "legacy km": Math.round(legacyKm / TRIALS),
+      "routed km": Math.round(routedKm / TRIALS),
+      "saved %": Number((100 * (1 - routedKm / legacyKm)).toFixed(2)),
+      "shorter in": `${wins}/${TRIALS}`,
+      "legacy ms": Number((legacyMs / TRIALS).toFixed(3)),
+      "routed ms": Number((routedMs / TRIALS).toFixed(3)),
+    });
+  }
+}
+
+console.table(rows);
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Apply a manifest of anchored source edits in one pass per file.
+
+Usage:
+    python3 scripts/patch.py scripts/patches/<name>.json [--check] [--root DIR]
+
+A manifest is JSON of the form
+
+    {"edits": [{"op": "...", "file": "src/...", ...}, ...]}
+
+Edits are grouped by file and applied in manifest order to an in-memory list
+of lines. Each file is read once and written once, and nothing is written
+unless every edit in the manifest succeeds. The original encoding details
+(a UTF-8 BOM, CRLF or LF line endings, a trailing newline) are kept as found.
+
+Every edit is idempotent. Re-running a manifest skips the edits that are
+already in place, so `--check` against an up-to-date tree reports nothing to do.
+
+Operations (a "line" matches when it is equal to the anchor once trailing
+whitespace is ignored):
+
+    insert_after       anchor, lines, [unless]
+        Insert `lines` after the first line matching `anchor`. Skipped when
+        `unless` occurs anywhere in the file, or when `lines` already follow
+        the anchor.
+
+    replace_between    start, end, lines
+        Replace the block from the first line matching `start` through the
+        next line matching `end` (both included) with `lines`. Skipped when
+        the block already equals `lines`.
+
+    replace_if_absent  find, lines, absent
+        Replace the consecutive lines `find` with `lines`, unless `absent`
+        already occurs in the file; `find` need not exist in that case.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+BOM = "\ufeff"
+
+
+class PatchError(Exception):
+    pass
+
+
+@dataclass
+class SourceFile:
+    path: Path
+    lines: list[str]
+    bom: bool
+    newline: str
+    trailing_newline: bool
+    original: str = field(repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceFile":
+        raw = path.read_bytes().decode("utf-8")
+        bom = raw.startswith(BOM)
+        text = raw[1:] if bom else raw
+        # Keep whichever ending the file mostly uses; stray ones are normalised to it.
+        crlf = text.count("\r\n")
+        newline = "\r\n" if crlf and crlf >= text.count("\n") - crlf else "\n"
+        text = text.replace("\r\n", "\n")
+        trailing_newline = text.endswith("\n")
+        if trailing_newline:
+            text = text[:-1]
+        return cls(path, text.split("\n"), bom, newline, trailing_newline, raw)
+
+    def render(self) -> str:
+        text = self.newline.join(self.lines)
+        if self.trailing_newline:
+            text += self.newline
+        return (BOM if self.bom else "") + text
+
+    def contains(self, needle: str) -> bool:
+        return needle in "\n".join(self.lines)
+
+    def find_line(self, anchor: str, start: int = 0) -> int:
+        wanted = anchor.rstrip()
+        for index in range(start, len(self.lines)):
+            if self.lines[index].rstrip() == wanted:
+                return index
+        return -1
+
+    def find_block(self, block: list[str]) -> int:
+        wanted = [line.rstrip() for line in block]
+        for index in range(len(self.lines) - len(wanted) + 1):
+            if [line.rstrip() for line in self.lines[index : index + len(wanted)]] == wanted:
+                return index
+        return -1
+
+
+def as_lines(value: object, key: str) -> list[str]:
+    if isinstance(value, str):
+        return value.split("\n")
+    if isinstance(value, list) and all(isinstance(line, str) for line in value):
+        return list(value)
+    raise PatchError(f"'{key}' must be a string or a list of strings")
+
+
+def require(edit: dict, key: str) -> object:
+    if key not in edit:
+        raise PatchError(f"missing '{key}'")
+    return edit[key]
+
+
+def insert_after(source: SourceFile, edit: dict) -> bool:
+    anchor = str(require(edit, "anchor"))
+    lines = as_lines(require(edit, "lines"), "lines")
+    if "unless" in edit and source.contains(str(edit["unless"])):
+        return False
+    index = source.find_line(anchor)
+    if index < 0:
+        raise PatchError(f"anchor not found: {anchor!r}")
+    if source.lines[index + 1 : index + 1 + len(lines)] == lines:
+        return False
+    source.lines[index + 1 : index + 1] = lines
+    return True
+
+
+def replace_between(source: SourceFile, edit: dict) -> bool:
+    start_marker = str(require(edit, "start"))
+    end_marker = str(require(edit, "end"))
+    lines = as_lines(require(edit, "lines"), "lines")
+    start = source.find_line(start_marker)
+    if start < 0:
+        raise PatchError(f"start marker not found: {start_marker!r}")
+    end = source.find_line(end_marker, start + 1)
+    if end < 0:
+        raise PatchError(f"end marker not found after line {start + 1}: {end_marker!r}")
+    if source.lines[start : end + 1] == lines:
+        return False
+    source.lines[start : end + 1] = lines
+    return True
+
+
+def replace_if_absent(source: SourceFile, edit: dict) -> bool:
+    absent = str(require(edit, "absent"))
+    if source.contains(absent):
+        return False
+    block = as_lines(require(edit, "find"), "find")
+    lines = as_lines(require(edit, "lines"), "lines")
+    index = source.find_block(block)
+    if index < 0:
+        raise PatchError(f"block not found, starting {block[0]!r}")
+    source.lines[index : index + len(block)] = lines
+    return True
+
+
+OPERATIONS: dict[str, Callable[[SourceFile, dict], bool]] = {
+    "insert_after": insert_after,
+    "replace_between": replace_between,
+    "replace_if_absent": replace_if_absent,
+}
+
+
+def apply_manifest(manifest: dict, root: Path) -> tuple[list[SourceFile], list[str]]:
+    """Apply every edit in memory. Returns the files that changed and a log."""
+    edits = manifest.get("edits")
+    if not isinstance(edits, list):
+        raise PatchError("manifest needs an 'edits' list")
+
+    sources: dict[str, SourceFile] = {}
+    touched: set[str] = set()
+    log: list[str] = []
+    errors: list[str] = []
+    for number, edit in enumerate(edits, start=1):
+        label = f"#{number} {edit.get('op', '?')} {edit.get('file', '?')}"
+        if edit.get("note"):
+            label += f" ({edit['note']})"
+        try:
+            operation = OPERATIONS.get(str(require(edit, "op")))
+            if not operation:
+                raise PatchError(f"unknown op {edit['op']!r}")
+            name = str(require(edit, "file"))
+            if name not in sources:
+                sources[name] = SourceFile.load(root / name)
+            changed = operation(sources[name], edit)
+            if changed:
+                touched.add(name)
+            log.append(f"{'applied' if changed else 'skipped'} {label}")
+        except (PatchError, OSError, UnicodeDecodeError) as error:
+            errors.append(f"failed  {label}: {error}")
+    if errors:
+        raise PatchError("\n".join(log + errors))
+
+    # A file whose edits were all skipped is left alone, stray line endings included.
+    changed_files = [
+        source
+        for name, source in sources.items()
+        if name in touched and source.render() != source.original
+    ]
+    return changed_files, log
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("manifest", type=Path)
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent)
+    parser.add_argument("--check", action="store_true", help="report what would change; write nothing")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = json.loads(args.manifest.read_text(encoding="utf-8"))
+        changed, log = apply_manifest(manifest, args.root)
+    except (PatchError, OSError, json.JSONDecodeError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    print("\n".join(log))
+    for source in changed:
+        if not args.check:
+            source.path.write_bytes(source.render().encode("utf-8"))
+        print(f"{'would write' if args.check else 'wrote'} {source.path.relative_to(args.root)}")
+    if not changed:
+        print("nothing to change")
+    return 1 if args.check and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
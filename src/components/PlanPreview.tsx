@@ -1,5 +1,13 @@
-import React, { useMemo, useState } from 'react';
-import { Image, Linking, Pressable, ScrollView, StyleSheet, View } from 'react-native';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import {
+  FlatList,
+  Image,
+  Linking,
+  ListRenderItem,
+  Pressable,
+  StyleSheet,
+  View,
+} from 'react-native';
 import { MaterialCommunityIcons } from '@expo/vector-icons';
 import {
   ActivityIndicator,
@@ -13,7 +21,9 @@ import {
   Text,
 } from 'react-native-paper';
 
-import { ItineraryStop, TripItinerary } from '../types/plans';
+import usePlacePhoto from '../hooks/usePlacePhoto';
+import { prefetchStopPhotos } from '../lib/photos';
+import { ItineraryDay, ItineraryStop, TripItinerary } from '../types/plans';
 
 type PlanPreviewProps = {
   itinerary: TripItinerary;
@@ -23,12 +33,16 @@ type PlanPreviewProps = {
   onRemoveStop?: (dayIndex: number, stopIndex: number) => void;
   onReplaceStop?: (dayIndex: number, stopIndex: number) => Promise<void>;
   mutatingStop?: { dayIndex: number; stopIndex: number } | null;
+  onActiveDayChange?: (dayIndex: number) => void;
 };
 
 type ExpandedState = Record<number, Set<number>>;
 
 type MenuTarget = { dayIndex: number; stopIndex: number } | null;
 
+// Enough chips to fill the row on a phone; the rest mount as it scrolls.
+const DAY_CHIPS_INITIAL = 7;
+
 const palette = {
   sand: '#F5E6C8',
   sea: '#99D5C9',
@@ -76,6 +90,226 @@ const openUrl = (url?: string) => {
   Linking.openURL(url).catch(() => undefined);
 };
 
+const StopPhoto = ({ stop }: { stop: ItineraryStop }) => {
+  const uri = usePlacePhoto(stop, 'thumbnail');
+  if (uri) {
+    return <Image source={{ uri }} style={styles.stopImage} />;
+  }
+  return (
+    <View style={[styles.stopImage, styles.stopImageFallback, { backgroundColor: palette.sky }]}>
+      <MaterialCommunityIcons name={categoryIcon[stop.category]} size={28} color={'#1F2937'} />
+    </View>
+  );
+};
+
+type StopRowProps = {
+  stop: ItineraryStop;
+  dayIndex: number;
+  stopIndex: number;
+  currencySymbol: string;
+  expanded: boolean;
+  menuVisible: boolean;
+  mutating: boolean;
+  locked: boolean;
+  canRemove: boolean;
+  canReplace: boolean;
+  onToggle: (dayIndex: number, stopIndex: number) => void;
+  onOpenMenu: (dayIndex: number, stopIndex: number) => void;
+  onDismissMenu: () => void;
+  onRemove: (dayIndex: number, stopIndex: number) => void;
+  onReplace: (dayIndex: number, stopIndex: number) => void;
+};
+
+// Fields of a stop that StopRow renders; anything else changing on the stop
+// object (a fresh copy after an edit elsewhere in the day) skips the render.
+const displayedStopFields = [
+  'title',
+  'description',
+  'photo_url',
+  'photo_name',
+  'google_maps_url',
+  'website_url',
+  'estimated_cost',
+  'estimated_price_usd',
+  'duration',
+  'travel_time_from_previous',
+  'time_block',
+  'category',
+] as const;
+
+// Handlers are left out: PlanPreview keeps them stable and routes them
+// through refs, so only what is on screen decides whether a row re-renders.
+const sameStopRow = (prev: StopRowProps, next: StopRowProps) =>
+  prev.dayIndex === next.dayIndex &&
+  prev.stopIndex === next.stopIndex &&
+  prev.currencySymbol === next.currencySymbol &&
+  prev.expanded === next.expanded &&
+  prev.menuVisible === next.menuVisible &&
+  prev.mutating === next.mutating &&
+  prev.locked === next.locked &&
+  prev.canRemove === next.canRemove &&
+  prev.canReplace === next.canReplace &&
+  (prev.stop === next.stop ||
+    displayedStopFields.every((field) => prev.stop[field] === next.stop[field]));
+
+const StopRow = React.memo(
+  ({
+    stop,
+    dayIndex,
+    stopIndex,
+    currencySymbol,
+    expanded,
+    menuVisible,
+    mutating,
+    locked,
+    canRemove,
+    canReplace,
+    onToggle,
+    onOpenMenu,
+    onDismissMenu,
+    onRemove,
+    onReplace,
+  }: StopRowProps) => (
+    <Surface style={styles.stopCard} elevation={1}>
+      <View style={styles.stopHeader}>
+        <StopPhoto stop={stop} />
+        <Pressable
+          style={styles.stopHeaderContent}
+          onPress={() => onToggle(dayIndex, stopIndex)}
+          disabled={locked}
+        >
+          <View style={styles.stopTitleRow}>
+            <Text variant="titleMedium" style={styles.stopTitle} numberOfLines={2}>
+              {stop.title}
+            </Text>
+            <MaterialCommunityIcons
+              name={expanded ? 'chevron-up' : 'chevron-down'}
+              size={20}
+              color={palette.slate}
+            />
+          </View>
+          <Text variant="bodySmall" style={styles.stopTime}>
+            {stop.time_block || 'Flexible start'} -{' '}
+            {stop.travel_time_from_previous || 'Travel TBD'}
+          </Text>
+          <View style={styles.stopBadgesRow}>
+            <Chip
+              compact
+              style={[
+                styles.badgeChip,
+                { backgroundColor: priceBadgeColor(stop.estimated_cost) },
+              ]}
+              textStyle={styles.badgeText}
+            >
+              {`${stop.estimated_cost} - ${currencySymbol}${stop.estimated_price_usd.toFixed(0)}`}
+            </Chip>
+            <Chip compact style={styles.badgeChip} textStyle={styles.badgeText}>
+              {stop.duration}
+            </Chip>
+            <Chip compact style={styles.badgeChip} textStyle={styles.badgeText}>
+              {categoryLabel[stop.category]}
+            </Chip>
+          </View>
+        </Pressable>
+        {(canRemove || canReplace) && (
+          <Menu
+            visible={menuVisible}
+            onDismiss={onDismissMenu}
+            anchor={
+              mutating ? (
+                <ActivityIndicator size="small" color={palette.slate} />
+              ) : (
+                <IconButton
+                  icon="dots-vertical"
+                  disabled={locked}
+                  onPress={() => onOpenMenu(dayIndex, stopIndex)}
+                />
+              )
+            }
+          >
+            {canReplace ? (
+              <Menu.Item
+                leadingIcon="autorenew"
+                title="Replace this stop"
+                disabled={locked}
+                onPress={() => onReplace(dayIndex, stopIndex)}
+              />
+            ) : null}
+            {canRemove ? (
+              <Menu.Item
+                leadingIcon="delete"
+                title="Remove this stop"
+                disabled={locked}
+                onPress={() => onRemove(dayIndex, stopIndex)}
+              />
+            ) : null}
+          </Menu>
+        )}
+      </View>
+      {expanded ? (
+        <View style={styles.stopBody}>
+          <Text variant="bodyMedium" style={styles.stopDescription}>
+            {stop.description || 'Details coming soon.'}
+          </Text>
+          <View style={styles.stopActions}>
+            <Button
+              mode="contained"
+              icon="map-marker"
+              onPress={() => openUrl(stop.google_maps_url)}
+            >
+              View on map
+            </Button>
+            {stop.website_url ? (
+              <Button
+                mode="outlined"
+                icon="web"
+                onPress={() => openUrl(stop.website_url)}
+              >
+                Visit website
+              </Button>
+            ) : null}
+          </View>
+        </View>
+      ) : null}
+    </Surface>
+  ),
+  sameStopRow,
+);
+
+type DayChipProps = {
+  date: string;
+  dayIndex: number;
+  active: boolean;
+  onSelect: (dayIndex: number) => void;
+};
+
+const DayChip = React.memo(({ date, dayIndex, active, onSelect }: DayChipProps) => (
+  <Chip
+    onPress={() => onSelect(dayIndex)}
+    selected={active}
+    style={[styles.dayChip, active && { backgroundColor: palette.sea }]}
+    textStyle={active ? styles.dayChipTextActive : styles.dayChipText}
+  >
+    {date}
+  </Chip>
+));
+
+const dayKey = (day: ItineraryDay, index: number) => `${day.date}-${index}`;
+
+/**
+ * Keys for a day's stops that survive edits to other stops: the place id
+ * (or title), with a counter for repeats, rather than the list position.
+ */
+const stopKeys = (stops: ItineraryStop[]) => {
+  const seen = new Map<string, number>();
+  return stops.map((stop) => {
+    const base = stop.google_place_id || stop.title;
+    const count = seen.get(base) ?? 0;
+    seen.set(base, count + 1);
+    return count ? `${base}#${count}` : base;
+  });
+};
+
 const PlanPreview: React.FC<PlanPreviewProps> = ({
   itinerary,
   saving,
@@ -84,6 +318,7 @@ const PlanPreview: React.FC<PlanPreviewProps> = ({
   onRemoveStop,
   onReplaceStop,
   mutatingStop,
+  onActiveDayChange,
 }) => {
   const [activeDayIndex, setActiveDayIndex] = useState(0);
   const [expandedStops, setExpandedStops] = useState<ExpandedState>({ 0: new Set([0]) });
@@ -142,14 +377,23 @@ const PlanPreview: React.FC<PlanPreviewProps> = ({
 
   const highlights = Array.isArray(itinerary.highlights) ? itinerary.highlights : [];
   const activeDay = itinerary.days[activeDayIndex];
-  if (!activeDay) return null;
+  const activeStopKeys = useMemo(
+    () => (activeDay ? stopKeys(activeDay.stops) : []),
+    [activeDay],
+  );
 
-  const isStopExpanded = (dayIdx: number, stopIdx: number) => {
-    const set = expandedStops[dayIdx];
-    return set ? set.has(stopIdx) : false;
-  };
+  // Photos for the neighbouring days, so switching days shows them at once.
+  useEffect(() => {
+    [itinerary.days[activeDayIndex + 1], itinerary.days[activeDayIndex - 1]].forEach(
+      (day) => day && prefetchStopPhotos(day.stops, 'thumbnail'),
+    );
+  }, [activeDayIndex, itinerary.days]);
 
-  const toggleStop = (dayIdx: number, stopIdx: number) => {
+  // Rows keep the same handlers across renders; the latest props are read here.
+  const handlersRef = useRef({ onActiveDayChange, onRemoveStop, onReplaceStop });
+  handlersRef.current = { onActiveDayChange, onRemoveStop, onReplaceStop };
+
+  const toggleStop = useCallback((dayIdx: number, stopIdx: number) => {
     setExpandedStops((prev) => {
       const currentSet = new Set(prev[dayIdx] ?? []);
       if (currentSet.has(stopIdx)) {
@@ -162,14 +406,62 @@ const PlanPreview: React.FC<PlanPreviewProps> = ({
         [dayIdx]: currentSet,
       };
     });
-  };
+  }, []);
+
+  const openMenu = useCallback((dayIndex: number, stopIndex: number) => {
+    setMenuTarget({ dayIndex, stopIndex });
+  }, []);
+
+  const dismissMenu = useCallback(() => setMenuTarget(null), []);
+
+  const handleReplace = useCallback(async (dayIndex: number, stopIndex: number) => {
+    setMenuTarget(null);
+    const { onReplaceStop: replace } = handlersRef.current;
+    if (!replace) return;
+    try {
+      await replace(dayIndex, stopIndex);
+    } catch (error) {
+      console.warn('Failed to replace stop', error);
+    }
+  }, []);
 
-  const handleDayChange = (index: number) => {
+  const handleRemove = useCallback((dayIndex: number, stopIndex: number) => {
+    setMenuTarget(null);
+    const { onRemoveStop: remove } = handlersRef.current;
+    if (!remove) return;
+    try {
+      remove(dayIndex, stopIndex);
+    } catch (error) {
+      console.warn('Failed to remove stop', error);
+    }
+  }, []);
+
+  const handleDayChange = useCallback((index: number) => {
     setActiveDayIndex(index);
+    handlersRef.current.onActiveDayChange?.(index);
     setExpandedStops((prev) => ({
       ...prev,
       [index]: prev[index] ?? new Set([0]),
     }));
+  }, []);
+
+  const renderDayChip = useCallback<ListRenderItem<ItineraryDay>>(
+    ({ item, index }) => (
+      <DayChip
+        date={item.date}
+        dayIndex={index}
+        active={index === activeDayIndex}
+        onSelect={handleDayChange}
+      />
+    ),
+    [activeDayIndex, handleDayChange],
+  );
+
+  if (!activeDay) return null;
+
+  const isStopExpanded = (dayIdx: number, stopIdx: number) => {
+    const set = expandedStops[dayIdx];
+    return set ? set.has(stopIdx) : false;
   };
 
   return (
@@ -275,26 +567,17 @@ const PlanPreview: React.FC<PlanPreviewProps> = ({
             </Chip>
           ) : null}
         </View>
-        <ScrollView
+        <FlatList
           horizontal
+          data={itinerary.days}
+          keyExtractor={dayKey}
+          renderItem={renderDayChip}
+          extraData={activeDayIndex}
+          initialNumToRender={DAY_CHIPS_INITIAL}
+          windowSize={5}
           showsHorizontalScrollIndicator={false}
           style={styles.daySelector}
-        >
-          {itinerary.days.map((day, index) => {
-            const isActive = index === activeDayIndex;
-            return (
-              <Chip
-                key={day.date}
-                onPress={() => handleDayChange(index)}
-                selected={isActive}
-                style={[styles.dayChip, isActive && { backgroundColor: palette.sea }]}
-                textStyle={isActive ? styles.dayChipTextActive : styles.dayChipText}
-              >
-                {day.date}
-              </Chip>
-            );
-          })}
-        </ScrollView>
+        />
 
         <View style={styles.daySummary}>
           <Text variant="titleMedium" style={styles.daySummaryTitle}>
@@ -315,164 +598,31 @@ const PlanPreview: React.FC<PlanPreviewProps> = ({
         <Divider style={styles.divider} />
 
         <View style={styles.stopList}>
-          {activeDay.stops.map((stop, index) => {
-            const expanded = isStopExpanded(activeDayIndex, index);
-            const menuVisible =
-              menuTarget?.dayIndex === activeDayIndex && menuTarget.stopIndex === index;
-            const isMutating =
-              mutatingStop?.dayIndex === activeDayIndex &&
-              mutatingStop.stopIndex === index;
-
-            return (
-              <Surface
-                key={`${stop.title}-${index}`}
-                style={styles.stopCard}
-                elevation={1}
-              >
-                <View style={styles.stopHeader}>
-                  {stop.photo_url ? (
-                    <Image source={{ uri: stop.photo_url }} style={styles.stopImage} />
-                  ) : (
-                    <View
-                      style={[
-                        styles.stopImage,
-                        styles.stopImageFallback,
-                        { backgroundColor: palette.sky },
-                      ]}
-                    >
-                      <MaterialCommunityIcons
-                        name={categoryIcon[stop.category]}
-                        size={28}
-                        color={'#1F2937'}
-                      />
-                    </View>
-                  )}
-                  <Pressable
-                    style={styles.stopHeaderContent}
-                    onPress={() => toggleStop(activeDayIndex, index)}
-                    disabled={!!mutatingStop}
-                  >
-                    <View style={styles.stopTitleRow}>
-                      <Text
-                        variant="titleMedium"
-                        style={styles.stopTitle}
-                        numberOfLines={2}
-                      >
-                        {stop.title}
-                      </Text>
-                      <MaterialCommunityIcons
-                        name={expanded ? 'chevron-up' : 'chevron-down'}
-                        size={20}
-                        color={palette.slate}
-                      />
-                    </View>
-                    <Text variant="bodySmall" style={styles.stopTime}>
-                      {stop.time_block || 'Flexible start'} -{' '}
-                      {stop.travel_time_from_previous || 'Travel TBD'}
-                    </Text>
-                    <View style={styles.stopBadgesRow}>
-                      <Chip
-                        compact
-                        style={[
-                          styles.badgeChip,
-                          { backgroundColor: priceBadgeColor(stop.estimated_cost) },
-                        ]}
-                        textStyle={styles.badgeText}
-                      >
-                        {`${stop.estimated_cost} - ${currencySymbol}${stop.estimated_price_usd.toFixed(0)}`}
-                      </Chip>
-                      <Chip compact style={styles.badgeChip} textStyle={styles.badgeText}>
-                        {stop.duration}
-                      </Chip>
-                      <Chip compact style={styles.badgeChip} textStyle={styles.badgeText}>
-                        {categoryLabel[stop.category]}
-                      </Chip>
-                    </View>
-                  </Pressable>
-                  {(onRemoveStop || onReplaceStop) && (
-                    <Menu
-                      visible={menuVisible}
-                      onDismiss={() => setMenuTarget(null)}
-                      anchor={
-                        isMutating ? (
-                          <ActivityIndicator size="small" color={palette.slate} />
-                        ) : (
-                          <IconButton
-                            icon="dots-vertical"
-                            disabled={!!mutatingStop}
-                            onPress={() =>
-                              setMenuTarget({
-                                dayIndex: activeDayIndex,
-                                stopIndex: index,
-                              })
-                            }
-                          />
-                        )
-                      }
-                    >
-                      {onReplaceStop ? (
-                        <Menu.Item
-                          leadingIcon="autorenew"
-                          title="Replace this stop"
-                          disabled={!!mutatingStop}
-                          onPress={async () => {
-                            setMenuTarget(null);
-                            if (!onReplaceStop) return;
-                            try {
-                              await onReplaceStop(activeDayIndex, index);
-                            } catch (error) {
-                              console.warn('Failed to replace stop', error);
-                            }
-                          }}
-                        />
-                      ) : null}
-                      {onRemoveStop ? (
-                        <Menu.Item
-                          leadingIcon="delete"
-                          title="Remove this stop"
-                          disabled={!!mutatingStop}
-                          onPress={() => {
-                            setMenuTarget(null);
-                            if (!onRemoveStop) return;
-                            try {
-                              onRemoveStop(activeDayIndex, index);
-                            } catch (error) {
-                              console.warn('Failed to remove stop', error);
-                            }
-                          }}
-                        />
-                      ) : null}
-                    </Menu>
-                  )}
-                </View>
-                {expanded ? (
-                  <View style={styles.stopBody}>
-                    <Text variant="bodyMedium" style={styles.stopDescription}>
-                      {stop.description || 'Details coming soon.'}
-                    </Text>
-                    <View style={styles.stopActions}>
-                      <Button
-                        mode="contained"
-                        icon="map-marker"
-                        onPress={() => openUrl(stop.google_maps_url)}
-                      >
-                        View on map
-                      </Button>
-                      {stop.website_url ? (
-                        <Button
-                          mode="outlined"
-                          icon="web"
-                          onPress={() => openUrl(stop.website_url)}
-                        >
-                          Visit website
-                        </Button>
-                      ) : null}
-                    </View>
-                  </View>
-                ) : null}
-              </Surface>
-            );
-          })}
+          {activeDay.stops.map((stop, index) => (
+            <StopRow
+              key={activeStopKeys[index]}
+              stop={stop}
+              dayIndex={activeDayIndex}
+              stopIndex={index}
+              currencySymbol={currencySymbol}
+              expanded={isStopExpanded(activeDayIndex, index)}
+              menuVisible={
+                menuTarget?.dayIndex === activeDayIndex && menuTarget.stopIndex === index
+              }
+              mutating={
+                mutatingStop?.dayIndex === activeDayIndex &&
+                mutatingStop.stopIndex === index
+              }
+              locked={!!mutatingStop}
+              canRemove={!!onRemoveStop}
+              canReplace={!!onReplaceStop}
+              onToggle={toggleStop}
+              onOpenMenu={openMenu}
+              onDismissMenu={dismissMenu}
+              onRemove={handleRemove}
+              onReplace={handleReplace}
+            />
+          ))}
         </View>
       </Surface>
 
@@ -0,0 +1,172 @@
+import type { Interest, PlaceLite, PriceLevel } from "../types";
+import { nearbyPlacesBatch } from "../services/maps";
+import type { NearbyQuery } from "../services/maps";
+import { hasCoordinates } from "../lib/geo";
+import type { Span } from "../lib/tracing";
+
+export type ActivityCandidate = PlaceLite & { _category?: Interest };
+
+/** Candidates fetched once for a whole city stay, each list sorted by quality. */
+export type CityStayPool = {
+  dayCount: number;
+  meals: PlaceLite[];
+  activities: ActivityCandidate[];
+  nightlife: ActivityCandidate[];
+};
+
+/** The share of a pool handed to a single day of the stay. */
+export type DaySlots = {
+  meals: PlaceLite[];
+  activities: ActivityCandidate[];
+  nightlife: ActivityCandidate[];
+};
+
+const MEALS_PER_DAY = 3;
+const ACTIVITIES_PER_DAY = 2;
+const NIGHTLIFE_PER_DAY = 1;
+
+const INTEREST_TO_TYPES: Record<Interest, string[]> = {
+  food: ["restaurant", "cafe", "bakery"],
+  culture: ["tourist_attraction", "point_of_interest"],
+  museums: ["museum"],
+  parks: ["park"],
+  art: ["art_gallery"],
+  landmarks: ["tourist_attraction"],
+  shopping: ["shopping_mall"],
+  nightlife: ["bar", "night_club"],
+};
+
+export function sortPlacesByQuality<T extends { rating?: number; userRatingsTotal?: number; priceLevel?: PriceLevel; name?: string }>(
+  places: T[],
+): T[] {
+  return [...places].sort((a, b) => {
+    const ratingDiff = (b.rating ?? 0) - (a.rating ?? 0);
+    if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
+    const reviewsDiff = (b.userRatingsTotal ?? 0) - (a.userRatingsTotal ?? 0);
+    if (reviewsDiff !== 0) return reviewsDiff;
+    const priceDiff = (a.priceLevel ?? 2) - (b.priceLevel ?? 2);
+    if (priceDiff !== 0) return priceDiff;
+    const nameA = (a as any).name ?? "";
+    const nameB = (b as any).name ?? "";
+    return nameA.localeCompare(nameB);
+  });
+}
+
+export function mealPriceLevelsForBudget(perDay: number): PriceLevel[] {
+  return perDay < 50 ? [0, 1, 2] : perDay < 100 ? [1, 2, 3] : [2, 3, 4];
+}
+
+function dedupeById<T extends { id: string }>(places: T[]): T[] {
+  const seen = new Set<string>();
+  return places.filter((p) => (seen.has(p.id) ? false : (seen.add(p.id), true)));
+}
+
+// A place Places returned without a location cannot be routed or timed.
+function locatedOnly<T extends PlaceLite>(places: T[]): T[] {
+  return places.filter((p) => hasCoordinates(p));
+}
+
+/**
+ * Fetch meals, activities and nightlife once for a city stay.
+ *
+ * Every query goes out in a single batch, including the wider fallback
+ * searches, which are issued speculatively and only used when the first pass
+ * cannot cover every day of the stay.
+ */
+export async function loadCityStayPool(params: {
+  lat: number;
+  lng: number;
+  interests: Interest[];
+  budgetPerDay: number;
+  dayCount: number;
+  span?: Span;
+}): Promise<CityStayPool> {
+  const { lat, lng } = params;
+  const dayCount = Math.max(1, params.dayCount);
+  const interestList =
+    params.interests && params.interests.length
+      ? params.interests
+      : (["landmarks", "parks"] as Interest[]);
+
+  type PoolTag = Interest | "meal" | "meal_expanded" | "activity_extra";
+  const queries: Array<NearbyQuery & { tag: PoolTag }> = [
+    {
+      tag: "meal",
+      lat, lng, radiusMeters: 2500, includedTypes: ["restaurant"], minRating: 4.1,
+      priceLevels: mealPriceLevelsForBudget(params.budgetPerDay), maxResults: 20,
+    },
+    {
+      tag: "meal_expanded",
+      lat, lng, radiusMeters: 6000, includedTypes: ["restaurant"], minRating: 4.1,
+      priceLevels: [0, 1, 2, 3, 4], maxResults: 20,
+    },
+    ...interestList.map((cat) => ({
+      tag: cat,
+      lat, lng, radiusMeters: 4000, includedTypes: INTEREST_TO_TYPES[cat] ?? ["tourist_attraction"],
+      minRating: 4.2, maxResults: 20,
+    })),
+    {
+      tag: "activity_extra",
+      lat, lng, radiusMeters: 5000, includedTypes: ["tourist_attraction", "park"], minRating: 4.0,
+      maxResults: 20,
+    },
+    {
+      tag: "nightlife",
+      lat, lng, radiusMeters: 3200, includedTypes: ["bar", "night_club"], minRating: 4.2,
+      maxResults: 12,
+    },
+  ];
+
+  const [meals, mealsExpanded, ...rest] = (await nearbyPlacesBatch(queries, { span: params.span })).map(
+    locatedOnly,
+  );
+  const byInterest = rest.slice(0, interestList.length);
+  const [activityExtra, nightlife] = rest.slice(interestList.length);
+
+  let mealOptions: PlaceLite[] = meals;
+  if (mealOptions.length < MEALS_PER_DAY * dayCount) {
+    mealOptions = dedupeById(mealOptions.concat(mealsExpanded));
+  }
+
+  let activityOptions: ActivityCandidate[] = dedupeById(
+    byInterest.flat().map((place) => ({ ...place, _category: place._category as Interest })),
+  );
+  if (activityOptions.length < ACTIVITIES_PER_DAY * dayCount) {
+    activityOptions = dedupeById(
+      activityOptions.concat(
+        activityExtra.map((place) => ({ ...place, _category: "landmarks" as Interest })),
+      ),
+    );
+  }
+
+  return {
+    dayCount,
+    meals: sortPlacesByQuality(mealOptions),
+    activities: sortPlacesByQuality(activityOptions),
+    nightlife: sortPlacesByQuality(
+      nightlife.map((place) => ({ ...place, _category: "nightlife" as Interest })),
+    ),
+  };
+}
+
+// Deal a sorted list out across the days of a stay. With enough candidates each
+// day gets a disjoint, strided share (so every day sees a mix of the top picks);
+// otherwise days get overlapping windows starting at different offsets.
+function handOut<T>(list: T[], dayIndex: number, dayCount: number, perDay: number): T[] {
+  if (dayCount <= 1 || list.length === 0) return list;
+  const day = ((dayIndex % dayCount) + dayCount) % dayCount;
+  if (list.length >= dayCount * perDay) {
+    return list.filter((_, i) => i % dayCount === day);
+  }
+  const size = Math.min(list.length, Math.max(perDay, Math.ceil(list.length / dayCount)));
+  const start = (day * perDay) % list.length;
+  return Array.from({ length: size }, (_, i) => list[(start + i) % list.length]);
+}
+
+export function slotsForDay(pool: CityStayPool, dayIndex: number): DaySlots {
+  return {
+    meals: handOut(pool.meals, dayIndex, pool.dayCount, MEALS_PER_DAY),
+    activities: handOut(pool.activities, dayIndex, pool.dayCount, ACTIVITIES_PER_DAY),
+    nightlife: handOut(pool.nightlife, dayIndex, pool.dayCount, NIGHTLIFE_PER_DAY),
+  };
+}
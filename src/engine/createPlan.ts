@@ -7,9 +7,26 @@ import type {
   CityStay,
   TravelLeg,
   PlaceLite,
+  MealTimes,
+  DayWeather,
 } from "../types";
-import { geocodePlace, nearbyPlaces, getTravelTimeMinutes } from "../services/maps";
+import { geocodePlace, getRouteTravelTimes } from "../services/maps";
+import type { GeocodedPlace } from "../services/maps";
 import { proposeCitiesForCountry } from "../services/openai";
+import { isWetDay, loadWeather } from "../services/weather";
+import type { WeatherLookup } from "../services/weather";
+import { throwIfAborted } from "../lib/abort";
+import { createLimiter } from "../lib/concurrency";
+import { withSpan, withSpanSync } from "../lib/tracing";
+import type { Span } from "../lib/tracing";
+import { loadCityStayPool, slotsForDay } from "./candidatePool";
+import { orderByRoute } from "./routing";
+import { assignStopsToGaps, estimateLocalTransfer } from "./sequence";
+import type { ActivityCandidate, CityStayPool } from "./candidatePool";
+
+// Defaults for the day scheduler in createTripPlan.
+const DEFAULT_TRIP_CONCURRENCY = 4;
+const DEFAULT_CITY_CONCURRENCY = 2;
 
 // ---- Helpers
 function addMinutes(iso: string, mins: number) {
@@ -24,7 +41,7 @@ function estimateMealCostFromPriceLevel(meal: "breakfast" | "lunch" | "dinner",
   return Math.round(base * mult);
 }
 
-function estimateActivityCostFromPriceLevel(category: Interest, pl?: PriceLevel) {
+export function estimateActivityCostFromPriceLevel(category: Interest, pl?: PriceLevel) {
   const defaultByCategory: Record<Interest, number> = {
     museums: 15,
     culture: 10,
@@ -55,27 +72,19 @@ const MIN_MEAL_COST: Record<MealType, number> = {
 
 const MIN_ACTIVITY_SLOT_COST = 8;
 
-type MealSelection = { place: PlaceLite; cost: number };
+const DEFAULT_MEAL_TIMES: MealTimes = { breakfast: "08:00", lunch: "12:30", dinner: "19:30" };
 
-type ActivityCandidate = PlaceLite & { _category?: Interest };
+const MORNING_DURATION_MIN = 120;
+const AFTERNOON_DURATION_MIN = 150;
+const EVENING_DURATION_MIN = 90;
+const MIN_ACTIVITY_DURATION_MIN = 45;
 
-type ActivitySelection = { place: ActivityCandidate; cost: number; category: Interest };
+// Categories that are mostly under a roof, preferred on a wet day.
+const INDOOR_CATEGORIES = new Set<Interest>(["museums", "art", "culture", "shopping"]);
 
-function sortPlacesByQuality<T extends { rating?: number; userRatingsTotal?: number; priceLevel?: PriceLevel; name?: string }>(
-  places: T[],
-): T[] {
-  return [...places].sort((a, b) => {
-    const ratingDiff = (b.rating ?? 0) - (a.rating ?? 0);
-    if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
-    const reviewsDiff = (b.userRatingsTotal ?? 0) - (a.userRatingsTotal ?? 0);
-    if (reviewsDiff !== 0) return reviewsDiff;
-    const priceDiff = (a.priceLevel ?? 2) - (b.priceLevel ?? 2);
-    if (priceDiff !== 0) return priceDiff;
-    const nameA = (a as any).name ?? "";
-    const nameB = (b as any).name ?? "";
-    return nameA.localeCompare(nameB);
-  });
-}
+type MealSelection = { place: PlaceLite; cost: number };
+
+type ActivitySelection = { place: ActivityCandidate; cost: number; category: Interest };
 
 function chooseMealCandidate(options: {
   mealType: MealType;
@@ -121,7 +130,8 @@ function chooseMealCandidate(options: {
   return fallback;
 }
 
-function chooseActivityCandidate(options: {
+// Exported for test/candidateIndex.test.ts, which checks it against the sort it replaced.
+export function chooseActivityCandidate(options: {
   sortedCandidates: ActivityCandidate[];
   usedIds: Set<string>;
   blockedIds: Set<string>;
@@ -163,31 +173,86 @@ function chooseActivityCandidate(options: {
   const limit = baseAllowance + tolerance;
 
   const affordable = pool.filter((item) => item.cost <= limit + 2 || safeRemaining === 0);
-  const consider = (affordable.length ? affordable : pool).slice();
-
-  consider.sort((a, b) => {
-    if (affordable.length) {
-      const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
-      if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
-      const reviewsDiff = (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
-      if (reviewsDiff !== 0) return reviewsDiff;
-      const costDiff = a.cost - b.cost;
-      if (costDiff !== 0) return costDiff;
-      return (a.place.name ?? "").localeCompare(b.place.name ?? "");
-    }
-    const costDiff = a.cost - b.cost;
-    if (costDiff !== 0) return costDiff;
-    const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
-    if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
-    return (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
-  });
+  const consider = affordable.length ? affordable : pool;
+
+  return firstInSortOrder(consider, affordable.length ? compareAffordableActivities : compareActivitiesByCost);
+}
+
+function compareAffordableActivities(a: ActivitySelection, b: ActivitySelection) {
+  const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
+  if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
+  const reviewsDiff = (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
+  if (reviewsDiff !== 0) return reviewsDiff;
+  const costDiff = a.cost - b.cost;
+  if (costDiff !== 0) return costDiff;
+  return (a.place.name ?? "").localeCompare(b.place.name ?? "");
+}
+
+function compareActivitiesByCost(a: ActivitySelection, b: ActivitySelection) {
+  const costDiff = a.cost - b.cost;
+  if (costDiff !== 0) return costDiff;
+  const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
+  if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
+  return (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
+}
+
+// What `items.slice().sort(compare)[0]` would be, without the sort in the usual
+// case. The 0.15 rating band makes the activity comparators non-transitive, so
+// the linear pass only stands in for the sort when its pick comes first against
+// every other item (ties going to the earlier one, as the stable sort does);
+// a stable sort has to put that item first. Otherwise the items form a rating
+// cycle and the answer is whatever the sort makes of it, so sort.
+function firstInSortOrder<T>(items: T[], compare: (a: T, b: T) => number): T | undefined {
+  let best = 0;
+  for (let i = 1; i < items.length; i++) {
+    if (compare(items[i], items[best]) < 0) best = i;
+  }
+  for (let i = 0; i < items.length; i++) {
+    if (i === best) continue;
+    const order = compare(items[best], items[i]);
+    if (order > 0 || (order === 0 && i < best)) return items.slice().sort(compare)[0];
+  }
+  return items[best];
+}
+
+function resolveBudgetPerDay(input?: number) {
+  const perDayInput = input ?? 80;
+  return Number.isFinite(perDayInput) && perDayInput > 0 ? perDayInput : 80;
+}
+
+function mealTimeISO(dateISO: string, time: string | undefined, fallback: string) {
+  const match = /^(\d{1,2}):(\d{2})$/.exec((time ?? "").trim());
+  const valid = match && Number(match[1]) < 24 && Number(match[2]) < 60;
+  const hhmm = valid ? `${match![1].padStart(2, "0")}:${match![2]}` : fallback;
+  return new Date(`${dateISO}T${hhmm}:00`).toISOString();
+}
 
-  return consider[0];
+function setTransferFrom(activity: Activity, previous: Activity) {
+  const transfer = estimateLocalTransfer(previous, activity);
+  activity.travelMinutesFromPrevious = transfer.minutes;
+  activity.travelModeFromPrevious = transfer.mode;
 }
 
-function planStartAfter(activity: Activity | undefined, fallbackStartISO: string, fallbackDuration: number, offsetMinutes: number) {
-  const anchor = activity?.end ?? addMinutes(fallbackStartISO, fallbackDuration);
-  return addMinutes(anchor, offsetMinutes);
+// Start an activity once the traveller has got there from `before`, and cut it
+// short if needed so they still reach `after` (the next fixed meal) on time.
+function scheduleBetween(
+  selection: ActivitySelection,
+  before: Activity,
+  after: Activity | undefined,
+  preferredMinutes: number,
+): Activity {
+  const inbound = estimateLocalTransfer(before, selection.place);
+  const start = addMinutes(before.end ?? before.start!, inbound.minutes);
+  let duration = preferredMinutes;
+  if (after?.start) {
+    const outbound = estimateLocalTransfer(selection.place, after);
+    const available = (Date.parse(after.start) - Date.parse(start)) / 60000 - outbound.minutes;
+    duration = Math.max(MIN_ACTIVITY_DURATION_MIN, Math.min(preferredMinutes, Math.floor(available / 15) * 15));
+  }
+  const activity = toActivity(selection.place, "activity", selection.category, start, duration);
+  activity.travelMinutesFromPrevious = inbound.minutes;
+  activity.travelModeFromPrevious = inbound.mode;
+  return activity;
 }
 
 function toActivity(p: any, kind: "meal" | "activity", category: Interest, timeISO: string, durationMin: number, mealTag?: "breakfast" | "lunch" | "dinner"): Activity {
@@ -215,76 +280,20 @@ function toActivity(p: any, kind: "meal" | "activity", category: Interest, timeI
   };
 }
 
-function orderCitiesEfficiently(cities: CityStay[]) {
-  if (cities.length <= 2) return cities;
-  const remaining = [...cities];
-  const route: CityStay[] = [remaining.shift()!];
-  while (remaining.length) {
-    const last = route[route.length - 1];
-    let bestIdx = 0;
-    let bestD = Number.POSITIVE_INFINITY;
-    for (let i = 0; i < remaining.length; i++) {
-      const c = remaining[i];
-      const d =
-        Math.hypot(c.lat - last.lat, c.lng - last.lng);
-      if (d < bestD) {
-        bestD = d;
-        bestIdx = i;
-      }
-    }
-    route.push(remaining.splice(bestIdx, 1)[0]);
-  }
-  let improved = true;
-  while (improved) {
-    improved = false;
-    for (let i = 1; i < route.length - 2; i++) {
-      for (let k = i + 1; k < route.length - 1; k++) {
-        const A = route[i - 1];
-        const B = route[i];
-        const C = route[k];
-        const D = route[k + 1];
-        const d1 = Math.hypot(A.lat - B.lat, A.lng - B.lng) + Math.hypot(C.lat - D.lat, C.lng - D.lng);
-        const d2 = Math.hypot(A.lat - C.lat, A.lng - C.lng) + Math.hypot(B.lat - D.lat, B.lng - D.lng);
-        if (d2 < d1) {
-          const middle = route.slice(i, k + 1).reverse();
-          route.splice(i, middle.length, ...middle);
-          improved = true;
-        }
-      }
-    }
-  }
-  return route;
+function findCityIndex(cities: CityStay[], name?: string) {
+  if (!name) return undefined;
+  const needle = name.trim().toLowerCase();
+  const index = cities.findIndex((c) => c.city.trim().toLowerCase() === needle);
+  return index >= 0 ? index : undefined;
 }
 
-const INTEREST_TO_TYPES: Record<Interest, string[]> = {
-  food: ["restaurant", "cafe", "bakery"],
-  culture: ["tourist_attraction", "point_of_interest"],
-  museums: ["museum"],
-  parks: ["park"],
-  art: ["art_gallery"],
-  landmarks: ["tourist_attraction"],
-  shopping: ["shopping_mall"],
-  nightlife: ["bar", "night_club"],
-};
-
-async function findMealsNear(lat: number, lng: number, priceLevels: PriceLevel[] = [1,2,3], radius=2500) {
-  const meals = await nearbyPlaces({
-    lat, lng, radiusMeters: radius, includedTypes: ["restaurant"], minRating: 4.1, priceLevels, maxResults: 20
+// Great-circle route through the proposed cities. When the traveller flies
+// in or out of a specific city, the route is pinned to start or end there.
+function orderCitiesEfficiently(cities: CityStay[], opts: { startCity?: string; endCity?: string } = {}) {
+  return orderByRoute(cities, {
+    start: findCityIndex(cities, opts.startCity),
+    end: findCityIndex(cities, opts.endCity),
   });
-  return meals;
-}
-
-async function findActivitiesNear(lat: number, lng: number, interests: Interest[], radius=4000) {
-  const results: any[] = [];
-  for (const cat of interests) {
-    const types = INTEREST_TO_TYPES[cat] ?? ["tourist_attraction"];
-    const places = await nearbyPlaces({
-      lat, lng, radiusMeters: radius, includedTypes: types, minRating: 4.2, maxResults: 20
-    });
-    for (const p of places) results.push({ ...p, _category: cat as Interest });
-  }
-  const seen = new Set<string>();
-  return results.filter((p) => (seen.has(p.id) ? false : (seen.add(p.id), true)));
 }
 
 export async function createDayPlan(params: {
@@ -292,36 +301,55 @@ export async function createDayPlan(params: {
   dateISO: string;
   interests: Interest[];
   budgetPerDay?: number;
+  /** Already-resolved geocode for `location`; skips the lookup when provided. */
+  geocoded?: GeocodedPlace;
+  /** Candidates shared by every day of the stay; fetched for this day alone when omitted. */
+  pool?: CityStayPool;
+  /** Position of this day within the stay, used to pick its share of `pool`. */
+  dayIndex?: number;
+  /** Local "HH:MM" meal times; activities are fitted between them. */
+  mealTimes?: MealTimes;
+  /** Forecast for the day; a wet day favours indoor activities. */
+  weather?: DayWeather;
+  /** Parent span; the day and each of its slots are traced under it. */
+  span?: Span;
 }): Promise<DayPlan> {
-  const g = await geocodePlace(params.location);
+  return withSpan(params.span, "day", { date: params.dateISO, city: params.location }, (span) =>
+    planDay(params, span),
+  );
+}
+
+async function planDay(
+  params: Parameters<typeof createDayPlan>[0],
+  span: Span | undefined,
+): Promise<DayPlan> {
+  const g = params.geocoded ?? (await geocodePlace(params.location, span));
   if (g.kind === "country") {
     throw new Error("Day plan expects a city. You entered a country.");
   }
 
   const lat = g.lat;
   const lng = g.lng;
-  const breakfastTime = new Date(`${params.dateISO}T08:00:00`).toISOString();
-  const lunchTime = new Date(`${params.dateISO}T12:30:00`).toISOString();
-  const dinnerTime = new Date(`${params.dateISO}T19:30:00`).toISOString();
+  const mealTimes = params.mealTimes;
+  const breakfastTime = mealTimeISO(params.dateISO, mealTimes?.breakfast, DEFAULT_MEAL_TIMES.breakfast);
+  const lunchTime = mealTimeISO(params.dateISO, mealTimes?.lunch, DEFAULT_MEAL_TIMES.lunch);
+  const dinnerTime = mealTimeISO(params.dateISO, mealTimes?.dinner, DEFAULT_MEAL_TIMES.dinner);
 
-  const perDayInput = params.budgetPerDay ?? 80;
-  const perDay = Number.isFinite(perDayInput) && perDayInput > 0 ? perDayInput : 80;
+  const perDay = resolveBudgetPerDay(params.budgetPerDay);
   const mealBudgetTarget = perDay * 0.5;
 
-  const mealPL: PriceLevel[] = perDay < 50 ? [0, 1, 2] : perDay < 100 ? [1, 2, 3] : [2, 3, 4];
+  const pool =
+    params.pool ??
+    (await loadCityStayPool({ lat, lng, interests: params.interests, budgetPerDay: perDay, dayCount: 1, span }));
+  const slots = slotsForDay(pool, params.dayIndex ?? 0);
 
-  let mealOptions = await findMealsNear(lat, lng, mealPL);
-  if (mealOptions.length < 3) {
-    const expanded = await findMealsNear(lat, lng, [0, 1, 2, 3, 4], 6000);
-    mealOptions = mealOptions.concat(expanded);
-  }
-  if (!mealOptions.length) {
+  const mealCandidates = slots.meals;
+  if (!mealCandidates.length) {
     throw new Error("No restaurants found for the selected location.");
   }
 
-  const mealCandidates = sortPlacesByQuality(mealOptions);
   const mealSelections: Record<MealType, MealSelection> = {} as Record<MealType, MealSelection>;
-  const uniqueMealIds = new Set(mealOptions.map((m) => m.id));
+  const uniqueMealIds = new Set(mealCandidates.map((m) => m.id));
   const allowMealReuse = uniqueMealIds.size < MEAL_ORDER.length;
   const usedMealIds = new Set<string>();
   let remainingMealBudget = mealBudgetTarget;
@@ -329,13 +357,17 @@ export async function createDayPlan(params: {
   for (let i = 0; i < MEAL_ORDER.length; i++) {
     const mealType = MEAL_ORDER[i];
     const remainingMeals = MEAL_ORDER.slice(i + 1);
-    let selection = chooseMealCandidate({
-      mealType,
-      sortedCandidates: mealCandidates,
-      usedIds: usedMealIds,
-      allowReuse,
-      remainingBudget: remainingMealBudget,
-      remainingMeals,
+    let selection = withSpanSync(span, "slot", { slot: mealType }, (slotSpan) => {
+      const pick = chooseMealCandidate({
+        mealType,
+        sortedCandidates: mealCandidates,
+        usedIds: usedMealIds,
+        allowReuse: allowMealReuse,
+        remainingBudget: remainingMealBudget,
+        remainingMeals,
+      });
+      slotSpan?.set({ candidates: mealCandidates.length, cost: pick?.cost });
+      return pick;
     });
 
     if (!selection) {
@@ -366,27 +398,9 @@ export async function createDayPlan(params: {
   const mealsTotal = breakfast.estimatedCost + lunch.estimatedCost + dinner.estimatedCost;
   let activityBudget = Math.max(0, perDay - mealsTotal);
 
-  const interestList =
-    params.interests && params.interests.length
-      ? params.interests
-      : (["landmarks", "parks"] as Interest[]);
-
-  let activityOptions = await findActivitiesNear(lat, lng, interestList);
-  if (activityOptions.length < 2) {
-    const extra = await nearbyPlaces({
-      lat,
-      lng,
-      radiusMeters: 5000,
-      includedTypes: ["tourist_attraction", "park"],
-      minRating: 4.0,
-      maxResults: 20,
-    });
-    activityOptions = activityOptions.concat(
-      extra.map((place) => ({ ...place, _category: "landmarks" as Interest })),
-    );
-  }
-  if (!activityOptions.length) {
-    activityOptions = [
+  let activityCandidates: ActivityCandidate[] = slots.activities;
+  if (!activityCandidates.length) {
+    activityCandidates = [
       {
         id: g.placeId || `${lat},${lng}`,
         name: `Explore ${g.name}`,
@@ -409,20 +423,35 @@ export async function createDayPlan(params: {
     ];
   }
 
-  const activityCandidates = sortPlacesByQuality(activityOptions);
-  const uniqueActivityIds = new Set(activityOptions.map((a) => a.id));
+  if (isWetDay(params.weather)) {
+    const indoor = activityCandidates.filter((a) => a._category && INDOOR_CATEGORIES.has(a._category));
+    if (indoor.length >= 2) {
+      activityCandidates = indoor;
+      span?.set({ indoorOnly: true });
+    }
+  }
+
+  const uniqueActivityIds = new Set(activityCandidates.map((a) => a.id));
   const allowActivityReuse = uniqueActivityIds.size < 2;
   const blockedActivityIds = new Set<string>(Array.from(usedMealIds));
   const usedActivityIds = new Set<string>();
 
-  const pickActivity = (slotsRemaining: number, budgetForSlot: number): ActivitySelection => {
-    let selection = chooseActivityCandidate({
-      sortedCandidates: activityCandidates,
-      usedIds: usedActivityIds,
-      blockedIds: blockedActivityIds,
-      allowReuse: allowActivityReuse,
-      budgetRemaining: budgetForSlot,
-      slotsRemaining,
+  const pickActivity = (
+    slot: string,
+    slotsRemaining: number,
+    budgetForSlot: number,
+  ): ActivitySelection => {
+    let selection = withSpanSync(span, "slot", { slot }, (slotSpan) => {
+      const pick = chooseActivityCandidate({
+        sortedCandidates: activityCandidates,
+        usedIds: usedActivityIds,
+        blockedIds: blockedActivityIds,
+        allowReuse: allowActivityReuse,
+        budgetRemaining: budgetForSlot,
+        slotsRemaining,
+      });
+      slotSpan?.set({ candidates: activityCandidates.length, cost: pick?.cost });
+      return pick;
     });
 
     if (!selection) {
@@ -450,26 +479,22 @@ export async function createDayPlan(params: {
     return selection;
   };
 
-  const morningSelection = pickActivity(1, activityBudget);
-  const morningStart = planStartAfter(breakfast, breakfastTime, 60, 45);
-  const morning = toActivity(
-    morningSelection.place,
-    "activity",
-    morningSelection.category,
-    morningStart,
-    120,
-  );
-  activityBudget = Math.max(0, perDay - (mealsTotal + morning.estimatedCost));
-
-  const afternoonSelection = pickActivity(0, activityBudget);
-  const afternoonStart = planStartAfter(lunch, lunchTime, 60, 45);
-  const afternoon = toActivity(
-    afternoonSelection.place,
-    "activity",
-    afternoonSelection.category,
-    afternoonStart,
-    150,
+  const morningSelection = pickActivity("morning", 1, activityBudget);
+  activityBudget = Math.max(0, perDay - (mealsTotal + morningSelection.cost));
+  const afternoonSelection = pickActivity("afternoon", 0, activityBudget);
+
+  // The picks are made on quality and budget; which one goes before lunch and
+  // which after is decided by the walk between the fixed meals.
+  const daytime = [morningSelection, afternoonSelection];
+  const [[beforeLunch], [afterLunch]] = assignStopsToGaps(
+    [breakfast, lunch, dinner],
+    daytime.map((selection) => selection.place),
+    [1, 1],
   );
+  const morning = scheduleBetween(daytime[beforeLunch], breakfast, lunch, MORNING_DURATION_MIN);
+  const afternoon = scheduleBetween(daytime[afterLunch], lunch, dinner, AFTERNOON_DURATION_MIN);
+  setTransferFrom(lunch, morning);
+  setTransferFrom(dinner, afternoon);
 
   const baseTotal =
     breakfast.estimatedCost +
@@ -483,35 +508,21 @@ export async function createDayPlan(params: {
 
   const eveningBudget = Math.max(0, perDay - baseTotal);
   if (eveningBudget >= 12) {
-    const nightlifeRaw = await nearbyPlaces({
-      lat,
-      lng,
-      radiusMeters: 3200,
-      includedTypes: ["bar", "night_club"],
-      minRating: 4.2,
-      maxResults: 12,
-    });
-    const nightlifeCandidates = sortPlacesByQuality(
-      nightlifeRaw.map((place) => ({ ...place, _category: "nightlife" as Interest })),
-    );
-    const eveningSelection = chooseActivityCandidate({
-      sortedCandidates: nightlifeCandidates,
-      usedIds: usedActivityIds,
-      blockedIds: blockedActivityIds,
-      allowReuse: true,
-      budgetRemaining: eveningBudget,
-      slotsRemaining: 0,
+    const eveningSelection = withSpanSync(span, "slot", { slot: "evening" }, (slotSpan) => {
+      const pick = chooseActivityCandidate({
+        sortedCandidates: slots.nightlife,
+        usedIds: usedActivityIds,
+        blockedIds: blockedActivityIds,
+        allowReuse: true,
+        budgetRemaining: eveningBudget,
+        slotsRemaining: 0,
+      });
+      slotSpan?.set({ candidates: slots.nightlife.length, cost: pick?.cost });
+      return pick;
     });
 
     if (eveningSelection) {
-      const eveningStart = planStartAfter(dinner, dinnerTime, 90, 30);
-      const eveningActivity = toActivity(
-        eveningSelection.place,
-        "activity",
-        eveningSelection.category,
-        eveningStart,
-        90,
-      );
+      const eveningActivity = scheduleBetween(eveningSelection, dinner, undefined, EVENING_DURATION_MIN);
       const projectedTotal = baseTotal + eveningActivity.estimatedCost;
       if (projectedTotal <= perDay + 5) {
         evening = eveningActivity;
@@ -538,6 +549,7 @@ export async function createDayPlan(params: {
     dinner,
     evening,
     totalEstimatedCost,
+    weather: params.weather,
   };
 }
 
@@ -548,24 +560,125 @@ export async function createTripPlan(params: {
   interests: Interest[];
   budgetPerDay?: number;
   travelMode?: "driving" | "transit";
+  /** City the trip should start in (e.g. the arrival airport), when planning a country. */
+  startCity?: string;
+  /** City the trip should end in, when planning a country. */
+  endCity?: string;
+  /** Local "HH:MM" meal times applied to every day. */
+  mealTimes?: MealTimes;
+  /** Max days generated at once, across the whole trip and within a single city stay. */
+  concurrency?: { perTrip?: number; perCity?: number };
+  /**
+   * Called as each day finishes. Days finish out of calendar order; `arrival`
+   * is the leg that reaches the stay on its first day.
+   */
+  onDay?: (day: DayPlan, index: number, arrival?: TravelLeg) => void;
+  /** Already-resolved geocode for `location`; skips the lookup when provided. */
+  geocoded?: GeocodedPlace;
+  /** Once aborted, no further days are started and the plan rejects with an AbortError. */
+  signal?: AbortSignal;
+  /** Parent span; each city stay, and the days within it, are traced under it. */
+  span?: Span;
 }): Promise<TripPlan> {
   const arrival = new Date(params.arrivalISO);
   const departure = new Date(params.departureISO);
   const totalNights = Math.max(1, Math.round((+departure - +arrival) / (1000*60*60*24)));
 
-  const g = await geocodePlace(params.location);
+  const tripLimit = createLimiter(params.concurrency?.perTrip ?? DEFAULT_TRIP_CONCURRENCY);
+  const perCity = params.concurrency?.perCity ?? DEFAULT_CITY_CONCURRENCY;
+
+  // Days are generated in parallel; each stay gets its own limiter and the
+  // trip-wide slot is only taken once the stay has room, so one long stay
+  // cannot starve the others. Promise.all keeps `days` in calendar order.
+  const scheduleDays = (
+    stays: Array<{ stay: CityStay; geocoded: Promise<GeocodedPlace>; arrival?: TravelLeg }>,
+    weather: Promise<WeatherLookup>,
+  ) => {
+    const jobs: Promise<DayPlan>[] = [];
+    let dayOffset = 0;
+    for (const { stay, geocoded, arrival: arrivalLeg } of stays) {
+      const cityLimit = createLimiter(perCity);
+      const staySpan = params.span?.child("stay", { city: stay.city, nights: stay.nights });
+      const stayJobs: Promise<DayPlan>[] = [];
+      // One candidate pool per stay, loaded by whichever day asks first.
+      let pool: Promise<CityStayPool> | null = null;
+      const loadPool = (place: GeocodedPlace) => {
+        if (!pool) {
+          pool = tripLimit(() =>
+            withSpan(staySpan, "pool", undefined, (span) =>
+              loadCityStayPool({
+                lat: place.lat,
+                lng: place.lng,
+                interests: params.interests,
+                budgetPerDay: resolveBudgetPerDay(params.budgetPerDay),
+                dayCount: stay.nights,
+                span,
+              }),
+            ),
+          );
+        }
+        return pool;
+      };
+      for (let i = 0; i < stay.nights; i++) {
+        const d = new Date(arrival);
+        d.setDate(arrival.getDate() + dayOffset);
+        const iso = d.toISOString().slice(0, 10);
+        const dayIndex = i;
+        const tripDayIndex = dayOffset;
+        stayJobs.push(
+          cityLimit(async () => {
+            throwIfAborted(params.signal);
+            const resolved = await geocoded;
+            const stayPool = await loadPool(resolved);
+            const forecast = (await weather)(stay, iso);
+            return tripLimit(() => {
+              throwIfAborted(params.signal);
+              return createDayPlan({
+                location: stay.city,
+                dateISO: iso,
+                interests: params.interests,
+                budgetPerDay: params.budgetPerDay,
+                mealTimes: params.mealTimes,
+                geocoded: resolved,
+                pool: stayPool,
+                dayIndex,
+                weather: forecast,
+                span: staySpan,
+              });
+            });
+          }).then((plan) => {
+            params.onDay?.(plan, tripDayIndex, i === 0 ? arrivalLeg : undefined);
+            return plan;
+          }),
+        );
+        dayOffset += 1;
+      }
+      if (staySpan) {
+        Promise.all(stayJobs).then(
+          () => staySpan.end(),
+          (error) => staySpan.end(error),
+        );
+      }
+      jobs.push(...stayJobs);
+    }
+    return Promise.all(jobs);
+  };
+
+  // One forecast request covers every stay. It only rejects on abort, which
+  // the days notice themselves, so a failure just leaves them without weather.
+  const loadStayWeather = (stays: CityStay[]) =>
+    loadWeather(stays, params.arrivalISO, params.departureISO, {
+      span: params.span,
+      signal: params.signal,
+    }).catch((): WeatherLookup => () => undefined);
+
+  const g = params.geocoded ?? (await geocodePlace(params.location, params.span));
+  throwIfAborted(params.signal);
 
   if (g.kind !== "country") {
-    const days: any[] = [];
-    for (let i = 0; i < totalNights; i++) {
-      const d = new Date(arrival);
-      d.setDate(arrival.getDate() + i);
-      const iso = d.toISOString().slice(0, 10);
-      days.push(await createDayPlan({
-        location: g.name, dateISO: iso, interests: params.interests, budgetPerDay: params.budgetPerDay
-      }));
-    }
-    return { order: [{ city: g.name, country: g.country || "", lat: g.lat, lng: g.lng, nights: totalNights }], travel: [], days, totalNights };
+    const stay: CityStay = { city: g.name, country: g.country || "", lat: g.lat, lng: g.lng, nights: totalNights };
+    const days = await scheduleDays([{ stay, geocoded: Promise.resolve(g) }], loadStayWeather([stay]));
+    return { order: [stay], travel: [], days, totalNights };
   }
 
   const rawCities = await proposeCitiesForCountry({
@@ -573,34 +686,37 @@ export async function createTripPlan(params: {
     totalNights,
     interests: params.interests,
     budgetPerDay: params.budgetPerDay,
+    span: params.span,
   });
   if (!rawCities.length) throw new Error("Could not propose cities for the country.");
+  throwIfAborted(params.signal);
 
-  const ordered = orderCitiesEfficiently(rawCities);
+  const ordered = orderCitiesEfficiently(rawCities, {
+    startCity: params.startCity,
+    endCity: params.endCity,
+  });
 
-  const travel: TravelLeg[] = [];
-  for (let i = 0; i < ordered.length - 1; i++) {
-    const A = ordered[i], B = ordered[i + 1];
-    const { minutes, distanceKm } = await getTravelTimeMinutes({
-      from: { lat: A.lat, lng: A.lng }, to: { lat: B.lat, lng: B.lng },
-      mode: params.travelMode ?? "transit",
-    });
-    travel.push({
-      from: A.city, to: B.city, mode: (params.travelMode ?? "transit"), durationMinutes: minutes || 120, distanceKm
-    });
-  }
+  const weather = loadStayWeather(ordered);
 
-  const days: any[] = [];
-  let dayCursor = new Date(arrival);
-  for (const c of ordered) {
-    for (let i = 0; i < c.nights; i++) {
-      const iso = new Date(dayCursor).toISOString().slice(0, 10);
-      days.push(await createDayPlan({
-        location: c.city, dateISO: iso, interests: params.interests, budgetPerDay: params.budgetPerDay
-      }));
-      dayCursor.setDate(dayCursor.getDate() + 1);
-    }
-  }
+  const travelMode = params.travelMode ?? "transit";
+  const legTimes = await getRouteTravelTimes({
+    stops: ordered.map((c) => ({ lat: c.lat, lng: c.lng })),
+    mode: travelMode,
+    span: params.span,
+  });
+  const travel: TravelLeg[] = legTimes.map(({ minutes, distanceKm }, i) => ({
+    from: ordered[i].city, to: ordered[i + 1].city, mode: travelMode, durationMinutes: minutes || 120, distanceKm
+  }));
+
+  // Geocode each stay once and share the result across all of its days.
+  const days = await scheduleDays(
+    ordered.map((stay, i) => ({
+      stay,
+      geocoded: tripLimit(() => geocodePlace(stay.city, params.span)),
+      arrival: i > 0 ? travel[i - 1] : undefined,
+    })),
+    weather,
+  );
 
   return { order: ordered, travel, days, totalNights };
 }
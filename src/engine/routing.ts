@@ -0,0 +1,220 @@
+import { haversineKm } from "../lib/geo";
+import type { LatLng } from "../lib/geo";
+
+/** Symmetric great-circle distances (km), row-major in a flat typed array. */
+export type DistanceMatrix = {
+  size: number;
+  data: Float64Array;
+};
+
+export function buildDistanceMatrix(points: LatLng[]): DistanceMatrix {
+  const size = points.length;
+  const data = new Float64Array(size * size);
+  for (let i = 0; i < size; i++) {
+    for (let j = i + 1; j < size; j++) {
+      const d = haversineKm(points[i], points[j]);
+      data[i * size + j] = d;
+      data[j * size + i] = d;
+    }
+  }
+  return { size, data };
+}
+
+export function routeLength(order: number[], matrix: DistanceMatrix): number {
+  let total = 0;
+  for (let i = 1; i < order.length; i++) {
+    total += matrix.data[order[i - 1] * matrix.size + order[i]];
+  }
+  return total;
+}
+
+export type RouteOptions = {
+  /** Index of the point the route must start at. Defaults to the first point. */
+  start?: number;
+  /** Index of the point the route must end at, if any. */
+  end?: number;
+  /** Wall-clock budget for the improvement passes. */
+  timeBudgetMs?: number;
+  /** Cap on improvement passes, whichever budget runs out first. */
+  maxPasses?: number;
+};
+
+// Up to this many points the route is solved exactly (Held-Karp, O(2^n · n^2)).
+const EXACT_MAX_POINTS = 10;
+const DEFAULT_TIME_BUDGET_MS = 50;
+const DEFAULT_MAX_PASSES = 200;
+const OR_OPT_MAX_SEGMENT = 3;
+const EPSILON = 1e-9;
+
+function exactRoute(matrix: DistanceMatrix, start: number, end: number | undefined): number[] {
+  const { size, data } = matrix;
+  const full = (1 << size) - 1;
+  const cost = new Float64Array((full + 1) * size).fill(Number.POSITIVE_INFINITY);
+  const parent = new Int8Array((full + 1) * size).fill(-1);
+  cost[(1 << start) * size + start] = 0;
+
+  for (let mask = 1; mask <= full; mask++) {
+    if (!(mask & (1 << start))) continue;
+    for (let last = 0; last < size; last++) {
+      const current = cost[mask * size + last];
+      if (current === Number.POSITIVE_INFINITY) continue;
+      // A fixed end may only be entered as the final stop.
+      if (end != null && last === end && mask !== full) continue;
+      for (let next = 0; next < size; next++) {
+        if (mask & (1 << next)) continue;
+        const nextMask = mask | (1 << next);
+        const candidate = current + data[last * size + next];
+        if (candidate < cost[nextMask * size + next]) {
+          cost[nextMask * size + next] = candidate;
+          parent[nextMask * size + next] = last;
+        }
+      }
+    }
+  }
+
+  let last = end ?? start;
+  if (end == null) {
+    let best = Number.POSITIVE_INFINITY;
+    for (let i = 0; i < size; i++) {
+      if (cost[full * size + i] < best) {
+        best = cost[full * size + i];
+        last = i;
+      }
+    }
+  }
+  const route: number[] = [];
+  let mask = full;
+  while (last >= 0) {
+    route.push(last);
+    const prev = parent[mask * size + last];
+    mask &= ~(1 << last);
+    last = prev;
+  }
+  return route.reverse();
+}
+
+function nearestNeighbour(matrix: DistanceMatrix, start: number, end: number | undefined): number[] {
+  const { size, data } = matrix;
+  const visited = new Uint8Array(size);
+  const route = [start];
+  visited[start] = 1;
+  if (end != null) visited[end] = 1;
+  let last = start;
+  for (let step = route.length + (end != null && end !== start ? 1 : 0); step < size; step++) {
+    let best = -1;
+    let bestD = Number.POSITIVE_INFINITY;
+    for (let j = 0; j < size; j++) {
+      if (visited[j]) continue;
+      const d = data[last * size + j];
+      if (d < bestD) {
+        bestD = d;
+        best = j;
+      }
+    }
+    visited[best] = 1;
+    route.push(best);
+    last = best;
+  }
+  if (end != null && end !== start) route.push(end);
+  return route;
+}
+
+// Open-path 2-opt: reverse route[i..k]. The first stop never moves; the last
+// one only moves when the end is free.
+function twoOptPass(route: number[], matrix: DistanceMatrix, fixedEnd: boolean): boolean {
+  const { size, data } = matrix;
+  const n = route.length;
+  const lastMovable = fixedEnd ? n - 2 : n - 1;
+  let improved = false;
+  for (let i = 1; i < lastMovable; i++) {
+    for (let k = i + 1; k <= lastMovable; k++) {
+      const a = route[i - 1];
+      const b = route[i];
+      const c = route[k];
+      const before = data[a * size + b] + (k + 1 < n ? data[c * size + route[k + 1]] : 0);
+      const after = data[a * size + c] + (k + 1 < n ? data[b * size + route[k + 1]] : 0);
+      if (after < before - EPSILON) {
+        for (let lo = i, hi = k; lo < hi; lo++, hi--) {
+          const tmp = route[lo];
+          route[lo] = route[hi];
+          route[hi] = tmp;
+        }
+        improved = true;
+      }
+    }
+  }
+  return improved;
+}
+
+// Or-opt: move a run of 1..3 stops (optionally reversed) to a better gap.
+function orOptPass(route: number[], matrix: DistanceMatrix, fixedEnd: boolean): boolean {
+  const { size, data } = matrix;
+  const d = (x: number, y: number) => data[x * size + y];
+  const n = route.length;
+  const lastMovable = fixedEnd ? n - 2 : n - 1;
+  for (let len = 1; len <= OR_OPT_MAX_SEGMENT; len++) {
+    for (let i = 1; i + len - 1 <= lastMovable; i++) {
+      const j = i + len - 1;
+      const prev = route[i - 1];
+      const next = j + 1 < n ? route[j + 1] : -1;
+      const first = route[i];
+      const last = route[j];
+      const removeGain = d(prev, first) + (next >= 0 ? d(last, next) - d(prev, next) : 0);
+
+      // Try every gap (p, p+1) outside the segment; p + 1 may be n (append at the end).
+      for (let p = 0; p < n; p++) {
+        if (p >= i - 1 && p <= j) continue;
+        if (p === n - 1 && fixedEnd) continue;
+        const left = route[p];
+        const right = p + 1 < n ? route[p + 1] : -1;
+        const base = right >= 0 ? d(left, right) : 0;
+        const forward = d(left, first) + (right >= 0 ? d(last, right) : 0) - base;
+        const reversed = d(left, last) + (right >= 0 ? d(first, right) : 0) - base;
+        const insertCost = Math.min(forward, reversed);
+        if (insertCost < removeGain - EPSILON) {
+          const segment = route.splice(i, len);
+          if (reversed < forward) segment.reverse();
+          const target = p < i ? p + 1 : p + 1 - len;
+          route.splice(target, 0, ...segment);
+          return true;
+        }
+      }
+    }
+  }
+  return false;
+}
+
+/**
+ * Order points into a short open path and return their indices.
+ *
+ * Small inputs are solved exactly. Larger ones start from nearest neighbour
+ * and run 2-opt and Or-opt passes until no move helps or the time/pass
+ * budget runs out.
+ */
+export function optimiseRoute(matrix: DistanceMatrix, options: RouteOptions = {}): number[] {
+  const { size } = matrix;
+  if (size === 0) return [];
+  const start = options.start ?? 0;
+  const end = options.end != null && options.end !== start ? options.end : undefined;
+  if (size <= 2) return nearestNeighbour(matrix, start, end);
+  if (size <= EXACT_MAX_POINTS) return exactRoute(matrix, start, end);
+
+  const route = nearestNeighbour(matrix, start, end);
+
+  const fixedEnd = end != null;
+  const deadline = Date.now() + (options.timeBudgetMs ?? DEFAULT_TIME_BUDGET_MS);
+  const maxPasses = options.maxPasses ?? DEFAULT_MAX_PASSES;
+  for (let pass = 0; pass < maxPasses && Date.now() < deadline; pass++) {
+    const twoOpt = twoOptPass(route, matrix, fixedEnd);
+    const orOpt = orOptPass(route, matrix, fixedEnd);
+    if (!twoOpt && !orOpt) break;
+  }
+  return route;
+}
+
+/** Convenience wrapper: reorder items that carry lat/lng. */
+export function orderByRoute<T extends LatLng>(items: T[], options: RouteOptions = {}): T[] {
+  if (items.length <= 2 && options.start == null && options.end == null) return items;
+  const matrix = buildDistanceMatrix(items);
+  return optimiseRoute(matrix, options).map((index) => items[index]);
+}
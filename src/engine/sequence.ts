@@ -0,0 +1,131 @@
+import { haversineKm, hasCoordinates } from "../lib/geo";
+import type { LatLng } from "../lib/geo";
+import { buildDistanceMatrix, optimiseRoute } from "./routing";
+
+export type LocalTransferMode = "walking" | "transit";
+
+export type LocalTransfer = {
+  minutes: number;
+  mode: LocalTransferMode;
+  distanceKm: number;
+};
+
+// Beyond this straight-line distance we assume the traveller takes transit.
+const WALK_MAX_KM = 1.8;
+const WALK_KMH = 4.8;
+// Urban transit: average speed including stops, plus walking to and waiting at the stop.
+const TRANSIT_KMH = 20;
+const TRANSIT_OVERHEAD_MIN = 8;
+const STREET_DETOUR = 1.3;
+// Used when an endpoint has no usable coordinates.
+const UNKNOWN_TRANSFER: LocalTransfer = { minutes: 15, mode: "transit", distanceKm: 0 };
+
+// Enumerate every assignment up to this many free stops (7! = 5040 routes).
+const EXACT_MAX_STOPS = 7;
+
+/**
+ * Rough door-to-door transfer inside a city, rounded to 5 minutes. Falls back
+ * to a 15-minute transit hop when either end has no coordinates.
+ */
+export function estimateLocalTransfer(from: Partial<LatLng>, to: Partial<LatLng>): LocalTransfer {
+  if (!hasCoordinates(from) || !hasCoordinates(to)) return { ...UNKNOWN_TRANSFER };
+  const straightKm = haversineKm(from, to);
+  const streetKm = straightKm * STREET_DETOUR;
+  const walking = straightKm <= WALK_MAX_KM;
+  const raw = walking
+    ? (streetKm / WALK_KMH) * 60
+    : (streetKm / TRANSIT_KMH) * 60 + TRANSIT_OVERHEAD_MIN;
+  return {
+    minutes: Math.max(5, Math.ceil(raw / 5) * 5),
+    mode: walking ? "walking" : "transit",
+    distanceKm: Math.round(streetKm * 10) / 10,
+  };
+}
+
+function permutations(count: number): number[][] {
+  const result: number[][] = [];
+  const current = Array.from({ length: count }, (_, i) => i);
+  // Heap's algorithm, iterative.
+  const c = new Array(count).fill(0);
+  result.push(current.slice());
+  let i = 1;
+  while (i < count) {
+    if (c[i] < i) {
+      const j = i % 2 === 0 ? 0 : c[i];
+      [current[j], current[i]] = [current[i], current[j]];
+      result.push(current.slice());
+      c[i] += 1;
+      i = 1;
+    } else {
+      c[i] = 0;
+      i += 1;
+    }
+  }
+  return result;
+}
+
+function splitByCapacity(order: number[], capacities: number[]): number[][] {
+  const gaps: number[][] = [];
+  let offset = 0;
+  for (const capacity of capacities) {
+    gaps.push(order.slice(offset, offset + capacity));
+    offset += capacity;
+  }
+  return gaps;
+}
+
+/**
+ * Place free stops into the gaps between fixed anchors (e.g. meals at set
+ * times) so the total distance walked through the day is as short as possible.
+ *
+ * `capacities[i]` is how many stops go between `anchors[i]` and `anchors[i + 1]`;
+ * a trailing capacity (one more than the gaps) places stops after the last
+ * anchor. Returns the stop indices for each gap, in visiting order.
+ */
+export function assignStopsToGaps(anchors: LatLng[], stops: LatLng[], capacities: number[]): number[][] {
+  const total = capacities.reduce((sum, n) => sum + n, 0);
+  if (total !== stops.length) {
+    throw new Error(`Expected ${total} stops for the day, got ${stops.length}.`);
+  }
+  if (capacities.length !== anchors.length - 1 && capacities.length !== anchors.length) {
+    throw new Error("Capacities must cover the gaps between anchors.");
+  }
+  if (stops.length === 0) return capacities.map(() => []);
+
+  const matrix = buildDistanceMatrix([...anchors, ...stops]);
+  const { size, data } = matrix;
+  const anchorCount = anchors.length;
+  const d = (a: number, b: number) => data[a * size + b];
+
+  const score = (gaps: number[][]) => {
+    let length = 0;
+    gaps.forEach((gap, g) => {
+      let previous = g;
+      for (const stop of gap) {
+        length += d(previous, anchorCount + stop);
+        previous = anchorCount + stop;
+      }
+      if (g + 1 < anchorCount) length += d(previous, g + 1);
+    });
+    return length;
+  };
+
+  if (stops.length > EXACT_MAX_STOPS) {
+    // Too many to enumerate: route the stops from the first anchor and fill
+    // the gaps in route order.
+    const route = optimiseRoute(matrix, { start: 0 }).filter((i) => i >= anchorCount);
+    return splitByCapacity(route.map((i) => i - anchorCount), capacities);
+  }
+
+  let best: number[][] = splitByCapacity(stops.map((_, i) => i), capacities);
+  let bestLength = score(best);
+  for (const order of permutations(stops.length)) {
+    const gaps = splitByCapacity(order, capacities);
+    const length = score(gaps);
+    if (length < bestLength - 1e-9) {
+      best = gaps;
+      bestLength = length;
+    }
+  }
+  return best;
+}
@@ -0,0 +1,50 @@
+import { useEffect, useState } from 'react';
+
+import {
+  buildPhotoUrl,
+  cachePlacePhoto,
+  cachedPhotoUri,
+  PhotoSize,
+  stopPhotoName,
+} from '../lib/photos';
+import { ItineraryStop } from '../types/plans';
+
+type PhotoState = { key: string; uri?: string; settled: boolean };
+
+/**
+ * URI to render for a stop's photo at the given size. Cached photos come
+ * from disk; others are downloaded into the cache first, and the network URL
+ * is only used if that fails. Returns `undefined` while the photo is loading
+ * or when the stop has none.
+ */
+const usePlacePhoto = (
+  stop: Pick<ItineraryStop, 'photo_name' | 'photo_url'>,
+  size: PhotoSize,
+) => {
+  const photoName = stopPhotoName(stop);
+  const key = photoName ? `${photoName}|${size}` : '';
+  const [state, setState] = useState<PhotoState>(() => {
+    const uri = photoName ? cachedPhotoUri(photoName, size) : undefined;
+    return { key, uri, settled: !!uri };
+  });
+
+  useEffect(() => {
+    if (!photoName) return;
+    let active = true;
+    const cached = cachedPhotoUri(photoName, size);
+    setState({ key, uri: cached, settled: !!cached });
+    if (cached) return;
+    cachePlacePhoto(photoName, size).then((uri) => {
+      if (active) setState({ key, uri, settled: true });
+    });
+    return () => {
+      active = false;
+    };
+  }, [key, photoName, size]);
+
+  if (!photoName) return stop.photo_url || undefined;
+  if (state.key !== key || !state.settled) return undefined;
+  return state.uri ?? buildPhotoUrl(photoName, size);
+};
+
+export default usePlacePhoto;
@@ -1,5 +1,4 @@
-import { useCallback, useEffect, useMemo, useState } from 'react';
-import AsyncStorage from '@react-native-async-storage/async-storage';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { addDays, differenceInCalendarDays, formatISO } from 'date-fns';
 
 import {
@@ -7,17 +6,45 @@ import {
   fetchWeatherForecastRange,
   geocodeCity,
   requestMultiDayItinerary,
-  requestStopReplacement,
+  requestStopReplacements,
   generateDayItinerary,
   generateTripItinerary,
+  locateForPlanning,
+  PlaceCandidate,
 } from '../lib/api';
+import { isAbortError } from '../lib/abort';
+import { createCallBudget, withCallBudget } from '../lib/http';
+import { formatCallSummary, Span, startTrace, withSpan } from '../lib/tracing';
+import {
+  convertItineraryForDisplay as convertItinerary,
+  removeStopAt,
+  replaceStopsAt,
+  sumStops,
+} from '../lib/itineraryState';
+import {
+  clearStopAlternatives,
+  prefetchStopAlternatives,
+  takeStopAlternative,
+  waitForStopAlternative,
+} from '../lib/stopAlternatives';
 import { usePlanningSettings } from '../providers/PlanningSettingsProvider';
-import { supabase } from '../lib/supabase';
+import { saveTrip } from '../lib/itineraryStore';
+import { setSetting } from '../lib/settings';
 import { useAuth } from '../providers/AuthProvider';
 import { useCurrency } from '../providers/CurrencyProvider';
-import { PlannerFormValues, PreferenceOption, TripItinerary } from '../types/plans';
-
-const LAST_DESTINATION_KEY = 'plangenie.last-destination';
+import {
+  ItineraryDay,
+  ItineraryStop,
+  PlannerFormValues,
+  PlanningProgress,
+  PlanningStage,
+  PlanningStageStatus,
+  PreferenceOption,
+  TripItinerary,
+} from '../types/plans';
+
+// Let the freshly rendered day settle before spending a request on alternatives.
+const PREFETCH_DELAY_MS = 1500;
 
 const createDefaultForm = (): PlannerFormValues => ({
   city: '',
@@ -33,15 +60,21 @@ type MutatingStopState = {
   stopIndex: number;
 } | null;
 
-const cloneItinerary = (itinerary: TripItinerary): TripItinerary =>
-  JSON.parse(JSON.stringify(itinerary)) as TripItinerary;
-
-const sumStops = (stops: TripItinerary['days'][number]['stops']) =>
-  stops.reduce((total, stop) => total + (stop.estimated_price_usd ?? 0), 0);
+const createProgress = (dayCount: number): PlanningProgress => ({
+  stages: {
+    geocode: 'pending',
+    places: 'pending',
+    weather: 'pending',
+    locate: 'pending',
+    generate: 'pending',
+  },
+  daysReady: 0,
+  dayCount,
+});
 
 const usePlanner = () => {
   const { user } = useAuth();
-  const { currency, convertFromUsd, getRate } = useCurrency();
+  const { currency, getRate } = useCurrency();
   const { mealTimes } = usePlanningSettings();
 
   const [form, setForm] = useState<PlannerFormValues>(createDefaultForm());
@@ -52,6 +85,12 @@ const usePlanner = () => {
   const [error, setError] = useState<string | null>(null);
   const [successMessage, setSuccessMessage] = useState<string | null>(null);
   const [mutatingStop, setMutatingStop] = useState<MutatingStopState>(null);
+  // Candidates behind the current itinerary, reused when replacing stops.
+  const [candidatePlaces, setCandidatePlaces] = useState<PlaceCandidate[]>([]);
+  const [activeDayIndex, setActiveDayIndex] = useState(0);
+  const [progress, setProgress] = useState<PlanningProgress | null>(null);
+  // Controller of the planning run in flight; aborting it cancels that run.
+  const plannerRun = useRef<AbortController | null>(null);
 
   const updateField = useCallback(
     <K extends keyof PlannerFormValues>(key: K, value: PlannerFormValues[K]) => {
@@ -80,36 +119,9 @@ const usePlanner = () => {
   }, [form.city, form.budgetUsd, form.endDate, form.startDate]);
 
   const convertItineraryForDisplay = useCallback(
-    (source: TripItinerary | null): TripItinerary | null => {
-      if (!source) return null;
-      const convertValue = (amount: number) => convertFromUsd(amount);
-
-      const convertedDays = source.days.map((day) => ({
-        ...day,
-        summary: {
-          ...day.summary,
-          estimatedSpend: convertValue(day.summary.estimatedSpend),
-        },
-        stops: day.stops.map((stop) => ({
-          ...stop,
-          estimated_price_usd: convertValue(stop.estimated_price_usd),
-        })),
-      }));
-
-      return {
-        ...source,
-        currency,
-        conversion_rate: getRate(),
-        base_currency: 'USD',
-        total_estimated_cost: convertValue(source.total_estimated_cost),
-        budget_converted:
-          source.budget_usd != null ? convertValue(source.budget_usd) : undefined,
-        daily_budget_converted:
-          source.daily_budget_usd != null ? convertValue(source.daily_budget_usd) : undefined,
-        days: convertedDays,
-      };
-    },
-    [convertFromUsd, currency, getRate],
+    (source: TripItinerary | null): TripItinerary | null =>
+      source ? convertItinerary(source, currency, getRate()) : null,
+    [currency, getRate],
   );
 
   useEffect(() => {
@@ -118,73 +130,190 @@ const usePlanner = () => {
     }
   }, [baseItinerary, convertItineraryForDisplay]);
 
+  const cancel = useCallback(() => {
+    if (!plannerRun.current) return;
+    plannerRun.current.abort();
+    plannerRun.current = null;
+    setLoading(false);
+    setProgress(null);
+  }, []);
+
+  // Abort whatever is still running when the planner goes away.
+  useEffect(() => () => plannerRun.current?.abort(), []);
+
   const submit = useCallback(async () => {
-    if (!canSubmit || loading) return;
+    if (!canSubmit) return;
+
+    // A new submit supersedes the one in flight.
+    plannerRun.current?.abort();
+    const controller = new AbortController();
+    plannerRun.current = controller;
+    const { signal } = controller;
+    // Alternatives were picked for the previous plan and its preferences.
+    clearStopAlternatives();
+    const isCurrent = () => plannerRun.current === controller && !signal.aborted;
+
+    const preferences = form.preferences;
+    const budgetUsd = form.budgetUsd;
+    const isDayPlan = form.isDayPlan;
+    const startDate = form.startDate;
+    const endDate = isDayPlan ? form.startDate : form.endDate;
+    const startIso = formatISO(startDate, { representation: 'date' });
+    const endIso = formatISO(endDate, { representation: 'date' });
+    const dayCount = differenceInCalendarDays(endDate, startDate) + 1;
+
+    const updateProgress = (update: (current: PlanningProgress) => PlanningProgress) => {
+      if (!isCurrent()) return;
+      setProgress((current) => update(current ?? createProgress(dayCount)));
+    };
+    const trace = startTrace('plan', {
+      destination: form.city.trim(),
+      mode: isDayPlan ? 'day' : 'trip',
+      days: dayCount,
+    });
+    // Caps the external calls of this run; past it, lookups fall back to cached data.
+    const runSpan = withCallBudget(trace, createCallBudget());
+    const runStage = async <T>(
+      stage: PlanningStage,
+      task: (span: Span | undefined) => Promise<T>,
+    ) => {
+      const mark = (status: PlanningStageStatus) =>
+        updateProgress((current) => ({
+          ...current,
+          stages: { ...current.stages, [stage]: status },
+        }));
+      mark('running');
+      try {
+        const result = await withSpan(runSpan, stage, undefined, task);
+        mark('done');
+        return result;
+      } catch (caught) {
+        if (!isAbortError(caught)) mark('failed');
+        throw caught;
+      }
+    };
 
     setError(null);
     setSuccessMessage(null);
     setLoading(true);
+    setProgress(createProgress(dayCount));
 
     try {
       const trimmedCity = form.city.trim();
-      const geocoded = await geocodeCity(trimmedCity);
-      const preferences = form.preferences;
-      const budgetUsd = form.budgetUsd;
-      const isDayPlan = form.isDayPlan;
-      const startDate = form.startDate;
-      const endDate = isDayPlan ? form.startDate : form.endDate;
-      const startIso = formatISO(startDate, { representation: 'date' });
-      const endIso = formatISO(endDate, { representation: 'date' });
-      const dayCount = differenceInCalendarDays(endDate, startDate) + 1;
+      const geocoded = await runStage('geocode', (span) =>
+        geocodeCity(trimmedCity, { signal, span }),
+      );
       const preferenceScope = geocoded.isCountry ? geocoded.country ?? geocoded.city : geocoded.city;
 
-      const places = await fetchPreferencePlaces(preferenceScope, preferences, geocoded);
-
-      let generated: TripItinerary;
-      if (isDayPlan) {
-        generated = await generateDayItinerary({
-          city: geocoded.city,
-          date: startIso,
-          preferences,
-          budgetUsd,
-          places,
-          mealTimes,
+      // Everything below depends only on the geocode, so run it side by side.
+      const [places, weatherByDay, located] = await Promise.all([
+        runStage('places', (span) =>
+          fetchPreferencePlaces(preferenceScope, preferences, geocoded, { signal, span }),
+        ),
+        runStage('weather', (span) =>
+          geocoded.latitude || geocoded.longitude
+            ? fetchWeatherForecastRange(
+                geocoded.latitude,
+                geocoded.longitude,
+                startDate,
+                endDate,
+                { signal, span },
+              )
+            : Promise.resolve([]),
+        ),
+        runStage('locate', (span) => locateForPlanning(geocoded.city, { signal, span })),
+      ]);
+
+      // Show days as they are generated; the finished itinerary replaces this.
+      const partialDays: ItineraryDay[] = [];
+      const showPartialDay = (day: ItineraryDay, index: number) => {
+        if (!isCurrent()) return;
+        partialDays[index] = day;
+        const days = partialDays.filter(Boolean);
+        updateProgress((current) => ({ ...current, daysReady: days.length }));
+        setBaseItinerary({
+          trip_name: `${geocoded.city} Escape`,
+          destination: geocoded.city,
+          start_date: startIso,
+          end_date: endIso,
+          currency: 'USD',
+          conversion_rate: 1,
+          base_currency: 'USD',
+          budget_usd: budgetUsd != null ? budgetUsd * dayCount : undefined,
+          daily_budget_usd: budgetUsd,
+          total_estimated_cost: days.reduce((total, current) => total + sumStops(current.stops), 0),
+          highlights: [],
+          days,
         });
-        generated.trip_name = `${geocoded.city} Day Plan`;
-      } else {
+      };
+      // A fallback planner streams its own days from the start; drop the old ones.
+      const clearPartialDays = () => {
+        if (!isCurrent() || !partialDays.length) return;
+        partialDays.length = 0;
+        updateProgress((current) => ({ ...current, daysReady: 0 }));
+        setBaseItinerary(null);
+        setDisplayItinerary(null);
+      };
+
+      const generated = await runStage('generate', async (span) => {
+        if (isDayPlan) {
+          const dayPlan = await generateDayItinerary(
+            {
+              city: geocoded.city,
+              date: startIso,
+              preferences,
+              budgetUsd,
+              places,
+              mealTimes,
+              geocoded: located,
+            },
+            { signal, span },
+          );
+          dayPlan.trip_name = `${geocoded.city} Day Plan`;
+          return dayPlan;
+        }
         // If country, try to get a list of major cities for multi-city logic (stub: just use city for now)
         let countryCities: string[] | undefined = undefined;
         if (geocoded.isCountry) {
           // TODO: Replace with real city list for the country
           countryCities = [geocoded.city];
         }
-        generated = await generateTripItinerary({
-          city: geocoded.city,
-          startDate: startIso,
-          endDate: endIso,
-          preferences,
-          budgetUsd,
-          places,
-          mealTimes,
-          isCountry: geocoded.isCountry,
-          countryCities,
-        });
-        generated.trip_name = geocoded.isCountry ? `${geocoded.city} Grand Tour` : `${geocoded.city} Escape`;
-      }
+        const trip = await generateTripItinerary(
+          {
+            city: geocoded.city,
+            startDate: startIso,
+            endDate: endIso,
+            preferences,
+            budgetUsd,
+            places,
+            mealTimes,
+            isCountry: geocoded.isCountry,
+            countryCities,
+            geocoded: located,
+            weatherByDay,
+          },
+          { onDay: showPartialDay, onRestart: clearPartialDays, signal, span },
+        );
+        trip.trip_name = geocoded.isCountry ? `${geocoded.city} Grand Tour` : `${geocoded.city} Escape`;
+        return trip;
+      });
+      if (!isCurrent()) return;
+
       generated.currency = 'USD';
       generated.conversion_rate = 1;
       generated.base_currency = 'USD';
 
       setBaseItinerary(generated);
       setDisplayItinerary(convertItineraryForDisplay(generated));
+      setCandidatePlaces(places);
+      setActiveDayIndex(0);
       setMutatingStop(null);
 
-      try {
-        await AsyncStorage.setItem(LAST_DESTINATION_KEY, geocoded.city);
-      } catch (storageError) {
-        console.warn('Failed to persist last destination', storageError);
-      }
+      setSetting('lastDestination', geocoded.city);
     } catch (caught) {
+      trace?.end(caught);
+      // A superseded or cancelled run leaves the state to whoever replaced it.
+      if (!isCurrent()) return;
       const message =
         caught instanceof Error
           ? caught.message
@@ -192,10 +321,19 @@ const usePlanner = () => {
       setError(message);
       setBaseItinerary(null);
       setDisplayItinerary(null);
+      setCandidatePlaces([]);
     } finally {
-      setLoading(false);
+      trace?.end();
+      if (__DEV__ && trace) {
+        console.log(`Plan calls:\n${formatCallSummary(trace.summary())}`);
+      }
+      if (plannerRun.current === controller) {
+        plannerRun.current = null;
+        setLoading(false);
+        setProgress(null);
+      }
     }
-  }, [canSubmit, convertItineraryForDisplay, form, loading]);
+  }, [canSubmit, convertItineraryForDisplay, form, mealTimes]);
 
   const saveItinerary = useCallback(
     async (tripName: string) => {
@@ -216,19 +354,15 @@ const usePlanner = () => {
         const display = convertItineraryForDisplay(updatedBase);
         setDisplayItinerary(display);
 
-        const { error: dbError } = await supabase.from('itineraries').insert({
-          user_id: user.id,
+        // Committed on this device at once; the sync queue uploads it.
+        await saveTrip(user.id, {
           trip_name: tripName,
-          destination: display?.destination,
-          start_date: display?.start_date,
-          end_date: display?.end_date,
-          itinerary_data: display,
+          destination: display?.destination ?? updatedBase.destination,
+          start_date: display?.start_date ?? updatedBase.start_date,
+          end_date: display?.end_date ?? updatedBase.end_date,
+          itinerary_data: display ?? updatedBase,
         });
 
-        if (dbError) {
-          throw dbError;
-        }
-
         setSuccessMessage('Trip saved to your library!');
       } catch (caught) {
         const message =
@@ -246,17 +380,8 @@ const usePlanner = () => {
   const removeStop = useCallback(
     (dayIndex: number, stopIndex: number) => {
       if (!baseItinerary) return;
-      const updatedBase = cloneItinerary(baseItinerary);
-      const day = updatedBase.days[dayIndex];
-      if (!day) return;
-
-      day.stops.splice(stopIndex, 1);
-      day.summary.stopsCount = day.stops.length;
-      day.summary.estimatedSpend = sumStops(day.stops);
-      updatedBase.total_estimated_cost = updatedBase.days.reduce(
-        (total, currentDay) => total + sumStops(currentDay.stops),
-        0,
-      );
+      const updatedBase = removeStopAt(baseItinerary, dayIndex, stopIndex);
+      if (updatedBase === baseItinerary) return;
 
       setBaseItinerary(updatedBase);
       setDisplayItinerary(convertItineraryForDisplay(updatedBase));
@@ -265,38 +390,59 @@ const usePlanner = () => {
     [baseItinerary, convertItineraryForDisplay],
   );
 
-  const replaceStop = useCallback(
-    async (dayIndex: number, stopIndex: number) => {
+  const replaceStops = useCallback(
+    async (dayIndex: number, stopIndices: number[]) => {
       if (!baseItinerary) return;
       const targetDay = baseItinerary.days[dayIndex];
-      if (!targetDay) return;
+      const indices = stopIndices.filter((index) => targetDay?.stops[index] != null);
+      if (!targetDay || indices.length === 0) return;
 
-      setMutatingStop({ dayIndex, stopIndex });
+      setMutatingStop({ dayIndex, stopIndex: indices[0] });
       setError(null);
 
       try {
-        const replacement = await requestStopReplacement({
-          city: baseItinerary.destination,
-          date: targetDay.date,
-          daySummary: targetDay.summary,
-          existingStops: targetDay.stops,
-          replaceIndex: stopIndex,
-          preferences: form.preferences,
-          budgetUsd: form.budgetUsd,
-        });
+        // Serve from prefetched alternatives where possible, then fetch the
+        // rest in a single request.
+        const replacements: Record<number, ItineraryStop> = {};
+        const takeCached = (index: number) => {
+          const alternative = takeStopAlternative(targetDay.stops[index], [
+            ...targetDay.stops,
+            ...Object.values(replacements),
+          ]);
+          if (alternative) replacements[index] = alternative;
+        };
+        indices.forEach(takeCached);
+        const waiting = indices.filter((index) => !replacements[index]);
+        if (waiting.length) {
+          await Promise.all(
+            waiting.map((index) => waitForStopAlternative(targetDay.stops[index])),
+          );
+          waiting.forEach(takeCached);
+        }
 
-        const updatedBase = cloneItinerary(baseItinerary);
-        updatedBase.days[dayIndex].stops[stopIndex] = replacement;
-        updatedBase.days[dayIndex].summary.estimatedSpend = sumStops(
-          updatedBase.days[dayIndex].stops,
-        );
-        updatedBase.days[dayIndex].summary.stopsCount =
-          updatedBase.days[dayIndex].stops.length;
-        updatedBase.total_estimated_cost = updatedBase.days.reduce(
-          (total, currentDay) => total + sumStops(currentDay.stops),
-          0,
-        );
+        const missing = indices.filter((index) => !replacements[index]);
+        if (missing.length) {
+          const fetched = await requestStopReplacements({
+            city: baseItinerary.destination,
+            date: targetDay.date,
+            daySummary: targetDay.summary,
+            existingStops: targetDay.stops,
+            replaceIndices: missing,
+            preferences: form.preferences,
+            budgetUsd: form.budgetUsd,
+            places: candidatePlaces,
+          });
+          missing.forEach((index) => {
+            const [replacement] = fetched[index] ?? [];
+            if (replacement) replacements[index] = replacement;
+          });
+        }
 
+        if (Object.keys(replacements).length === 0) {
+          throw new Error('We could not find a replacement for this stop. Try again.');
+        }
+
+        const updatedBase = replaceStopsAt(baseItinerary, dayIndex, replacements);
         setBaseItinerary(updatedBase);
         setDisplayItinerary(convertItineraryForDisplay(updatedBase));
         setSuccessMessage(null);
@@ -310,13 +456,59 @@ const usePlanner = () => {
         setMutatingStop(null);
       }
     },
-    [baseItinerary, convertItineraryForDisplay, form.budgetUsd, form.preferences],
+    [
+      baseItinerary,
+      candidatePlaces,
+      convertItineraryForDisplay,
+      form.budgetUsd,
+      form.preferences,
+    ],
+  );
+
+  const replaceStop = useCallback(
+    (dayIndex: number, stopIndex: number) => replaceStops(dayIndex, [stopIndex]),
+    [replaceStops],
   );
 
+  // Warm alternatives for the day on screen once generation has settled, so a
+  // replace tap is usually answered without waiting on the model.
+  useEffect(() => {
+    if (loading || !baseItinerary) return;
+    const day = baseItinerary.days[activeDayIndex];
+    if (!day) return;
+
+    const timer = setTimeout(() => {
+      void prefetchStopAlternatives({
+        city: baseItinerary.destination,
+        date: day.date,
+        daySummary: day.summary,
+        existingStops: day.stops,
+        preferences: form.preferences,
+        budgetUsd: form.budgetUsd,
+        places: candidatePlaces,
+      });
+    }, PREFETCH_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [
+    activeDayIndex,
+    baseItinerary,
+    candidatePlaces,
+    form.budgetUsd,
+    form.preferences,
+    loading,
+  ]);
+
   const reset = useCallback(() => {
+    plannerRun.current?.abort();
+    plannerRun.current = null;
+    setLoading(false);
+    setProgress(null);
     setForm(createDefaultForm());
     setBaseItinerary(null);
     setDisplayItinerary(null);
+    setCandidatePlaces([]);
+    setActiveDayIndex(0);
+    clearStopAlternatives();
     setError(null);
     setSuccessMessage(null);
     setMutatingStop(null);
@@ -327,8 +519,10 @@ const usePlanner = () => {
     updateField,
     togglePreference,
     submit,
+    cancel,
     canSubmit,
     loading,
+    progress,
     error,
     itinerary: displayItinerary,
     baseItinerary,
@@ -337,7 +531,9 @@ const usePlanner = () => {
     successMessage,
     removeStop,
     replaceStop,
+    replaceStops,
     mutatingStop,
+    setActiveDayIndex,
     reset,
   };
 };
@@ -0,0 +1,28 @@
+/** Error raised when planning work is cancelled through an AbortSignal. */
+export const createAbortError = () => {
+  const error = new Error('The operation was aborted.');
+  error.name = 'AbortError';
+  return error;
+};
+
+export const isAbortError = (error: unknown): boolean =>
+  error instanceof Error && error.name === 'AbortError';
+
+export const throwIfAborted = (signal?: AbortSignal) => {
+  if (signal?.aborted) throw createAbortError();
+};
+
+/**
+ * Settle with `promise`, or reject with an AbortError as soon as `signal`
+ * aborts. The underlying work is left to finish, so requests shared through a
+ * cache still complete for their other callers and land in the cache.
+ */
+export const withAbort = <T>(promise: Promise<T>, signal?: AbortSignal): Promise<T> => {
+  if (!signal) return promise;
+  if (signal.aborted) return Promise.reject(createAbortError());
+  return new Promise<T>((resolve, reject) => {
+    const onAbort = () => reject(createAbortError());
+    signal.addEventListener('abort', onAbort);
+    promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+  });
+};
@@ -21,7 +21,7 @@ export async function generateItineraryWithOpenAI({
   // Build prompt for OpenAI
   const prompt = `You are a travel planner. Create a detailed, multi-day itinerary for a trip to ${destination} from ${startDate} to ${endDate} for ${travelers} traveler(s). Preferences: ${preferences.join(", ")}. Budget: ${budget ? `$${budget}` : 'flexible'}. ${isCountryLevel ? 'This is a country-level trip. Include multiple cities, logical routing, and specify the city for each day. For each day, list the city, all stops (meals, activities, shopping, etc.), and a short summary. Do not use fake or placeholder venues. Make sure the itinerary covers the best cities and routes in ${destination}, and that each stop is a real, well-known place with address and website if possible.' : 'For each day, list the city, stops (meals, activities, shopping, etc.), and a short summary. Do not use fake or placeholder venues.'}`;
 
-  const response = await fetch('https://api.openai.com/v1/chat/completions', {
+  const response = await httpFetch('https://api.openai.com/v1/chat/completions', {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -106,6 +106,11 @@ const formatDurationLabel = (minutes?: number | null) => {
   return `${mins}m`;
 };
 
+const formatTransferLabel = (minutes: number, mode: LocalTransferMode) => {
+  const duration = minutes < 60 ? `${minutes} min` : formatDurationLabel(minutes);
+  return `${duration} ${mode === 'walking' ? 'walk' : 'transit'}`;
+};
+
 const formatTimeRange = (start?: string, end?: string) => {
   const formatTime = (iso?: string) => {
     if (!iso) return null;
@@ -172,10 +177,16 @@ const mapActivityToStop = ({
       ? minutesBetween(previousActivity.end, activity.start)
       : null;
 
-  const travelLabel =
-    isFirstStop || travelGapMinutes == null
-      ? 'Start'
-      : `~${formatDurationLabel(travelGapMinutes)} transfer`;
+  const travelLabel = isFirstStop
+    ? 'Start'
+    : activity.travelMinutesFromPrevious != null
+      ? formatTransferLabel(
+          activity.travelMinutesFromPrevious,
+          activity.travelModeFromPrevious ?? 'walking',
+        )
+      : travelGapMinutes == null
+        ? 'Start'
+        : `~${formatDurationLabel(travelGapMinutes)} transfer`;
 
   const fallbackMapsUrl =
     activity.id && activity.name
@@ -194,6 +205,7 @@ const mapActivityToStop = ({
       candidate?.googleMapsUrl ??
       fallbackMapsUrl,
     photo_url: candidate?.photoUrl ?? '',
+    photo_name: candidate?.photoName,
     website_url: activity.websiteUri ?? candidate?.websiteUrl,
     estimated_cost: priceLevelToSymbol(activity.priceLevel),
     estimated_price_usd: Math.max(0, Math.round(estimatedCost)),
@@ -205,6 +217,21 @@ const mapActivityToStop = ({
   };
 };
 
+// Engine days finish out of order; hold each one until the days before it are out.
+const createInOrderEmitter = <T>(emit: (item: T, index: number) => void) => {
+  const waiting = new Map<number, T>();
+  let next = 0;
+  return (item: T, index: number) => {
+    waiting.set(index, item);
+    while (waiting.has(next)) {
+      const ready = waiting.get(next) as T;
+      waiting.delete(next);
+      emit(ready, next);
+      next += 1;
+    }
+  };
+};
+
 type ConvertDayPlanParams = {
   plan: EngineDayPlan;
   dayIndex: number;
@@ -306,7 +333,12 @@ const convertDayPlanToItineraryDay = ({
   if (plan.country && plan.country !== plan.city) {
     notesParts.push(plan.country);
   }
-  const notes = `${notesParts.join(' • ')}. Meals and activities sequenced with travel buffers.`;
+  let notes = `${notesParts.join(' • ')}. Meals and activities sequenced with travel buffers.`;
+  if (plan.weather) {
+    notes += ` Forecast: ${describeWeather(plan.weather)}${
+      isWetDay(plan.weather) ? ', so the day leans on indoor stops' : ''
+    }.`;
+  }
 
   return {
     day: {
@@ -335,8 +367,19 @@ export const generateTripItinerary = async (input: {
   mealTimes?: { breakfast: string; lunch: string; dinner: string };
   isCountry?: boolean;
   countryCities?: string[]; // kept for compatibility
-}): Promise<TripItinerary> => {
+  /** Engine geocode for `city`, when it was resolved ahead of time. */
+  geocoded?: GeocodedPlace;
+  weatherByDay?: WeatherDaySummary[];
+}, options: {
+  /** Called with each day, in calendar order, as soon as it is ready. */
+  onDay?: (day: ItineraryDay, index: number) => void;
+  /** Called when days already reported are dropped because planning starts over. */
+  onRestart?: () => void;
+  signal?: AbortSignal;
+  span?: Span;
+} = {}): Promise<TripItinerary> => {
   const candidateLookup = buildCandidateLookup(input.places);
+  const emitDay = options.onDay ? createInOrderEmitter(options.onDay) : undefined;
   const interests = translatePreferencesToInterests(input.preferences);
 
   const start = new Date(input.startDate);
@@ -354,10 +397,32 @@ export const generateTripItinerary = async (input: {
       departureISO: input.endDate,
       interests,
       budgetPerDay: input.budgetUsd,
+      mealTimes: input.mealTimes,
+      geocoded: input.geocoded,
+      signal: options.signal,
+      span: options.span,
+      onDay: emitDay
+        ? (plan, index, arrival) =>
+            emitDay(
+              convertDayPlanToItineraryDay({
+                plan,
+                dayIndex: index,
+                candidateLookup,
+                travelLeg: arrival ?? null,
+              }).day,
+              index,
+            )
+        : undefined,
     });
   } catch (error) {
-    console.warn('Falling back to default itinerary builder', error);
-    return buildFallbackItinerary(
+    if (isAbortError(error)) throw error;
+    // The model-written itinerary streams its days too, and falls back to the
+    // default builder itself when there is no API key or the request fails.
+    console.warn('Falling back to model-written itinerary', error);
+    options.span?.set({ fallback: 'model' });
+    // The model's days restart from the first one.
+    options.onRestart?.();
+    return requestMultiDayItinerary(
       {
         tripName: `${input.city} Escape`,
         city: input.city,
@@ -366,8 +431,10 @@ export const generateTripItinerary = async (input: {
         dayCount: fallbackDayCount,
         preferences: input.preferences,
         budgetUsd: input.budgetUsd,
+        places: input.places,
+        weatherByDay: input.weatherByDay,
       },
-      input.places,
+      { onDay: options.onDay, signal: options.signal, span: options.span },
     );
   }
 
@@ -447,6 +514,7 @@ export const generateTripItinerary = async (input: {
     daily_budget_usd: dailyBudget,
     total_estimated_cost: Math.round(totalSpend),
     highlights: uniqueHighlights,
+    weatherSummary: summariseWeather(tripPlan.days.map((plan) => plan.weather)),
     days,
   };
 };
@@ -458,17 +526,25 @@ export const generateDayItinerary = async (input: {
   budgetUsd?: number;
   places: PlaceCandidate[];
   mealTimes?: { breakfast: string; lunch: string; dinner: string };
-}): Promise<TripItinerary> => {
+  /** Engine geocode for `city`, when it was resolved ahead of time. */
+  geocoded?: GeocodedPlace;
+}, options: { signal?: AbortSignal; span?: Span } = {}): Promise<TripItinerary> => {
   const candidateLookup = buildCandidateLookup(input.places);
   const interests = translatePreferencesToInterests(input.preferences);
 
   try {
-    const plan = await engineCreateDayPlan({
-      location: input.city,
-      dateISO: input.date,
-      interests,
-      budgetPerDay: input.budgetUsd,
-    });
+    const plan = await withAbort(
+      engineCreateDayPlan({
+        location: input.city,
+        dateISO: input.date,
+        interests,
+        budgetPerDay: input.budgetUsd,
+        mealTimes: input.mealTimes,
+        geocoded: input.geocoded,
+        span: options.span,
+      }),
+      options.signal,
+    );
 
     const { day, highlights } = convertDayPlanToItineraryDay({
       plan,
@@ -494,7 +570,9 @@ export const generateDayItinerary = async (input: {
       days: [day],
     };
   } catch (error) {
+    if (isAbortError(error)) throw error;
     console.warn('Falling back to simple day itinerary', error);
+    options.span?.set({ fallback: 'simple' });
     return buildFallbackItinerary(
       {
         tripName: `${input.city} Day Plan`,
@@ -510,8 +588,6 @@ export const generateDayItinerary = async (input: {
   }
 };
 
-import { Platform } from 'react-native';
-
 import {
   PreferenceOption,
   ItineraryStop,
@@ -521,6 +597,7 @@ import {
 import {
   Activity,
   DayPlan as EngineDayPlan,
+  DayWeather,
   Interest,
   TripPlan as EngineTripPlan,
   TravelLeg,
@@ -529,7 +606,30 @@ import {
   createDayPlan as engineCreateDayPlan,
   createTripPlan as engineCreateTripPlan,
 } from '../engine/createPlan';
+import { orderByRoute } from '../engine/routing';
+import { estimateLocalTransfer, LocalTransferMode } from '../engine/sequence';
+import { cachedGeocode, GeocodeRecord, geocodeKindFromTypes } from '../services/geocodeCache';
+import { geocodePlace, GeocodedPlace } from '../services/maps';
+import {
+  describeWeather,
+  isWetDay,
+  loadWeather,
+  summariseWeather,
+} from '../services/weather';
+import {
+  cachedPlacesRequest,
+  placesCacheKey,
+  quantiseCoordinate,
+} from '../services/placesCache';
 import { GOOGLE_API_KEY, OPENAI_API_KEY } from './env';
+import { httpFetch } from './http';
+import { buildPhotoUrl } from './photos';
+import { createPlaceIndex, getPlaceIndex, PlaceIndex } from './placeIndex';
+import { cachedChatCompletion } from '../services/llm';
+import { mapWithConcurrency } from './concurrency';
+import { createJsonArrayStreamParser } from './jsonStream';
+import { readJson, Span, traceCall } from './tracing';
+import { isAbortError, throwIfAborted, withAbort } from './abort';
 
 export type GeocodedLocation = {
   city: string;
@@ -556,20 +656,14 @@ export type PlaceCandidate = {
   types?: string[];
   googleMapsUrl?: string;
   photoUrl?: string;
+  photoName?: string;
   websiteUrl?: string;
   priceLevel?: number;
 };
 
-export type WeatherDaySummary = {
-  date: string;
-  summary: string;
-  highC: number | null;
-  lowC: number | null;
-  precipitationChance: number | null;
-};
+export type WeatherDaySummary = DayWeather;
 
 const PLACES_SEARCH_ENDPOINT = 'https://places.googleapis.com/v1/places:searchText';
-const OPENAI_CHAT_COMPLETIONS_ENDPOINT = 'https://api.openai.com/v1/chat/completions';
 const MAX_PLACES_RADIUS_METERS = 50000;
 const MAX_PLACE_RESULTS = 6;
 const MAX_ITINERARY_PLACE_CANDIDATES = 6;
@@ -581,23 +675,40 @@ const extractPlaceId = (resourceName?: string | null) => {
   return parts.length > 1 ? parts[1] : resourceName;
 };
 
-const buildPhotoUrl = (photoName?: string | null) => {
-  if (!photoName || !GOOGLE_API_KEY) return undefined;
-  return `https://places.googleapis.com/v1/${photoName}/media?maxHeightPx=800&key=${GOOGLE_API_KEY}`;
-};
-
-const fetchJson = async <T>(url: string, init?: RequestInit): Promise<T> => {
-  const response = await fetch(url, init);
-  if (!response.ok) {
-    const message = await response.text();
-    throw new Error(`Request failed: ${response.status} ${message}`);
-  }
-  return (await response.json()) as T;
+const PLACES_SEARCH_FIELD_MASK = [
+  'places.name',
+  'places.displayName',
+  'places.formattedAddress',
+  'places.location',
+  'places.rating',
+  'places.primaryType',
+  'places.types',
+  'places.websiteUri',
+  'places.googleMapsUri',
+  'places.priceLevel',
+  'places.photos',
+].join(',');
+
+type PlacesSearchResult = {
+  name?: string;
+  displayName?: { text?: string };
+  formattedAddress?: string;
+  rating?: number;
+  types?: string[];
+  primaryType?: string;
+  location?: { latitude?: number; longitude?: number };
+  websiteUri?: string;
+  googleMapsUri?: string;
+  priceLevel?: number;
+  photos?: Array<{ name?: string }>;
 };
 
 const callPlacesSearch = async (
   textQuery: string,
-  options?: { locationBias?: { latitude: number; longitude: number; radiusMeters?: number } },
+  options?: {
+    locationBias?: { latitude: number; longitude: number; radiusMeters?: number };
+    span?: Span;
+  },
 ) => {
   if (!GOOGLE_API_KEY) {
     console.warn('GOOGLE_API_KEY is not configured. Skipping Places lookup.');
@@ -605,42 +716,47 @@ const callPlacesSearch = async (
   }
 
   const body: Record<string, unknown> = { textQuery };
+  let bias: { latitude: number; longitude: number; radius: number } | undefined;
   if (options?.locationBias) {
+    // Snap the bias to the cache grid so nearby searches share one entry.
+    bias = {
+      latitude: quantiseCoordinate(options.locationBias.latitude),
+      longitude: quantiseCoordinate(options.locationBias.longitude),
+      radius: Math.min(
+        Math.max(options.locationBias.radiusMeters ?? MAX_PLACES_RADIUS_METERS, 1000),
+        MAX_PLACES_RADIUS_METERS,
+      ),
+    };
     body.locationBias = {
       circle: {
         center: {
-          latitude: options.locationBias.latitude,
-          longitude: options.locationBias.longitude,
+          latitude: bias.latitude,
+          longitude: bias.longitude,
         },
-        radius: Math.min(
-          Math.max(options.locationBias.radiusMeters ?? MAX_PLACES_RADIUS_METERS, 1000),
-          MAX_PLACES_RADIUS_METERS,
-        ),
+        radius: bias.radius,
       },
     };
   }
 
-  try {
-    const response = await fetch(PLACES_SEARCH_ENDPOINT, {
+  const cacheKey = placesCacheKey({
+    endpoint: 'text',
+    fieldMask: PLACES_SEARCH_FIELD_MASK,
+    textQuery,
+    lat: bias?.latitude,
+    lng: bias?.longitude,
+    radiusMeters: bias?.radius,
+  });
+
+  const search = async (span?: Span) => {
+    const response = await httpFetch(PLACES_SEARCH_ENDPOINT, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
         'X-Goog-Api-Key': GOOGLE_API_KEY,
-        'X-Goog-FieldMask': [
-          'places.name',
-          'places.displayName',
-          'places.formattedAddress',
-          'places.location',
-          'places.rating',
-          'places.primaryType',
-          'places.types',
-          'places.websiteUri',
-          'places.googleMapsUri',
-          'places.priceLevel',
-          'places.photos',
-        ].join(','),
+        'X-Goog-FieldMask': PLACES_SEARCH_FIELD_MASK,
       },
       body: JSON.stringify(body),
+      span,
     });
 
     if (!response.ok) {
@@ -648,23 +764,14 @@ const callPlacesSearch = async (
       throw new Error(`Google Places request failed: ${response.status} ${message}`);
     }
 
-    const payload = (await response.json()) as {
-      places?: Array<{
-        name?: string;
-        displayName?: { text?: string };
-        formattedAddress?: string;
-        rating?: number;
-        types?: string[];
-        primaryType?: string;
-        location?: { latitude?: number; longitude?: number };
-        websiteUri?: string;
-        googleMapsUri?: string;
-        priceLevel?: number;
-        photos?: Array<{ name?: string }>;
-      }>;
-    };
-
+    const payload = await readJson<{ places?: PlacesSearchResult[] }>(response, span);
     return payload.places ?? [];
+  };
+
+  try {
+    return await traceCall(options?.span, 'places.searchText', { query: textQuery }, (span) =>
+      cachedPlacesRequest(cacheKey, () => search(span), span),
+    );
   } catch (error) {
     console.warn('Places search failed', error);
     return [];
@@ -691,11 +798,43 @@ const extractCityFromAddress = (address?: string) => {
   return segments[segments.length - 2];
 };
 
-export const geocodeCity = async (city: string): Promise<GeocodedLocation> => {
-  const results = await callPlacesSearch(city);
+const resolveCityGeocode = async (city: string, span?: Span): Promise<GeocodeRecord | null> => {
+  const results = await callPlacesSearch(city, { span });
   const [firstResult] = results;
-
   if (!firstResult?.location?.latitude || !firstResult.location.longitude) {
+    return null;
+  }
+
+  const placeTypes = firstResult.types ?? [];
+  const primaryType = firstResult.primaryType ?? '';
+  const resolvedName = firstResult.displayName?.text ?? city;
+  const formattedAddress = firstResult.formattedAddress ?? resolvedName;
+  const isCountry =
+    placeTypes.some((type: string) => type?.toLowerCase() === 'country') ||
+    primaryType === 'country';
+
+  return {
+    kind: isCountry ? 'country' : geocodeKindFromTypes(placeTypes),
+    name: resolvedName,
+    address: formattedAddress,
+    country: isCountry ? resolvedName : extractCountryFromAddress(formattedAddress),
+    lat: firstResult.location.latitude,
+    lng: firstResult.location.longitude,
+    placeId: extractPlaceId(firstResult.name) ?? city,
+    types: placeTypes,
+  };
+};
+
+export const geocodeCity = async (
+  city: string,
+  options: { signal?: AbortSignal; span?: Span } = {},
+): Promise<GeocodedLocation> => {
+  const lookup = traceCall(options.span, 'geocode', { query: city }, (span) =>
+    cachedGeocode(city, () => resolveCityGeocode(city, span), span),
+  );
+  const record = await withAbort(lookup, options.signal);
+
+  if (!record) {
     console.warn('Falling back to basic geocode for destination', city);
     const fallbackSegments = city.split(',').map((segment) => segment.trim()).filter(Boolean);
     const fallbackCity = fallbackSegments[0] ?? city;
@@ -715,27 +854,37 @@ export const geocodeCity = async (city: string): Promise<GeocodedLocation> => {
     };
   }
 
-  const placeId = extractPlaceId(firstResult.name) ?? city;
-  const placeTypes = firstResult.types ?? [];
-  const primaryType = firstResult.primaryType ?? '';
-  const resolvedName = firstResult.displayName?.text ?? city;
-  const formattedAddress = firstResult.formattedAddress ?? resolvedName;
-  const isCountry =
-  placeTypes.some((type: string) => type?.toLowerCase() === 'country') || primaryType === 'country';
-  const countryName = isCountry ? resolvedName : extractCountryFromAddress(formattedAddress);
-
+  const isCountry = record.kind === 'country';
   return {
-    city: resolvedName,
-    address: formattedAddress,
-    latitude: firstResult.location.latitude,
-    longitude: firstResult.location.longitude,
-    placeId,
-    types: placeTypes,
-    country: countryName,
+    city: record.name,
+    address: record.address,
+    latitude: record.lat,
+    longitude: record.lng,
+    placeId: record.placeId,
+    types: record.types,
+    country: isCountry ? record.name : record.country ?? extractCountryFromAddress(record.address),
     isCountry,
   };
 };
 
+/**
+ * Resolve `city` the way the planning engine does, so generation can start
+ * without its own lookup. Resolves to `undefined` when the lookup fails; the
+ * engine then retries (and reports) it itself.
+ */
+export const locateForPlanning = async (
+  city: string,
+  options: { signal?: AbortSignal; span?: Span } = {},
+): Promise<GeocodedPlace | undefined> => {
+  try {
+    return await withAbort(geocodePlace(city, options.span), options.signal);
+  } catch (error) {
+    if (isAbortError(error)) throw error;
+    console.warn('Engine geocode failed', error);
+    return undefined;
+  }
+};
+
 const buildPreferenceQuery = (preference: PreferenceOption, city: string) => {
   const preferenceLabel = preference.toLowerCase();
   return `${preferenceLabel} in ${city}`;
@@ -763,6 +912,7 @@ export const fetchPreferencePlaces = async (
   city: string,
   preferences: PreferenceOption[],
   location: GeocodedLocation,
+  options: { signal?: AbortSignal; span?: Span } = {},
 ): Promise<PlaceCandidate[]> => {
   const uniquePlaces = new Map<string, PlaceCandidate>();
   const activePreferences: PreferenceOption[] = preferences.length > 0 ? preferences : ['Culture'];
@@ -771,20 +921,22 @@ export const fetchPreferencePlaces = async (
     activePreferences.map(async (preference) => {
       const queryRegion = location.isCountry ? location.country ?? city : city;
       const searchQuery = buildPreferenceQuery(preference, queryRegion);
-      const searchOptions = location.isCountry
-        ? undefined
-        : {
-            locationBias: {
+      const searchOptions = {
+        locationBias: location.isCountry
+          ? undefined
+          : {
               latitude: location.latitude,
               longitude: location.longitude,
               radiusMeters: MAX_PLACES_RADIUS_METERS,
             },
-          };
+        span: options.span,
+      };
 
       let places: any[] = [];
       try {
-        places = await callPlacesSearch(searchQuery, searchOptions);
+        places = await withAbort(callPlacesSearch(searchQuery, searchOptions), options.signal);
       } catch (error) {
+        if (isAbortError(error)) throw error;
         console.warn('Preference place lookup failed', error);
         return;
       }
@@ -797,9 +949,8 @@ export const fetchPreferencePlaces = async (
           return;
         }
 
-        const photoUrl = place.photos?.[0]?.name
-          ? buildPhotoUrl(place.photos[0].name)
-          : undefined;
+        const photoName = place.photos?.[0]?.name;
+        const photoUrl = buildPhotoUrl(photoName);
 
         const formattedAddress = place.formattedAddress ?? queryRegion;
         const countryName =
@@ -824,6 +975,7 @@ export const fetchPreferencePlaces = async (
           types: place.types,
           googleMapsUrl: place.googleMapsUri,
           photoUrl,
+          photoName,
           websiteUrl: place.websiteUri,
           priceLevel: place.priceLevel,
         });
@@ -831,64 +983,32 @@ export const fetchPreferencePlaces = async (
     }),
   );
 
+  throwIfAborted(options.signal);
   return Array.from(uniquePlaces.values()).slice(0, 16);
 };
 
-const weatherCodeToSummary = (code: number | null | undefined) => {
-  if (code == null) return 'Mixed conditions';
-  if (code == 0) return 'Clear sky';
-  if ([1, 2, 3].includes(code)) return 'Partly cloudy';
-  if ([45, 48].includes(code)) return 'Foggy';
-  if ([51, 53, 55, 56, 57].includes(code)) return 'Drizzle';
-  if ([61, 63, 65, 66, 67].includes(code)) return 'Rain';
-  if ([71, 73, 75, 77].includes(code)) return 'Snow';
-  if ([80, 81, 82].includes(code)) return 'Showers';
-  if ([95, 96, 99].includes(code)) return 'Thunderstorms';
-  return 'Varied weather';
-};
-
 export const fetchWeatherForecastRange = async (
   latitude: number,
   longitude: number,
   startDate: Date,
   endDate: Date,
+  options: { signal?: AbortSignal; span?: Span } = {},
 ): Promise<WeatherDaySummary[]> => {
-  const maxDays = 14;
-  const isoStart = startDate.toISOString().slice(0, 10);
-  const computedEnd = new Date(startDate);
-  const totalDays = Math.max(0, Math.floor((endDate.getTime() - startDate.getTime()) / 86400000));
-  computedEnd.setDate(computedEnd.getDate() + Math.min(maxDays, totalDays));
-  const isoEnd = computedEnd.toISOString().slice(0, 10);
-  const url = `https://api.open-meteo.com/v1/forecast?latitude=${latitude}&longitude=${longitude}&daily=weathercode,temperature_2m_max,temperature_2m_min,precipitation_probability_max&timezone=auto&start_date=${isoStart}&end_date=${isoEnd}`;
-
-  try {
-    const data = await fetchJson<any>(url);
-    const dailyWeather = data.daily ?? {};
-    const dates: string[] = Array.isArray(dailyWeather.time) ? dailyWeather.time : [];
-    const codes: any[] = Array.isArray(dailyWeather.weathercode)
-      ? dailyWeather.weathercode
-      : [];
-    const highs: any[] = Array.isArray(dailyWeather.temperature_2m_max)
-      ? dailyWeather.temperature_2m_max
-      : [];
-    const lows: any[] = Array.isArray(dailyWeather.temperature_2m_min)
-      ? dailyWeather.temperature_2m_min
-      : [];
-    const precip: any[] = Array.isArray(dailyWeather.precipitation_probability_max)
-      ? dailyWeather.precipitation_probability_max
-      : [];
-
-    return dates.map((date, index) => ({
-      date,
-      summary: weatherCodeToSummary(codes[index] ?? null),
-      highC: highs[index] ?? null,
-      lowC: lows[index] ?? null,
-      precipitationChance: precip[index] != null ? precip[index] / 100 : null,
-    }));
-  } catch (error) {
-    console.warn('Weather lookup failed', error);
-    return [];
+  const point = { lat: latitude, lng: longitude };
+  const lookup = await loadWeather(
+    [point],
+    startDate.toISOString().slice(0, 10),
+    endDate.toISOString().slice(0, 10),
+    options,
+  );
+  const days: WeatherDaySummary[] = [];
+  const cursor = new Date(startDate);
+  while (cursor <= endDate) {
+    const weather = lookup(point, cursor.toISOString().slice(0, 10));
+    if (weather) days.push(weather);
+    cursor.setUTCDate(cursor.getUTCDate() + 1);
   }
+  return days;
 };
 
 const sanitiseJsonResponse = (content: string | null | unknown) => {
@@ -908,19 +1028,16 @@ const normaliseDay = (
   day: any,
   dayIndex: number,
   fallbackDate: string,
-  candidateMap: Map<string, PlaceCandidate>,
+  placeIndex: PlaceIndex,
 ): ItineraryDay => {
   const date =
     typeof day?.date === 'string' && day.date.length > 0 ? day.date : fallbackDate;
   const stopsArray: any[] = Array.isArray(day?.stops) ? day.stops : [];
+  let previousCandidate: PlaceCandidate | undefined;
 
   const stops: ItineraryStop[] = stopsArray.map((entry, index) => {
     const title = String(entry.title ?? entry.name ?? `Experience ${index + 1}`);
-    const matchedCandidate = Array.from(candidateMap.values()).find(
-      (candidate) =>
-        candidate.name.toLowerCase().includes(title.toLowerCase()) ||
-        title.toLowerCase().includes(candidate.name.toLowerCase()),
-    );
+    const matchedCandidate = placeIndex.match(title);
 
     const costValue = Number(entry.estimated_price_usd ?? entry.estimatedPriceUsd ?? 0);
     const googleMapsUrl =
@@ -930,6 +1047,7 @@ const normaliseDay = (
       (matchedCandidate
         ? `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(matchedCandidate.name)}&query_place_id=${matchedCandidate.placeId}`
         : '');
+    const modelPhotoUrl = entry.photo_url ?? entry.photoUrl;
 
     const explicitCategory = (entry.category as ItineraryStop['category']) ?? undefined;
     const candidateCategory = matchedCandidate?.types
@@ -937,22 +1055,32 @@ const normaliseDay = (
       : 'activity';
     const resolvedCategory = explicitCategory ?? candidateCategory;
 
+    // Prefer an estimate from real coordinates over the model's guess.
+    const transfer =
+      index > 0 && previousCandidate && matchedCandidate
+        ? estimateLocalTransfer(previousCandidate.location, matchedCandidate.location)
+        : null;
+    previousCandidate = matchedCandidate;
+
     return {
       dayIndex,
       date,
       title,
       description: String(entry.description ?? entry.details ?? ''),
       google_maps_url: googleMapsUrl,
-      photo_url: entry.photo_url ?? entry.photoUrl ?? matchedCandidate?.photoUrl ?? '',
+      photo_url: modelPhotoUrl ?? matchedCandidate?.photoUrl ?? '',
+      photo_name: modelPhotoUrl ? undefined : matchedCandidate?.photoName,
       website_url: entry.website_url ?? entry.websiteUrl ?? matchedCandidate?.websiteUrl,
       estimated_cost: String(entry.estimated_cost ?? entry.price_tier ?? '$$'),
       estimated_price_usd: Number.isFinite(costValue) ? Number(costValue) : 0,
       duration: String(entry.duration ?? entry.duration_text ?? '1 hour'),
-      travel_time_from_previous: String(
-        entry.travel_time_from_previous ??
-          entry.travelTime ??
-          (index === 0 ? 'Start' : '15 min'),
-      ),
+      travel_time_from_previous: transfer
+        ? formatTransferLabel(transfer.minutes, transfer.mode)
+        : String(
+            entry.travel_time_from_previous ??
+              entry.travelTime ??
+              (index === 0 ? 'Start' : '15 min'),
+          ),
       time_block: String(entry.time_block ?? entry.time ?? ''),
       category: resolvedCategory,
     } satisfies ItineraryStop;
@@ -1012,11 +1140,12 @@ const buildFallbackItinerary = (
           ? `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(candidate.name)}&query_place_id=${candidate.placeId}`
           : ''),
       photo_url: candidate?.photoUrl ?? '',
+      photo_name: candidate?.photoName,
       website_url: candidate?.websiteUrl,
       estimated_cost: '$$',
       estimated_price_usd: 50,
       duration: '1 hour 30 min',
-      travel_time_from_previous: index === 0 ? 'Start' : '15 min walk',
+      travel_time_from_previous: 'Start',
       time_block: index === 0 ? '09:00 - 10:30' : '11:00 - 12:30',
       category: candidate?.types ? mapTypesToCategory(candidate.types) : 'activity',
     };
@@ -1062,7 +1191,13 @@ export const requestMultiDayItinerary = async (input: {
   places?: PlaceCandidate[];
   weatherByDay?: WeatherDaySummary[];
   originalQuery?: string;
-}): Promise<TripItinerary> => {
+}, options: {
+  /** Called with each day, in order, as soon as it has streamed in. */
+  onDay?: (day: ItineraryDay, index: number) => void;
+  signal?: AbortSignal;
+  span?: Span;
+} = {}): Promise<TripItinerary> => {
+  const { onDay, signal, span } = options;
   const places = input.places ?? [];
   const weatherByDay = input.weatherByDay ?? [];
   const limitedPlaces = (Array.isArray(places) ? places : []).slice(0, MAX_ITINERARY_PLACE_CANDIDATES);
@@ -1077,10 +1212,7 @@ export const requestMultiDayItinerary = async (input: {
     .join('\n');
 
   const weatherSummary = weatherByDay
-    .map(
-      (day) =>
-        `${day.date}: ${day.summary}`,
-    )
+    .map((day) => `${day.date}: ${describeWeather(day)}`)
     .join(' | ');
 
   if (!OPENAI_API_KEY) {
@@ -1094,16 +1226,37 @@ Preferences: ${input.preferences.length > 0 ? input.preferences.join(', ') : 'ge
 Weather outlook: ${weatherSummary || 'General clear skies'}.
 
 Suggested places:
-${candidateSummaries}`;
+${candidateSummaries}
+
+Respond with a JSON object. Put "days" first so it can be shown while the rest is written: {"days": [{"date", "summary": {"totalTime", "pace", "notes"}, "stops": [{"title", "description", "estimated_cost", "estimated_price_usd", "duration", "travel_time_from_previous", "time_block", "category"}]}], "trip_name", "destination", "highlights", "weatherSummary"}.`;
+
+  const placeIndex = getPlaceIndex(limitedPlaces);
+  const toItineraryDay = (day: any, index: number) =>
+    normaliseDay(day, index, weatherByDay[index]?.date ?? input.startDate, placeIndex);
+  // Days reported so far, in order. A day that fails to convert mid-stream
+  // stops the stream; the final pass below decides what happens to it.
+  let delivered = 0;
+  const dayStream = onDay
+    ? createJsonArrayStreamParser('days', (day, index) => {
+        if (index !== delivered) return;
+        onDay(toItineraryDay(day, index), index);
+        delivered += 1;
+      })
+    : null;
+  let streamFailed = false;
+  const pushDelta = (delta: string) => {
+    if (streamFailed || !dayStream) return;
+    try {
+      dayStream.push(delta);
+    } catch (error) {
+      streamFailed = true;
+      console.warn('Stopped streaming itinerary days', error);
+    }
+  };
 
   try {
-    const response = await fetch(OPENAI_CHAT_COMPLETIONS_ENDPOINT, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        Authorization: `Bearer ${OPENAI_API_KEY}`,
-      },
-      body: JSON.stringify({
+    const parsed = await cachedChatCompletion(
+      {
         model: 'gpt-4o-mini',
         temperature: 0.7,
         messages: [
@@ -1117,31 +1270,28 @@ ${candidateSummaries}`;
             content: prompt,
           },
         ],
-      }),
-    });
-
-    if (!response.ok) {
-      const message = await response.text();
-      throw new Error(`OpenAI request failed: ${response.status} ${message}`);
-    }
-
-    const payload = await response.json();
-    const content = payload.choices?.[0]?.message?.content as string | undefined;
-    const parsed = sanitiseJsonResponse(content);
-    if (!parsed) {
-      throw new Error('Could not parse itinerary from OpenAI response.');
-    }
-
-    const candidateMap = new Map<string, PlaceCandidate>();
-    limitedPlaces.forEach((place) => {
-      candidateMap.set(place.placeId, place);
-      candidateMap.set(place.name.toLowerCase(), place);
-    });
+      },
+      {
+        apiKey: OPENAI_API_KEY,
+        parse: (content) => {
+          const result = sanitiseJsonResponse(content);
+          if (!result) {
+            throw new Error('Could not parse itinerary from OpenAI response.');
+          }
+          return result;
+        },
+        onText: dayStream ? pushDelta : undefined,
+        signal,
+        span,
+      },
+    );
 
     const rawDays: any[] = Array.isArray(parsed.days) ? parsed.days : [];
-    const normalisedDays = rawDays.map((day, index) =>
-      normaliseDay(day, index, weatherByDay[index]?.date ?? input.startDate, candidateMap),
-    );
+    const normalisedDays = rawDays.map(toItineraryDay);
+    // Cached or coalesced results arrive without streaming; report whatever was not seen yet.
+    if (onDay) {
+      normalisedDays.slice(delivered).forEach((day, offset) => onDay(day, delivered + offset));
+    }
 
     const totalCost = normalisedDays.reduce(
       (total, day) => total + day.summary.estimatedSpend,
@@ -1165,37 +1315,129 @@ ${candidateSummaries}`;
 
     return itinerary;
   } catch (error) {
+    if (isAbortError(error)) throw error;
     console.warn('OpenAI itinerary generation failed', error);
     return buildFallbackItinerary(input, limitedPlaces);
   }
 };
 
-export const requestStopReplacement = async (input: {
+export type StopReplacementRequest = {
   city: string;
   date: string;
   daySummary: { totalTime: string; pace: string; notes: string; estimatedSpend: number };
   existingStops: ItineraryStop[];
-  replaceIndex: number;
   preferences: PreferenceOption[];
   budgetUsd?: number;
-}): Promise<ItineraryStop> => {
-  const {
-    city,
-    date,
-    daySummary,
-    existingStops,
-    replaceIndex,
-    preferences,
-    budgetUsd,
-  } = input;
-
-  const targetStop = existingStops[replaceIndex];
-  if (!targetStop) {
-    throw new Error('Invalid stop selected for replacement.');
+  /** Candidates the itinerary was planned from; a match skips the Places lookup. */
+  places?: PlaceCandidate[];
+};
+
+// Turn one suggested stop from the model into an ItineraryStop in the slot of
+// `targetStop`, filling missing links from the known places or a Places search.
+const buildReplacementStop = async (
+  parsed: any,
+  targetStop: ItineraryStop,
+  city: string,
+  places?: PlaceCandidate[],
+): Promise<ItineraryStop> => {
+  const estimatedPrice = Number(parsed.estimated_price_usd ?? parsed.estimatedPriceUsd);
+  const title = String(parsed.title ?? targetStop.title);
+
+  const placeLookupQuery = `${title} ${city}`.trim();
+  let googleMapsUrl = parsed.google_maps_url ?? parsed.googleMapsUrl ?? targetStop.google_maps_url;
+  let photoUrl = parsed.photo_url ?? parsed.photoUrl ?? targetStop.photo_url;
+  let photoName = photoUrl === targetStop.photo_url ? targetStop.photo_name : undefined;
+  let websiteUrl = parsed.website_url ?? parsed.websiteUrl ?? targetStop.website_url;
+
+  const knownPlace = places?.length ? getPlaceIndex(places).match(title) : undefined;
+  if (knownPlace) {
+    googleMapsUrl =
+      googleMapsUrl ||
+      knownPlace.googleMapsUrl ||
+      `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(knownPlace.name)}&query_place_id=${knownPlace.placeId}`;
+    if (!photoUrl) {
+      photoUrl = knownPlace.photoUrl;
+      photoName = knownPlace.photoName;
+    }
+    websiteUrl = websiteUrl || knownPlace.websiteUrl;
   }
 
-  if (!OPENAI_API_KEY) {
-    return targetStop;
+  if (!knownPlace && (!googleMapsUrl || !photoUrl || !websiteUrl) && GOOGLE_API_KEY) {
+    try {
+      const candidates = await callPlacesSearch(placeLookupQuery);
+      const matched =
+        createPlaceIndex(candidates, (place) => ({
+          name: place.displayName?.text ?? place.name,
+        })).match(title) ?? candidates[0];
+
+      if (matched) {
+        const candidatePhotoName = matched.photos?.[0]?.name;
+        const candidatePhoto = buildPhotoUrl(candidatePhotoName);
+        if (candidatePhoto && !photoUrl) {
+          photoUrl = candidatePhoto;
+          photoName = candidatePhotoName;
+        }
+
+        if (!googleMapsUrl) {
+          const placeId = extractPlaceId(matched.name) ?? matched.displayName?.text;
+          if (matched.googleMapsUri) {
+            googleMapsUrl = matched.googleMapsUri;
+          } else if (placeId) {
+            const label = matched.displayName?.text ?? title;
+            googleMapsUrl = `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(label)}&query_place_id=${placeId}`;
+          }
+        }
+
+        if (!websiteUrl && matched.websiteUri) {
+          websiteUrl = matched.websiteUri;
+        }
+      }
+    } catch (lookupError) {
+      console.warn('Failed to enrich replacement stop with Places data', lookupError);
+    }
+  }
+
+  return {
+    ...targetStop,
+    title,
+    description: parsed.description ?? targetStop.description,
+    google_maps_url: googleMapsUrl,
+    photo_url: photoUrl,
+    photo_name: photoName,
+    website_url: websiteUrl,
+    estimated_cost: parsed.estimated_cost ?? parsed.price_tier ?? targetStop.estimated_cost,
+    estimated_price_usd: Number.isFinite(estimatedPrice)
+      ? Number(estimatedPrice)
+      : targetStop.estimated_price_usd,
+    duration: parsed.duration ?? targetStop.duration,
+    travel_time_from_previous:
+      parsed.travel_time_from_previous ??
+      parsed.travelTime ??
+      targetStop.travel_time_from_previous,
+    time_block: parsed.time_block ?? parsed.time ?? targetStop.time_block,
+    category:
+      (parsed.category as ItineraryStop['category']) ?? targetStop.category ?? 'activity',
+    dayIndex: targetStop.dayIndex,
+    date: targetStop.date,
+  };
+};
+
+/**
+ * Ask for replacements for several stops of a day in a single completion.
+ * Returns up to `optionsPerStop` alternatives per requested index, best first;
+ * indices the model skipped (or every index, on failure) are left out.
+ */
+export const requestStopReplacements = async (
+  input: StopReplacementRequest & { replaceIndices: number[]; optionsPerStop?: number },
+): Promise<Record<number, ItineraryStop[]>> => {
+  const { city, date, daySummary, existingStops, preferences, budgetUsd } = input;
+  const optionsPerStop = Math.max(1, input.optionsPerStop ?? 1);
+  const targets = Array.from(new Set(input.replaceIndices)).filter(
+    (index) => existingStops[index] != null,
+  );
+
+  if (!OPENAI_API_KEY || targets.length === 0) {
+    return {};
   }
 
   const stopsOverview = existingStops
@@ -1205,139 +1447,120 @@ export const requestStopReplacement = async (input: {
     )
     .join('\n');
 
+  const targetList = targets
+    .map((index) => `#${index + 1} (${existingStops[index].category})`)
+    .join(', ');
+
   const prompt = `We are updating an itinerary in ${city} on ${date}.
 
 Current day summary: pace=${daySummary.pace}; notes=${daySummary.notes}; budget guidance=${
     budgetUsd != null ? `$${budgetUsd.toFixed(0)} per day` : 'flexible'
   }.
+Preferences: ${preferences.length > 0 ? preferences.join(', ') : 'general sightseeing'}.
 
 Current stops:
 ${stopsOverview}
 
-Replace entry #${
-    replaceIndex + 1
-  } with a new recommendation of the same category (${targetStop.category}). Respond with strict JSON containing title, description, google_maps_url, photo_url, website_url, estimated_cost (use $, $$, $$$), estimated_price_usd (number), duration, travel_time_from_previous, time_block, and category.`;
+Suggest ${optionsPerStop} replacement${optionsPerStop > 1 ? 's' : ''} for each of entries ${targetList}, each of the same category as the entry it replaces, and none repeating a current stop. Respond with strict JSON: {"replacements": [{"entry": <entry number>, "options": [{title, description, google_maps_url, photo_url, website_url, estimated_cost (use $, $$, $$$), estimated_price_usd (number), duration, travel_time_from_previous, time_block, category}]}]}.`;
 
   try {
-    const response = await fetch(OPENAI_CHAT_COMPLETIONS_ENDPOINT, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        Authorization: `Bearer ${OPENAI_API_KEY}`,
-      },
-      body: JSON.stringify({
+    const parsed = await cachedChatCompletion(
+      {
         model: 'gpt-4o-mini',
         temperature: 0.7,
         messages: [
           {
             role: 'system',
             content:
-              'You are PlanGenie, an assistant updating a single itinerary stop. Always return pure JSON with the requested fields.',
+              'You are PlanGenie, an assistant updating itinerary stops. Always return pure JSON with the requested fields.',
           },
           {
             role: 'user',
             content: prompt,
           },
         ],
-      }),
-    });
-
-    if (!response.ok) {
-      const message = await response.text();
-      throw new Error(`OpenAI request failed: ${response.status} ${message}`);
-    }
-
-    const payload = await response.json();
-    const content = payload.choices?.[0]?.message?.content as string | undefined;
-    const parsed = sanitiseJsonResponse(content);
-    if (!parsed) {
-      throw new Error('Could not parse replacement stop.');
-    }
-
-    const estimatedPrice = Number(parsed.estimated_price_usd ?? parsed.estimatedPriceUsd);
-    const title = String(parsed.title ?? targetStop.title);
-
-    const placeLookupQuery = `${title} ${city}`.trim();
-    let googleMapsUrl = parsed.google_maps_url ?? parsed.googleMapsUrl ?? targetStop.google_maps_url;
-    let photoUrl = parsed.photo_url ?? parsed.photoUrl ?? targetStop.photo_url;
-    let websiteUrl = parsed.website_url ?? parsed.websiteUrl ?? targetStop.website_url;
-
-    if ((!googleMapsUrl || !photoUrl || !websiteUrl) && GOOGLE_API_KEY) {
-      try {
-        const candidates = await callPlacesSearch(placeLookupQuery);
-        const matched =
-          candidates.find((place) => {
-            const displayName = place.displayName?.text ?? place.name ?? '';
-            return displayName.toLowerCase().includes(title.toLowerCase());
-          }) ?? candidates[0];
-
-        if (matched) {
-          const candidatePhoto = matched.photos?.[0]?.name
-            ? buildPhotoUrl(matched.photos[0].name)
-            : undefined;
-          if (candidatePhoto && !photoUrl) {
-            photoUrl = candidatePhoto;
-          }
-
-          if (!googleMapsUrl) {
-            const placeId = extractPlaceId(matched.name) ?? matched.displayName?.text;
-            if (matched.googleMapsUri) {
-              googleMapsUrl = matched.googleMapsUri;
-            } else if (placeId) {
-              const label = matched.displayName?.text ?? title;
-              googleMapsUrl = `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(label)}&query_place_id=${placeId}`;
-            }
+      },
+      {
+        apiKey: OPENAI_API_KEY,
+        // The prompt lists the current stops, so it changes after every replacement.
+        ttlMs: 24 * 60 * 60 * 1000,
+        parse: (content) => {
+          const result = sanitiseJsonResponse(content);
+          if (!result) {
+            throw new Error('Could not parse replacement stops.');
           }
+          return result;
+        },
+      },
+    );
 
-          if (!websiteUrl && matched.websiteUri) {
-            websiteUrl = matched.websiteUri;
-          }
-        }
-      } catch (lookupError) {
-        console.warn('Failed to enrich replacement stop with Places data', lookupError);
-      }
+    const entries: any[] = Array.isArray(parsed.replacements) ? parsed.replacements : [];
+    // A single-stop reply may come back as the bare stop object.
+    if (!entries.length && targets.length === 1 && parsed.title) {
+      entries.push({ entry: targets[0] + 1, options: [parsed] });
     }
 
-    const replacement: ItineraryStop = {
-      ...targetStop,
-      title,
-      description: parsed.description ?? targetStop.description,
-      google_maps_url: googleMapsUrl,
-      photo_url: photoUrl,
-      website_url: websiteUrl,
-      estimated_cost:
-        parsed.estimated_cost ?? parsed.price_tier ?? targetStop.estimated_cost,
-      estimated_price_usd: Number.isFinite(estimatedPrice)
-        ? Number(estimatedPrice)
-        : targetStop.estimated_price_usd,
-      duration: parsed.duration ?? targetStop.duration,
-      travel_time_from_previous:
-        parsed.travel_time_from_previous ??
-        parsed.travelTime ??
-        targetStop.travel_time_from_previous,
-      time_block: parsed.time_block ?? parsed.time ?? targetStop.time_block,
-      category:
-        (parsed.category as ItineraryStop['category']) ?? targetStop.category ?? 'activity',
-      dayIndex: targetStop.dayIndex,
-      date: targetStop.date,
-    };
+    const jobs = entries.flatMap((entry) => {
+      const index = Number(entry?.entry ?? entry?.index) - 1;
+      const options: any[] = Array.isArray(entry?.options) ? entry.options : [];
+      if (!targets.includes(index)) return [];
+      return options
+        .slice(0, optionsPerStop)
+        .filter((option) => option && typeof option === 'object')
+        .map((option) => ({ index, option }));
+    });
+
+    const stops = await mapWithConcurrency(jobs, 3, ({ index, option }) =>
+      buildReplacementStop(option, existingStops[index], city, input.places),
+    );
 
-    return replacement;
+    const result: Record<number, ItineraryStop[]> = {};
+    jobs.forEach(({ index }, position) => {
+      result[index] = [...(result[index] ?? []), stops[position]];
+    });
+    return result;
   } catch (error) {
-    console.warn('Failed to request stop replacement', error);
-    return targetStop;
+    console.warn('Failed to request stop replacements', error);
+    return {};
   }
 };
 
+export const requestStopReplacement = async (
+  input: StopReplacementRequest & { replaceIndex: number },
+): Promise<ItineraryStop> => {
+  const targetStop = input.existingStops[input.replaceIndex];
+  if (!targetStop) {
+    throw new Error('Invalid stop selected for replacement.');
+  }
+
+  const replacements = await requestStopReplacements({
+    ...input,
+    replaceIndices: [input.replaceIndex],
+  });
+  return replacements[input.replaceIndex]?.[0] ?? targetStop;
+};
+
+/**
+ * Reorder places into the shortest walking route, starting from the first one.
+ * Places without coordinates keep their relative order at the end.
+ */
 export const optimisePlaceOrder = async (
   places: PlaceCandidate[],
 ): Promise<PlaceCandidate[]> => {
   const placeList = Array.isArray(places) ? places : [];
-  if (Platform.OS === 'web' || placeList.length <= 2) {
+  const located = placeList.filter(
+    (place) =>
+      Number.isFinite(place?.location?.lat) && Number.isFinite(place?.location?.lng),
+  );
+  if (located.length <= 2) {
     return placeList;
   }
 
-  return placeList;
+  const unlocated = placeList.filter((place) => !located.includes(place));
+  const ordered = orderByRoute(
+    located.map((place) => ({ lat: place.location.lat, lng: place.location.lng, place })),
+  ).map(({ place }) => place);
+  return [...ordered, ...unlocated];
 };
 
 
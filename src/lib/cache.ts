@@ -0,0 +1,132 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+type StoredEntry<T> = {
+  key: string;
+  value: T;
+  storedAt: number;
+  expiresAt: number;
+};
+
+export type CacheLookup<T> = {
+  value: T;
+  storedAt: number;
+  /** True once the entry is past its TTL but still inside the stale window. */
+  stale: boolean;
+};
+
+export type PersistentCache<T> = {
+  get: (key: string) => Promise<T | undefined>;
+  lookup: (key: string) => Promise<CacheLookup<T> | undefined>;
+  set: (key: string, value: T, ttlMs?: number) => Promise<void>;
+  remove: (key: string) => Promise<void>;
+  clear: () => Promise<void>;
+};
+
+export type PersistentCacheOptions = {
+  /** AsyncStorage key the whole cache is serialised under. */
+  storageKey: string;
+  maxEntries: number;
+  ttlMs: number;
+  /** How long an expired entry may still be served by `lookup`. Defaults to 0. */
+  staleTtlMs?: number;
+  persistDelayMs?: number;
+};
+
+/**
+ * In-memory LRU cache with per-entry TTLs, mirrored to AsyncStorage.
+ * The stored snapshot is loaded lazily on first access and written back on a short debounce.
+ */
+export const createPersistentCache = <T>(
+  options: PersistentCacheOptions,
+): PersistentCache<T> => {
+  const { storageKey, maxEntries, ttlMs, staleTtlMs = 0, persistDelayMs = 500 } = options;
+  const entries = new Map<string, StoredEntry<T>>();
+  let hydrated: Promise<void> | null = null;
+  let persistTimer: ReturnType<typeof setTimeout> | null = null;
+
+  const isUsable = (entry: StoredEntry<T>, now: number) => entry.expiresAt + staleTtlMs > now;
+
+  const evictOverflow = () => {
+    while (entries.size > maxEntries) {
+      const oldest = entries.keys().next();
+      if (oldest.done) break;
+      entries.delete(oldest.value);
+    }
+  };
+
+  const hydrate = () => {
+    if (!hydrated) {
+      hydrated = (async () => {
+        try {
+          const raw = await AsyncStorage.getItem(storageKey);
+          if (!raw) return;
+          const stored = JSON.parse(raw) as StoredEntry<T>[] | null;
+          if (!Array.isArray(stored)) return;
+          const now = Date.now();
+          stored.forEach((entry) => {
+            // Entries written during hydration are newer than the snapshot.
+            if (!entry?.key || entries.has(entry.key) || !isUsable(entry, now)) return;
+            entries.set(entry.key, entry);
+          });
+          evictOverflow();
+        } catch (error) {
+          console.warn(`Failed to load cache ${storageKey}`, error);
+        }
+      })();
+    }
+    return hydrated;
+  };
+
+  const schedulePersist = () => {
+    if (persistTimer) return;
+    persistTimer = setTimeout(() => {
+      persistTimer = null;
+      const now = Date.now();
+      const snapshot = Array.from(entries.values()).filter((entry) => isUsable(entry, now));
+      AsyncStorage.setItem(storageKey, JSON.stringify(snapshot)).catch((error) => {
+        console.warn(`Failed to persist cache ${storageKey}`, error);
+      });
+    }, persistDelayMs);
+  };
+
+  const lookup = async (key: string): Promise<CacheLookup<T> | undefined> => {
+    await hydrate();
+    const entry = entries.get(key);
+    if (!entry) return undefined;
+    const now = Date.now();
+    if (!isUsable(entry, now)) {
+      entries.delete(key);
+      schedulePersist();
+      return undefined;
+    }
+    // Refresh recency for LRU eviction.
+    entries.delete(key);
+    entries.set(key, entry);
+    return { value: entry.value, storedAt: entry.storedAt, stale: entry.expiresAt <= now };
+  };
+
+  return {
+    lookup,
+    get: async (key) => {
+      const hit = await lookup(key);
+      return hit && !hit.stale ? hit.value : undefined;
+    },
+    set: async (key, value, entryTtlMs = ttlMs) => {
+      await hydrate();
+      const now = Date.now();
+      entries.delete(key);
+      entries.set(key, { key, value, storedAt: now, expiresAt: now + entryTtlMs });
+      evictOverflow();
+      schedulePersist();
+    },
+    remove: async (key) => {
+      await hydrate();
+      if (entries.delete(key)) schedulePersist();
+    },
+    clear: async () => {
+      await hydrate();
+      entries.clear();
+      schedulePersist();
+    },
+  };
+};
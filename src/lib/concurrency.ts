@@ -0,0 +1,46 @@
+export type Limiter = <T>(task: () => Promise<T>) => Promise<T>;
+
+/**
+ * Create a limiter that runs at most `limit` tasks at once.
+ * Tasks beyond the limit are queued and started in the order they were submitted.
+ */
+export const createLimiter = (limit: number): Limiter => {
+  const max = Number.isFinite(limit) && limit >= 1 ? Math.floor(limit) : 1;
+  let active = 0;
+  const queue: Array<() => void> = [];
+
+  const next = () => {
+    if (active >= max) return;
+    const start = queue.shift();
+    if (!start) return;
+    active += 1;
+    start();
+  };
+
+  return <T>(task: () => Promise<T>) =>
+    new Promise<T>((resolve, reject) => {
+      queue.push(() => {
+        Promise.resolve()
+          .then(task)
+          .then(resolve, reject)
+          .finally(() => {
+            active -= 1;
+            next();
+          });
+      });
+      next();
+    });
+};
+
+/**
+ * Map over `items` with at most `limit` callbacks in flight.
+ * The returned array keeps the input order regardless of completion order.
+ */
+export const mapWithConcurrency = async <T, R>(
+  items: T[],
+  limit: number,
+  mapper: (item: T, index: number) => Promise<R>,
+): Promise<R[]> => {
+  const run = createLimiter(limit);
+  return Promise.all(items.map((item, index) => run(() => mapper(item, index))));
+};
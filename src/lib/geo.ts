@@ -0,0 +1,19 @@
+export type LatLng = { lat: number; lng: number };
+
+const EARTH_RADIUS_KM = 6371;
+
+/** True when both coordinates are finite numbers (Places can omit a location). */
+export const hasCoordinates = (point: Partial<LatLng> | undefined): point is LatLng =>
+  Number.isFinite(point?.lat) && Number.isFinite(point?.lng);
+
+const toRadians = (degrees: number) => (degrees * Math.PI) / 180;
+
+/** Great-circle distance between two points in kilometres. */
+export const haversineKm = (from: LatLng, to: LatLng): number => {
+  const dLat = toRadians(to.lat - from.lat);
+  const dLng = toRadians(to.lng - from.lng);
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos(toRadians(from.lat)) * Math.cos(toRadians(to.lat)) * Math.sin(dLng / 2) ** 2;
+  return 2 * EARTH_RADIUS_KM * Math.asin(Math.min(1, Math.sqrt(a)));
+};
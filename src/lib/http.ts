@@ -0,0 +1,291 @@
+import { createAbortError, throwIfAborted } from './abort';
+import { createLimiter, Limiter } from './concurrency';
+import { Span } from './tracing';
+
+/**
+ * Shared client for every external API the app calls.
+ *
+ * Requests to one host share a concurrency cap and a token bucket, so a
+ * parallel fan-out (a 30-night trip, a batch of stop replacements) queues
+ * rather than bursting past the provider's quota. 429 and 5xx responses and
+ * network errors are retried with jittered exponential backoff, each attempt
+ * has a timeout, and every attempt made under a plan's span is charged to
+ * that plan's call budget. Once the budget for a host is spent, requests fail
+ * fast and callers fall back to cached or estimated data.
+ */
+
+type HostPolicy = {
+  /** Requests in flight at once. */
+  concurrency: number;
+  /** Sustained requests per second, with bursts of up to `burst`. */
+  ratePerSecond: number;
+  burst: number;
+  timeoutMs: number;
+  /** Extra attempts after a retryable failure. */
+  retries: number;
+};
+
+const DEFAULT_POLICY: HostPolicy = {
+  concurrency: 4,
+  ratePerSecond: 5,
+  burst: 5,
+  timeoutMs: 15000,
+  retries: 2,
+};
+
+// Google and Open-Meteo meter per minute, so each bucket allows a burst big
+// enough for a whole trip while burst + 60 s of refill stays under the
+// per-minute quota (600 for Places and Open-Meteo, 3000 for Geocoding).
+const HOST_POLICIES: Record<string, Partial<HostPolicy>> = {
+  'places.googleapis.com': { concurrency: 8, ratePerSecond: 8, burst: 100, timeoutMs: 10000 },
+  'maps.googleapis.com': { concurrency: 6, ratePerSecond: 50, burst: 50, timeoutMs: 10000 },
+  'api.open-meteo.com': { concurrency: 2, ratePerSecond: 8, burst: 10, timeoutMs: 10000 },
+  // Completions are slow and billed per token; one retry is plenty.
+  'api.openai.com': { concurrency: 3, ratePerSecond: 1, burst: 5, timeoutMs: 60000, retries: 1 },
+};
+
+// Calls one plan may make per host, retries included.
+const DEFAULT_PLAN_BUDGET: Record<string, number> = {
+  'places.googleapis.com': 160,
+  'maps.googleapis.com': 60,
+  'api.open-meteo.com': 12,
+  'api.openai.com': 12,
+};
+
+const RETRYABLE_STATUS = new Set([429, 500, 502, 503, 504]);
+const BASE_BACKOFF_MS = 400;
+const MAX_BACKOFF_MS = 8000;
+// A longer Retry-After than this is treated as a failure rather than waited out.
+const MAX_RETRY_AFTER_MS = 15000;
+
+type HostState = {
+  policy: HostPolicy;
+  limit: Limiter;
+  tokens: number;
+  refilledAt: number;
+};
+
+const hosts = new Map<string, HostState>();
+
+const hostOf = (url: string) => url.match(/^[a-z]+:\/\/([^/?#]+)/i)?.[1]?.toLowerCase() ?? '';
+
+const getHost = (host: string) => {
+  let state = hosts.get(host);
+  if (!state) {
+    const policy = { ...DEFAULT_POLICY, ...HOST_POLICIES[host] };
+    state = {
+      policy,
+      limit: createLimiter(policy.concurrency),
+      tokens: policy.burst,
+      refilledAt: Date.now(),
+    };
+    hosts.set(host, state);
+  }
+  return state;
+};
+
+const sleep = (ms: number, signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    if (signal?.aborted) {
+      reject(createAbortError());
+      return;
+    }
+    const onAbort = () => {
+      clearTimeout(timer);
+      reject(createAbortError());
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener('abort', onAbort);
+      resolve();
+    }, ms);
+    signal?.addEventListener('abort', onAbort);
+  });
+
+const takeToken = async (state: HostState, signal?: AbortSignal) => {
+  for (;;) {
+    const now = Date.now();
+    const { ratePerSecond, burst } = state.policy;
+    state.tokens = Math.min(burst, state.tokens + ((now - state.refilledAt) / 1000) * ratePerSecond);
+    state.refilledAt = now;
+    if (state.tokens >= 1) {
+      state.tokens -= 1;
+      return;
+    }
+    await sleep(((1 - state.tokens) / ratePerSecond) * 1000, signal);
+  }
+};
+
+export type CallBudget = {
+  limits: Record<string, number>;
+  used: Record<string, number>;
+  /** Requests refused because their host's budget was spent. */
+  refused: Record<string, number>;
+};
+
+/** A fresh budget, typically for one plan. Hosts without a limit are not counted. */
+export const createCallBudget = (limits: Record<string, number> = DEFAULT_PLAN_BUDGET): CallBudget => ({
+  limits,
+  used: {},
+  refused: {},
+});
+
+const untracedSpan = (budget: CallBudget): Span => {
+  const span: Span = {
+    name: 'untraced',
+    budget,
+    child: () => span,
+    set: () => undefined,
+    count: () => undefined,
+    end: () => undefined,
+  };
+  return span;
+};
+
+const budgetedSpan = (span: Span, budget: CallBudget): Span => ({
+  name: span.name,
+  budget,
+  child: (name, attrs) => budgetedSpan(span.child(name, attrs), budget),
+  set: span.set,
+  count: span.count,
+  end: span.end,
+});
+
+/**
+ * `parent` (or, with tracing off, a span that records nothing) whose
+ * descendants charge their requests to `budget`. The budget travels with the
+ * spans a run hands down, so a superseded run that is still finishing its
+ * requests keeps charging its own budget rather than the next run's.
+ */
+export const withCallBudget = (parent: Span | undefined, budget: CallBudget): Span =>
+  parent ? budgetedSpan(parent, budget) : untracedSpan(budget);
+
+const createBudgetError = (host: string) => {
+  const error = new Error(`Call budget for ${host} is spent for this plan.`);
+  error.name = 'CallBudgetError';
+  return error;
+};
+
+export const isCallBudgetError = (error: unknown): boolean =>
+  error instanceof Error && error.name === 'CallBudgetError';
+
+const chargeBudget = (host: string, budget: CallBudget | undefined) => {
+  const limit = budget?.limits[host];
+  if (!budget || limit == null) return;
+  if ((budget.used[host] ?? 0) >= limit) {
+    if (!budget.refused[host]) {
+      console.warn(`Call budget for ${host} spent; using cached or fallback data`);
+    }
+    budget.refused[host] = (budget.refused[host] ?? 0) + 1;
+    throw createBudgetError(host);
+  }
+  budget.used[host] = (budget.used[host] ?? 0) + 1;
+};
+
+/**
+ * Run one request to `url` once its host has a free slot and a token, and
+ * charge it to the budget of `span`. For transports other than `fetch`, such
+ * as the streaming XMLHttpRequest used for chat completions.
+ */
+export const withRequestSlot = <T>(
+  url: string,
+  task: () => Promise<T>,
+  options: { signal?: AbortSignal; span?: Span } = {},
+) => {
+  const host = hostOf(url);
+  const state = getHost(host);
+  return state.limit(async () => {
+    throwIfAborted(options.signal);
+    await takeToken(state, options.signal);
+    chargeBudget(host, options.span?.budget);
+    return task();
+  });
+};
+
+const createTimeoutError = (url: string, ms: number) => {
+  const error = new Error(`Request to ${hostOf(url)} timed out after ${ms} ms.`);
+  error.name = 'TimeoutError';
+  return error;
+};
+
+// One attempt, aborted when it times out or when the caller's signal fires.
+const fetchOnce = async (url: string, init: RequestInit, timeoutMs: number, signal?: AbortSignal) => {
+  const controller = new AbortController();
+  let timedOut = false;
+  const timer = setTimeout(() => {
+    timedOut = true;
+    controller.abort();
+  }, timeoutMs);
+  const onAbort = () => controller.abort();
+  signal?.addEventListener('abort', onAbort);
+  try {
+    return await fetch(url, { ...init, signal: controller.signal });
+  } catch (error) {
+    if (timedOut) throw createTimeoutError(url, timeoutMs);
+    if (signal?.aborted) throw createAbortError();
+    throw error;
+  } finally {
+    clearTimeout(timer);
+    signal?.removeEventListener('abort', onAbort);
+  }
+};
+
+const discardBody = async (response: Response) => {
+  try {
+    if (response.body?.cancel) await response.body.cancel();
+    else await response.text();
+  } catch {
+    // Already consumed or the connection dropped; nothing left to release.
+  }
+};
+
+const backoffMs = (attempt: number, response?: Response) => {
+  const retryAfter = Number(response?.headers.get('Retry-After'));
+  const jittered = Math.random() * Math.min(MAX_BACKOFF_MS, BASE_BACKOFF_MS * 2 ** attempt);
+  return Number.isFinite(retryAfter) && retryAfter > 0
+    ? Math.max(retryAfter * 1000, jittered)
+    : jittered;
+};
+
+export type HttpOptions = RequestInit & {
+  /** Per attempt; defaults to the host's policy. */
+  timeoutMs?: number;
+  /** Extra attempts after a 429, 5xx, timeout or network error. */
+  retries?: number;
+  /** Span of the call, whose `retries` counter records each retry and whose budget pays for it. */
+  span?: Span;
+};
+
+/**
+ * `fetch` through the host's limits. Resolves with the final response, which
+ * may still be an error status once retries are used up; rejects on network
+ * failure, timeout, abort or a spent budget.
+ */
+export const httpFetch = async (url: string, options: HttpOptions = {}): Promise<Response> => {
+  const { timeoutMs, retries, span, signal, ...init } = options;
+  const policy = getHost(hostOf(url)).policy;
+  const maxRetries = retries ?? policy.retries;
+  const callerSignal = signal ?? undefined;
+
+  for (let attempt = 0; ; attempt++) {
+    let response: Response | undefined;
+    try {
+      response = await withRequestSlot(
+        url,
+        () => fetchOnce(url, init, timeoutMs ?? policy.timeoutMs, callerSignal),
+        { signal: callerSignal, span },
+      );
+    } catch (error) {
+      const transient = error instanceof TypeError || (error as Error)?.name === 'TimeoutError';
+      if (!transient || attempt >= maxRetries) throw error;
+    }
+    if (response && (!RETRYABLE_STATUS.has(response.status) || attempt >= maxRetries)) {
+      return response;
+    }
+    const wait = backoffMs(attempt, response);
+    if (response && wait > MAX_RETRY_AFTER_MS) return response;
+    // Release the connection of the discarded response before waiting.
+    if (response) await discardBody(response);
+    span?.count('retries');
+    await sleep(wait, callerSignal);
+  }
+};
@@ -0,0 +1,109 @@
+import { ItineraryDay, ItineraryStop, TripItinerary } from '../types/plans';
+
+/**
+ * Immutable itinerary updates.
+ *
+ * Edits copy only the path to what changed: the itinerary object, its `days`
+ * array and the edited day. Every other day keeps its identity, which is what
+ * lets display conversion and list rows skip untouched days. Totals are
+ * adjusted by the edited day's difference instead of being summed again.
+ */
+
+export const sumStops = (stops: ItineraryStop[]) =>
+  stops.reduce((total, stop) => total + (stop.estimated_price_usd ?? 0), 0);
+
+/** Replace the stops of one day, keeping the day summary and trip total in step. */
+export const updateDayStops = (
+  itinerary: TripItinerary,
+  dayIndex: number,
+  update: (stops: ItineraryStop[]) => ItineraryStop[],
+): TripItinerary => {
+  const day = itinerary.days[dayIndex];
+  if (!day) return itinerary;
+  const stops = update(day.stops);
+  if (stops === day.stops) return itinerary;
+
+  const previousSpend = sumStops(day.stops);
+  const spend = sumStops(stops);
+  const updatedDay: ItineraryDay = {
+    ...day,
+    summary: { ...day.summary, estimatedSpend: spend, stopsCount: stops.length },
+    stops,
+  };
+  const days = itinerary.days.slice();
+  days[dayIndex] = updatedDay;
+
+  return {
+    ...itinerary,
+    total_estimated_cost: itinerary.total_estimated_cost - previousSpend + spend,
+    days,
+  };
+};
+
+export const removeStopAt = (itinerary: TripItinerary, dayIndex: number, stopIndex: number) =>
+  updateDayStops(itinerary, dayIndex, (stops) =>
+    stopIndex >= 0 && stopIndex < stops.length
+      ? [...stops.slice(0, stopIndex), ...stops.slice(stopIndex + 1)]
+      : stops,
+  );
+
+export const replaceStopsAt = (
+  itinerary: TripItinerary,
+  dayIndex: number,
+  replacements: Record<number, ItineraryStop>,
+) =>
+  updateDayStops(itinerary, dayIndex, (stops) => {
+    const indices = Object.keys(replacements)
+      .map(Number)
+      .filter((index) => index >= 0 && index < stops.length);
+    if (!indices.length) return stops;
+    const updated = stops.slice();
+    indices.forEach((index) => {
+      updated[index] = replacements[index];
+    });
+    return updated;
+  });
+
+const convertAmount = (amount: number, rate: number) =>
+  Number.isFinite(amount) ? amount * rate : 0;
+
+// Converted copy of each day for the last rate it was shown in. Keyed by the
+// source day, so edited days (new objects) miss and everything else hits.
+const convertedDays = new WeakMap<ItineraryDay, { rate: number; day: ItineraryDay }>();
+
+export const convertDayForDisplay = (day: ItineraryDay, rate: number): ItineraryDay => {
+  const cached = convertedDays.get(day);
+  if (cached && cached.rate === rate) return cached.day;
+
+  const converted: ItineraryDay = {
+    ...day,
+    summary: {
+      ...day.summary,
+      estimatedSpend: convertAmount(day.summary.estimatedSpend, rate),
+    },
+    stops: day.stops.map((stop) => ({
+      ...stop,
+      estimated_price_usd: convertAmount(stop.estimated_price_usd, rate),
+    })),
+  };
+  convertedDays.set(day, { rate, day: converted });
+  return converted;
+};
+
+/** USD itinerary in `currency`; unchanged days reuse their previous conversion. */
+export const convertItineraryForDisplay = (
+  source: TripItinerary,
+  currency: string,
+  rate: number,
+): TripItinerary => ({
+  ...source,
+  currency,
+  conversion_rate: rate,
+  base_currency: 'USD',
+  total_estimated_cost: convertAmount(source.total_estimated_cost, rate),
+  budget_converted:
+    source.budget_usd != null ? convertAmount(source.budget_usd, rate) : undefined,
+  daily_budget_converted:
+    source.daily_budget_usd != null ? convertAmount(source.daily_budget_usd, rate) : undefined,
+  days: source.days.map((day) => convertDayForDisplay(day, rate)),
+});
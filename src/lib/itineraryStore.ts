@@ -0,0 +1,577 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { AppState } from 'react-native';
+
+import {
+  deleteSavedTripsOnServer,
+  downloadSavedItinerary,
+  renameSavedTripOnServer,
+  tripVersion,
+  upsertSavedTrips,
+} from './savedTrips';
+import { SavedItineraryRecord, SavedTripSummary, TripItinerary } from '../types/plans';
+
+/**
+ * Offline-first store for saved trips.
+ *
+ * Saves, renames and deletes are applied to the local copy at once and queued
+ * for supabase. The queue is written behind: consecutive inserts and deletes
+ * go up as one request each, ops for a trip are sent in the order they were
+ * made, and failures are retried with backoff. Renames use a compare-and-set on
+ * `updated_at`, so a rename made on another device is not silently lost.
+ *
+ * Per user, the trip list is stored under one key as positional tuples, and
+ * each itinerary body under its own key so the list loads without them.
+ */
+
+// Summary fields in tuple order. Append only: stored tuples are read by position.
+const SUMMARY_FIELDS = [
+  'id',
+  'user_id',
+  'trip_name',
+  'destination',
+  'start_date',
+  'end_date',
+  'created_at',
+  'updated_at',
+  'currency',
+  'budget_usd',
+  'budget_converted',
+  'daily_budget_usd',
+  'daily_budget_converted',
+] as const;
+
+const INDEX_VERSION = 1;
+// Bodies downloaded from the server beyond this many are evicted, oldest first.
+// Bodies with unsent changes are always kept.
+const MAX_CACHED_BODIES = 30;
+const FLUSH_DELAY_MS = 1000;
+const PERSIST_DELAY_MS = 300;
+const MAX_BATCH = 20;
+const RETRY_BASE_MS = 2000;
+const RETRY_MAX_MS = 5 * 60 * 1000;
+// A change the server keeps rejecting (as opposed to a network failure) is
+// dropped after this many tries so it cannot block the queue forever.
+const MAX_REJECTED_ATTEMPTS = 5;
+// Client errors that are still worth retrying.
+const TRANSIENT_STATUS = new Set([408, 429]);
+
+const indexKey = (userId: string) => `plangenie.trips.${userId}`;
+const queueKey = (userId: string) => `plangenie.sync-queue.${userId}`;
+const bodyKey = (tripId: string) => `plangenie.trip.${tripId}`;
+
+type StoredTrip = {
+  summary: SavedTripSummary;
+  /** Version of the itinerary body kept on this device, if any. */
+  bodyVersion?: string;
+  /** Last time the trip was opened or written here. */
+  touchedAt: number;
+};
+
+type SyncOp =
+  | { kind: 'insert'; tripId: string; row: SavedItineraryRecord; attempts: number }
+  | { kind: 'rename'; tripId: string; tripName: string; attempts: number }
+  | { kind: 'delete'; tripId: string; attempts: number };
+
+type UserStore = {
+  userId: string;
+  trips: Map<string, StoredTrip>;
+  queue: SyncOp[];
+  /** Ops being sent right now; newer changes are never folded into them. */
+  sending: Set<SyncOp>;
+  listeners: Set<() => void>;
+  ready: Promise<void>;
+  flushing: Promise<void> | null;
+  flushTimer: ReturnType<typeof setTimeout> | null;
+  persistTimer: ReturnType<typeof setTimeout> | null;
+  retryTimer: ReturnType<typeof setTimeout> | null;
+  retries: number;
+};
+
+const stores = new Map<string, UserStore>();
+const opening = new Map<string, Promise<TripItinerary>>();
+
+const encodeTrip = ({ summary, bodyVersion, touchedAt }: StoredTrip) => [
+  ...SUMMARY_FIELDS.map((field) => summary[field] ?? null),
+  bodyVersion ?? null,
+  touchedAt,
+];
+
+const decodeTrip = (tuple: unknown[]): StoredTrip => {
+  const summary: Record<string, unknown> = {};
+  SUMMARY_FIELDS.forEach((field, index) => {
+    if (tuple[index] != null) summary[field] = tuple[index];
+  });
+  const bodyVersion = tuple[SUMMARY_FIELDS.length];
+  return {
+    summary: summary as SavedTripSummary,
+    bodyVersion: typeof bodyVersion === 'string' ? bodyVersion : undefined,
+    touchedAt: Number(tuple[SUMMARY_FIELDS.length + 1]) || 0,
+  };
+};
+
+const compareTrips = (a: SavedTripSummary, b: SavedTripSummary) => {
+  if (a.created_at !== b.created_at) return a.created_at < b.created_at ? 1 : -1;
+  if (a.id === b.id) return 0;
+  return a.id < b.id ? 1 : -1;
+};
+
+const createTripId = () => {
+  const bytes = new Uint8Array(16);
+  const cryptoApi = (globalThis as { crypto?: { getRandomValues?: (array: Uint8Array) => void } })
+    .crypto;
+  if (cryptoApi?.getRandomValues) {
+    cryptoApi.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i++) bytes[i] = Math.floor(Math.random() * 256);
+  }
+  // RFC 4122 version 4.
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
+const summariseRecord = (record: SavedItineraryRecord): SavedTripSummary => {
+  const { itinerary_data: itinerary, ...summary } = record;
+  return {
+    ...summary,
+    currency: itinerary.currency,
+    budget_usd: itinerary.budget_usd,
+    budget_converted: itinerary.budget_converted,
+    daily_budget_usd: itinerary.daily_budget_usd,
+    daily_budget_converted: itinerary.daily_budget_converted,
+  };
+};
+
+const hasPendingOps = (store: UserStore, tripId: string) =>
+  store.queue.some((op) => op.tripId === tripId);
+
+const notify = (store: UserStore) => {
+  store.listeners.forEach((listener) => listener());
+};
+
+const persist = (store: UserStore) => {
+  if (store.persistTimer) return;
+  store.persistTimer = setTimeout(() => {
+    store.persistTimer = null;
+    const index = {
+      v: INDEX_VERSION,
+      trips: Array.from(store.trips.values()).map(encodeTrip),
+    };
+    AsyncStorage.multiSet([
+      [indexKey(store.userId), JSON.stringify(index)],
+      [queueKey(store.userId), JSON.stringify(store.queue)],
+    ]).catch((error) => {
+      console.warn('Failed to persist saved trips', error);
+    });
+  }, PERSIST_DELAY_MS);
+};
+
+const readBody = async (tripId: string) => {
+  try {
+    const raw = await AsyncStorage.getItem(bodyKey(tripId));
+    if (!raw) return undefined;
+    const [version, itinerary] = JSON.parse(raw) as [string, TripItinerary];
+    return { version, itinerary };
+  } catch (error) {
+    console.warn('Failed to read stored itinerary', error);
+    return undefined;
+  }
+};
+
+const writeBody = async (store: UserStore, tripId: string, version: string, itinerary: TripItinerary) => {
+  const trip = store.trips.get(tripId);
+  if (!trip) return;
+  trip.bodyVersion = version;
+  trip.touchedAt = Date.now();
+  try {
+    await AsyncStorage.setItem(bodyKey(tripId), JSON.stringify([version, itinerary]));
+  } catch (error) {
+    console.warn('Failed to store itinerary', error);
+    trip.bodyVersion = undefined;
+  }
+  evictBodies(store);
+  persist(store);
+};
+
+const evictBodies = (store: UserStore) => {
+  const evictable = Array.from(store.trips.values())
+    .filter((trip) => trip.bodyVersion && !hasPendingOps(store, trip.summary.id))
+    .sort((a, b) => b.touchedAt - a.touchedAt)
+    .slice(MAX_CACHED_BODIES);
+  if (!evictable.length) return;
+  evictable.forEach((trip) => {
+    trip.bodyVersion = undefined;
+  });
+  AsyncStorage.multiRemove(evictable.map((trip) => bodyKey(trip.summary.id))).catch((error) => {
+    console.warn('Failed to evict stored itineraries', error);
+  });
+};
+
+const removeTrip = (store: UserStore, tripId: string) => {
+  if (!store.trips.delete(tripId)) return;
+  AsyncStorage.removeItem(bodyKey(tripId)).catch((error) => {
+    console.warn('Failed to remove stored itinerary', error);
+  });
+};
+
+const getStore = (userId: string): UserStore => {
+  const existing = stores.get(userId);
+  if (existing) return existing;
+
+  const created: UserStore = {
+    userId,
+    trips: new Map(),
+    queue: [],
+    sending: new Set(),
+    listeners: new Set(),
+    ready: Promise.resolve(),
+    flushing: null,
+    flushTimer: null,
+    persistTimer: null,
+    retryTimer: null,
+    retries: 0,
+  };
+  created.ready = (async () => {
+    try {
+      const entries = await AsyncStorage.multiGet([indexKey(userId), queueKey(userId)]);
+      const [rawIndex, rawQueue] = entries.map(([, value]) => value);
+      const index = rawIndex ? JSON.parse(rawIndex) : null;
+      if (index?.v === INDEX_VERSION && Array.isArray(index.trips)) {
+        index.trips.forEach((tuple: unknown[]) => {
+          const trip = decodeTrip(tuple);
+          if (trip.summary.id) created.trips.set(trip.summary.id, trip);
+        });
+      }
+      const queue = rawQueue ? JSON.parse(rawQueue) : null;
+      if (Array.isArray(queue)) created.queue = queue;
+    } catch (error) {
+      console.warn('Failed to load saved trips', error);
+    }
+    // Anything left over from the last session goes out now.
+    scheduleFlush(created, 0);
+  })();
+  stores.set(userId, created);
+  return created;
+};
+
+const enqueue = (store: UserStore, op: SyncOp) => {
+  const waiting = store.queue.filter((queued) => queued.tripId === op.tripId && !store.sending.has(queued));
+  const insert = waiting.find((queued) => queued.kind === 'insert') as
+    | Extract<SyncOp, { kind: 'insert' }>
+    | undefined;
+
+  if (op.kind === 'rename') {
+    if (insert) {
+      insert.row = {
+        ...insert.row,
+        trip_name: op.tripName,
+        itinerary_data: { ...insert.row.itinerary_data, trip_name: op.tripName },
+      };
+      return;
+    }
+    const rename = waiting.find((queued) => queued.kind === 'rename') as
+      | Extract<SyncOp, { kind: 'rename' }>
+      | undefined;
+    if (rename) {
+      rename.tripName = op.tripName;
+      return;
+    }
+  }
+
+  if (op.kind === 'delete') {
+    // Unsent changes to a trip being deleted are moot; an unsent insert means
+    // the server never saw the trip at all.
+    store.queue = store.queue.filter((queued) => !waiting.includes(queued));
+    if (insert) return;
+  }
+
+  store.queue.push(op);
+};
+
+const scheduleFlush = (store: UserStore, delayMs = FLUSH_DELAY_MS) => {
+  if (store.flushTimer || store.retryTimer) return;
+  store.flushTimer = setTimeout(() => {
+    store.flushTimer = null;
+    void flush(store);
+  }, delayMs);
+};
+
+const scheduleRetry = (store: UserStore) => {
+  if (store.retryTimer) return;
+  store.retries += 1;
+  const backoff = Math.min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** (store.retries - 1));
+  const delay = backoff / 2 + Math.random() * (backoff / 2);
+  store.retryTimer = setTimeout(() => {
+    store.retryTimer = null;
+    void flush(store);
+  }, delay);
+};
+
+/**
+ * Whether the server answered and refused the change. Network failures come
+ * back from supabase with status 0 and an empty `code`, and 5xx, 408 and 429
+ * may pass on a later try; none of those ever drop a change.
+ */
+const isServerRejection = (error: unknown) => {
+  const { status, code } = (error ?? {}) as { status?: unknown; code?: unknown };
+  if (typeof status === 'number') {
+    return status >= 400 && status < 500 && !TRANSIENT_STATUS.has(status);
+  }
+  return typeof code === 'string' && code !== '';
+};
+
+const takeBatch = (queue: SyncOp[]) => {
+  const [head] = queue;
+  if (head.kind === 'rename') return [head];
+  let end = 1;
+  while (end < queue.length && end < MAX_BATCH && queue[end].kind === head.kind) end += 1;
+  return queue.slice(0, end);
+};
+
+const sendBatch = async (store: UserStore, batch: SyncOp[]) => {
+  const [head] = batch;
+  if (head.kind === 'insert') {
+    await upsertSavedTrips(
+      batch.map((op) => (op as Extract<SyncOp, { kind: 'insert' }>).row),
+    );
+    return;
+  }
+  if (head.kind === 'delete') {
+    await deleteSavedTripsOnServer(batch.map((op) => op.tripId));
+    return;
+  }
+  if (head.kind === 'rename') {
+    const trip = store.trips.get(head.tripId);
+    const body = trip?.bodyVersion ? await readBody(head.tripId) : undefined;
+    const known =
+      trip && body && body.version === tripVersion(trip.summary)
+        ? { itinerary: body.itinerary, updated_at: trip.summary.updated_at }
+        : undefined;
+    const result = await renameSavedTripOnServer(head.tripId, head.tripName, known);
+    if (!result) {
+      // Deleted on another device; follow the server.
+      removeTrip(store, head.tripId);
+      return;
+    }
+    const current = store.trips.get(head.tripId);
+    if (current && result.updated_at) {
+      current.summary = { ...current.summary, updated_at: result.updated_at };
+      await writeBody(store, head.tripId, tripVersion(current.summary), {
+        ...result.itinerary,
+        trip_name: current.summary.trip_name,
+      });
+    }
+  }
+};
+
+const flush = (store: UserStore): Promise<void> => {
+  if (store.flushing) return store.flushing;
+  store.flushing = (async () => {
+    await store.ready;
+    while (store.queue.length) {
+      const batch = takeBatch(store.queue);
+      batch.forEach((op) => store.sending.add(op));
+      try {
+        await sendBatch(store, batch);
+        store.queue = store.queue.filter((op) => !batch.includes(op));
+        store.retries = 0;
+      } catch (error) {
+        const rejected = isServerRejection(error);
+        // Only rejections count towards dropping; a long offline spell does not.
+        if (rejected) {
+          batch.forEach((op) => {
+            op.attempts += 1;
+          });
+        }
+        if (rejected && batch[0].attempts >= MAX_REJECTED_ATTEMPTS) {
+          console.warn('Dropping saved trip change the server keeps rejecting', error);
+          store.queue = store.queue.filter((op) => !batch.includes(op));
+        } else {
+          console.warn('Saved trip sync failed; will retry', error);
+          scheduleRetry(store);
+          break;
+        }
+      } finally {
+        batch.forEach((op) => store.sending.delete(op));
+        persist(store);
+        notify(store);
+      }
+    }
+  })().finally(() => {
+    store.flushing = null;
+  });
+  return store.flushing;
+};
+
+const listTrips = (store: UserStore) =>
+  Array.from(store.trips.values(), (trip) => trip.summary).sort(compareTrips);
+
+/** The user's trips known on this device, newest first. */
+export const loadStoredTrips = async (userId: string): Promise<SavedTripSummary[]> => {
+  const store = getStore(userId);
+  await store.ready;
+  return listTrips(store);
+};
+
+/** Call `listener` whenever the stored trips change, locally or through sync. */
+export const subscribeStoredTrips = (userId: string, listener: () => void) => {
+  const store = getStore(userId);
+  store.listeners.add(listener);
+  return () => {
+    store.listeners.delete(listener);
+  };
+};
+
+/** Send queued changes now instead of waiting for the next scheduled flush. */
+export const syncStoredTrips = (userId: string) => {
+  const store = getStore(userId);
+  if (store.retryTimer) {
+    clearTimeout(store.retryTimer);
+    store.retryTimer = null;
+  }
+  return flush(store);
+};
+
+export const saveTrip = async (
+  userId: string,
+  fields: Pick<SavedItineraryRecord, 'trip_name' | 'destination' | 'start_date' | 'end_date'> & {
+    itinerary_data: TripItinerary;
+  },
+): Promise<SavedTripSummary> => {
+  const store = getStore(userId);
+  await store.ready;
+  const now = new Date().toISOString();
+  const record: SavedItineraryRecord = {
+    ...fields,
+    id: createTripId(),
+    user_id: userId,
+    created_at: now,
+    updated_at: now,
+  };
+  const summary = summariseRecord(record);
+  store.trips.set(record.id, { summary, touchedAt: Date.now() });
+  enqueue(store, { kind: 'insert', tripId: record.id, row: record, attempts: 0 });
+  await writeBody(store, record.id, tripVersion(summary), record.itinerary_data);
+  notify(store);
+  scheduleFlush(store);
+  return summary;
+};
+
+export const renameTrip = async (userId: string, tripId: string, tripName: string) => {
+  const store = getStore(userId);
+  await store.ready;
+  const trip = store.trips.get(tripId);
+  if (!trip) return undefined;
+
+  trip.summary = { ...trip.summary, trip_name: tripName };
+  trip.touchedAt = Date.now();
+  enqueue(store, { kind: 'rename', tripId, tripName, attempts: 0 });
+  const body = trip.bodyVersion ? await readBody(tripId) : undefined;
+  if (body) {
+    await writeBody(store, tripId, body.version, { ...body.itinerary, trip_name: tripName });
+  }
+  persist(store);
+  notify(store);
+  scheduleFlush(store);
+  return trip.summary;
+};
+
+export const deleteTrip = async (userId: string, tripId: string) => {
+  const store = getStore(userId);
+  await store.ready;
+  removeTrip(store, tripId);
+  enqueue(store, { kind: 'delete', tripId, attempts: 0 });
+  persist(store);
+  notify(store);
+  scheduleFlush(store);
+};
+
+/**
+ * The itinerary of a trip: from this device when the stored copy is current,
+ * otherwise downloaded and kept for next time.
+ */
+export const openTrip = (userId: string, trip: SavedTripSummary): Promise<TripItinerary> => {
+  const key = `${trip.id}@${tripVersion(trip)}`;
+  const pending = opening.get(key);
+  if (pending) return pending;
+
+  const request = (async () => {
+    const store = getStore(userId);
+    await store.ready;
+    const stored = store.trips.get(trip.id);
+    if (stored?.bodyVersion) {
+      const body = await readBody(trip.id);
+      // Local edits not yet synced win over whatever the server has.
+      if (body && (body.version === tripVersion(trip) || hasPendingOps(store, trip.id))) {
+        stored.touchedAt = Date.now();
+        persist(store);
+        return body.itinerary;
+      }
+    }
+
+    const downloaded = await downloadSavedItinerary(trip.id);
+    if (!downloaded) {
+      removeTrip(store, trip.id);
+      persist(store);
+      notify(store);
+      throw new Error('This trip has been deleted.');
+    }
+    const summary = { ...trip, updated_at: downloaded.updated_at ?? trip.updated_at };
+    if (!store.trips.has(trip.id)) {
+      store.trips.set(trip.id, { summary, touchedAt: Date.now() });
+    }
+    await writeBody(store, trip.id, tripVersion(summary), downloaded.itinerary);
+    return downloaded.itinerary;
+  })().finally(() => {
+    opening.delete(key);
+  });
+  opening.set(key, request);
+  return request;
+};
+
+/**
+ * Fold a page from `fetchSavedTripsPage` into the store. Trips in the page's
+ * range that the server no longer has are dropped, unless they have changes
+ * still waiting to be sent.
+ */
+export const mergeServerTrips = async (
+  userId: string,
+  page: { trips: SavedTripSummary[]; hasMore: boolean },
+  after?: Pick<SavedTripSummary, 'id' | 'created_at'>,
+) => {
+  const store = getStore(userId);
+  await store.ready;
+
+  const seen = new Set(page.trips.map((trip) => trip.id));
+  const last = page.trips[page.trips.length - 1];
+  Array.from(store.trips.values()).forEach(({ summary }) => {
+    if (seen.has(summary.id) || hasPendingOps(store, summary.id)) return;
+    const belowUpper = !after || compareTrips(summary, after as SavedTripSummary) > 0;
+    const aboveLower = !page.hasMore || !last || compareTrips(summary, last) <= 0;
+    if (belowUpper && aboveLower) removeTrip(store, summary.id);
+  });
+
+  page.trips.forEach((summary) => {
+    if (hasPendingOps(store, summary.id)) return;
+    const existing = store.trips.get(summary.id);
+    store.trips.set(summary.id, {
+      summary,
+      // A stale body is kept until it is opened and replaced.
+      bodyVersion: existing?.bodyVersion,
+      touchedAt: existing?.touchedAt ?? 0,
+    });
+  });
+
+  persist(store);
+  notify(store);
+  return listTrips(store);
+};
+
+// Coming back online usually coincides with the app returning to the foreground.
+AppState.addEventListener('change', (state) => {
+  if (state !== 'active') return;
+  stores.forEach((store) => {
+    if (store.queue.length) void syncStoredTrips(store.userId);
+  });
+});
@@ -0,0 +1,88 @@
+/**
+ * Pull the elements of one array property out of a JSON document while it is
+ * still arriving, e.g. each `days[i]` of a streamed itinerary.
+ *
+ * Feed text with `push`; `onItem` fires once per element as soon as its
+ * closing brace arrives, with its position in the array. Text before the
+ * property (including a ```json fence) is ignored, and only object elements
+ * are reported. An element that is not valid JSON is skipped but still takes
+ * its index; errors thrown by `onItem` propagate out of `push`.
+ */
+export const createJsonArrayStreamParser = (
+  property: string,
+  onItem: (item: any, index: number) => void,
+) => {
+  const opener = new RegExp(`"${property}"\\s*:\\s*\\[`, 'g');
+  let buffer = '';
+  let phase: 'seek' | 'array' | 'done' = 'seek';
+  let cursor = 0;
+  let depth = 0;
+  let inString = false;
+  let escaped = false;
+  let itemStart = -1;
+  let count = 0;
+
+  // Parsed elements are collected during the scan and reported once the
+  // scanner's state is settled, so a throwing `onItem` cannot derail it.
+  const scan = () => {
+    const ready: Array<[item: any, index: number]> = [];
+    if (phase === 'seek') {
+      opener.lastIndex = cursor;
+      const found = opener.exec(buffer);
+      if (!found) {
+        // Keep a tail in case the key is split across chunks.
+        cursor = Math.max(0, buffer.length - property.length - 16);
+        return ready;
+      }
+      phase = 'array';
+      cursor = found.index + found[0].length;
+    }
+
+    for (; phase === 'array' && cursor < buffer.length; cursor++) {
+      const char = buffer[cursor];
+      if (inString) {
+        if (escaped) escaped = false;
+        else if (char === '\\') escaped = true;
+        else if (char === '"') inString = false;
+        continue;
+      }
+      if (char === '"') {
+        inString = true;
+      } else if (char === '{' || char === '[') {
+        if (depth === 0 && char === '{') itemStart = cursor;
+        depth += 1;
+      } else if (char === '}' || char === ']') {
+        if (depth === 0) {
+          phase = 'done';
+          break;
+        }
+        depth -= 1;
+        if (depth === 0 && itemStart >= 0) {
+          const raw = buffer.slice(itemStart, cursor + 1);
+          const index = count;
+          itemStart = -1;
+          // The slot counts even when skipped, so indexes match the final array.
+          count += 1;
+          try {
+            ready.push([JSON.parse(raw), index]);
+          } catch (error) {
+            console.warn(`Skipping unparseable ${property} entry`, error);
+          }
+        }
+      }
+    }
+    return ready;
+  };
+
+  return {
+    push: (text: string) => {
+      if (phase === 'done' || !text) return;
+      buffer += text;
+      scan().forEach(([item, index]) => onItem(item, index));
+    },
+    /** Number of elements seen so far, skipped ones included. */
+    get count() {
+      return count;
+    },
+  };
+};
@@ -0,0 +1,194 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { Directory, File, Paths } from 'expo-file-system';
+import { Image, Platform } from 'react-native';
+
+import { createLimiter } from './concurrency';
+import { GOOGLE_API_KEY } from './env';
+import { hashText } from './hash';
+import { ItineraryStop } from '../types/plans';
+
+/**
+ * Place photos: size variants of the Places media URL, and an on-device copy
+ * of each photo the app has shown, so saved trips keep their pictures offline
+ * and the same photo is not paid for twice.
+ *
+ * Photos are identified by their Places resource name
+ * (`places/<id>/photos/<ref>`); URLs carry the API key and are built on demand.
+ */
+
+export type PhotoSize = 'thumbnail' | 'card' | 'hero';
+
+// Longest edge requested from the media endpoint, enough for 3x screens.
+const PHOTO_SIZE_PX: Record<PhotoSize, number> = {
+  thumbnail: 240,
+  card: 640,
+  hero: 1200,
+};
+
+const INDEX_KEY = 'plangenie.photo-cache';
+const PHOTO_CACHE_BYTES = 64 * 1024 * 1024;
+const PERSIST_DELAY_MS = 1000;
+const DOWNLOAD_CONCURRENCY = 3;
+
+const PHOTO_NAME_PATTERN = /places\.googleapis\.com\/v1\/(places\/[^/?]+\/photos\/[^/?]+)\/media/;
+
+export const buildPhotoUrl = (photoName?: string | null, size: PhotoSize = 'card') => {
+  if (!photoName || !GOOGLE_API_KEY) return undefined;
+  const px = PHOTO_SIZE_PX[size];
+  return `https://places.googleapis.com/v1/${photoName}/media?maxHeightPx=${px}&maxWidthPx=${px}&key=${GOOGLE_API_KEY}`;
+};
+
+/**
+ * Photo resource name of a stop. Trips saved before names were stored only
+ * have the URL, which still contains it.
+ */
+export const stopPhotoName = (stop: Pick<ItineraryStop, 'photo_name' | 'photo_url'>) =>
+  stop.photo_name || stop.photo_url?.match(PHOTO_NAME_PATTERN)?.[1] || undefined;
+
+// Disk cache. The index is ordered least recently used first and mirrored to
+// AsyncStorage as [file name, bytes] pairs.
+const index = new Map<string, number>();
+const inFlight = new Map<string, Promise<string | undefined>>();
+const limit = createLimiter(DOWNLOAD_CONCURRENCY);
+let totalBytes = 0;
+let hydrated: Promise<void> | null = null;
+let persistTimer: ReturnType<typeof setTimeout> | null = null;
+let directory: Directory | null = null;
+
+const supported = Platform.OS !== 'web';
+
+const getDirectory = () => {
+  if (!directory) {
+    directory = new Directory(Paths.document, 'place-photos');
+    directory.create({ idempotent: true });
+  }
+  return directory;
+};
+
+const fileName = (photoName: string, size: PhotoSize) => `${hashText(photoName)}-${size}.jpg`;
+
+const hydrate = () => {
+  if (!hydrated) {
+    hydrated = (async () => {
+      try {
+        const raw = await AsyncStorage.getItem(INDEX_KEY);
+        const stored = raw ? (JSON.parse(raw) as [string, number][]) : [];
+        if (!Array.isArray(stored)) return;
+        stored.forEach(([name, bytes]) => {
+          // Files downloaded during hydration are newer than the snapshot.
+          if (typeof name !== 'string' || index.has(name)) return;
+          index.set(name, bytes);
+          totalBytes += bytes;
+        });
+      } catch (error) {
+        console.warn('Failed to load photo cache index', error);
+      }
+    })();
+  }
+  return hydrated;
+};
+
+const schedulePersist = () => {
+  if (persistTimer) return;
+  persistTimer = setTimeout(() => {
+    persistTimer = null;
+    AsyncStorage.setItem(INDEX_KEY, JSON.stringify(Array.from(index))).catch((error) => {
+      console.warn('Failed to save photo cache index', error);
+    });
+  }, PERSIST_DELAY_MS);
+};
+
+const forget = (name: string) => {
+  totalBytes -= index.get(name) ?? 0;
+  index.delete(name);
+};
+
+const touch = (name: string) => {
+  const bytes = index.get(name);
+  if (bytes == null) return;
+  index.delete(name);
+  index.set(name, bytes);
+  schedulePersist();
+};
+
+const evictOverflow = () => {
+  while (totalBytes > PHOTO_CACHE_BYTES && index.size > 1) {
+    const oldest = index.keys().next().value as string;
+    forget(oldest);
+    try {
+      const file = new File(getDirectory(), oldest);
+      if (file.exists) file.delete();
+    } catch (error) {
+      console.warn('Failed to evict cached photo', error);
+    }
+  }
+};
+
+/**
+ * Local URI of a photo that is already on disk, without waiting. Returns
+ * `undefined` until the index has loaded or when the photo is not cached.
+ */
+export const cachedPhotoUri = (photoName: string, size: PhotoSize) => {
+  if (!supported) return undefined;
+  const name = fileName(photoName, size);
+  if (!index.has(name)) return undefined;
+  touch(name);
+  return new File(getDirectory(), name).uri;
+};
+
+/**
+ * Local URI of a photo, downloading it into the cache first if needed.
+ * Resolves to `undefined` when the photo cannot be fetched (offline, no key,
+ * or on web, where there is no file system to cache into).
+ */
+export const cachePlacePhoto = (photoName: string, size: PhotoSize) => {
+  if (!supported) return Promise.resolve(undefined);
+  const name = fileName(photoName, size);
+  const pending = inFlight.get(name);
+  if (pending) return pending;
+
+  const task = (async () => {
+    await hydrate();
+    const file = new File(getDirectory(), name);
+    if (index.has(name)) {
+      if (file.exists) {
+        touch(name);
+        return file.uri;
+      }
+      forget(name);
+    }
+
+    const url = buildPhotoUrl(photoName, size);
+    if (!url) return undefined;
+    try {
+      const downloaded = await limit(() => {
+        if (file.exists) file.delete();
+        return File.downloadFileAsync(url, file);
+      });
+      index.set(name, downloaded.size ?? 0);
+      totalBytes += downloaded.size ?? 0;
+      evictOverflow();
+      schedulePersist();
+      return downloaded.uri;
+    } catch {
+      // Offline or the photo is gone; callers fall back to the network URL.
+      return undefined;
+    }
+  })().finally(() => {
+    inFlight.delete(name);
+  });
+  inFlight.set(name, task);
+  return task;
+};
+
+/** Fetch the photos of some stops ahead of showing them. */
+export const prefetchStopPhotos = (stops: ItineraryStop[], size: PhotoSize) => {
+  stops.forEach((stop) => {
+    const photoName = stopPhotoName(stop);
+    if (photoName && supported) {
+      void cachePlacePhoto(photoName, size);
+    } else if (stop.photo_url) {
+      Image.prefetch(stop.photo_url).catch(() => undefined);
+    }
+  });
+};
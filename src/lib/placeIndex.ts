@@ -0,0 +1,171 @@
+import type { PlaceCandidate } from './api';
+
+// Words that carry no identity on their own ("Café de Flore" vs "Cafe Flore").
+const STOP_WORDS = new Set([
+  'a', 'an', 'and', 'at', 'the', 'of', 'in', 'on', 'to',
+  'de', 'del', 'della', 'des', 'du', 'la', 'le', 'les', 'el', 'il', 'lo', 'y',
+]);
+
+// Kinds of place rather than names of one: they say little about which place is
+// meant, so they do not count towards the distinctive words of a name.
+const GENERIC_WORDS = new Set([
+  'museum', 'musee', 'museo', 'gallery', 'galerie', 'art', 'arts',
+  'park', 'parc', 'parque', 'garden', 'gardens', 'jardin', 'jardins',
+  'church', 'cathedral', 'basilica', 'chapel', 'temple', 'shrine',
+  'palace', 'palais', 'castle', 'tower', 'bridge', 'square', 'plaza', 'piazza',
+  'market', 'marche', 'mercado', 'station', 'beach', 'hotel', 'restaurant', 'cafe', 'bar',
+  'street', 'rue', 'avenue', 'centre', 'center', 'hall', 'house', 'theatre', 'theater',
+]);
+
+// Below this score a lookup counts as a miss.
+const MIN_MATCH_SCORE = 0.6;
+// When every word of the shorter name appears in the longer one ("Sainte
+// Chapelle" vs "La Sainte-Chapelle de Paris"), treat it as at least this good a
+// match. One distinctive word is too weak for that ("Park" is in "Park Hyatt
+// Paris"), so such names have to pass on trigram similarity alone.
+const CONTAINED_SCORE = 0.75;
+const MIN_CONTAINED_WORDS = 2;
+
+/** Fold accents, case and punctuation so spelling variants compare equal. */
+export const normalisePlaceName = (name: string) =>
+  name
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/&/g, ' and ')
+    .replace(/['’`]/g, '')
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim();
+
+const tokenise = (normalised: string) =>
+  Array.from(new Set(normalised.split(' ').filter((t) => t && !STOP_WORDS.has(t))));
+
+const trigrams = (normalised: string) => {
+  const padded = `  ${normalised} `;
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= padded.length; i++) grams.add(padded.slice(i, i + 3));
+  return grams;
+};
+
+const countDistinctive = (tokens: string[]) => tokens.filter((t) => !GENERIC_WORDS.has(t)).length;
+
+type IndexedPlace<T> = {
+  place: T;
+  tokens: string[];
+  distinctive: number;
+  gramCount: number;
+};
+
+export type PlaceIndex<T = PlaceCandidate> = {
+  size: number;
+  byId: (placeId: string) => T | undefined;
+  /** Best candidate for a free-text name, or `undefined` when nothing is close. */
+  match: (name: string) => T | undefined;
+};
+
+const addPosting = <K>(postings: Map<K, number[]>, key: K, value: number) => {
+  const list = postings.get(key);
+  if (list) list.push(value);
+  else postings.set(key, [value]);
+};
+
+/**
+ * Name index over place candidates. Lookups only touch candidates that share a
+ * word or trigram with the query and score them by trigram similarity, so
+ * "Musee d'Orsay" finds "Musée d’Orsay" without scanning every place.
+ */
+export const createPlaceIndex = <T = PlaceCandidate>(
+  places: T[],
+  describe: (place: T) => { name?: string; placeId?: string } = (place) =>
+    place as unknown as PlaceCandidate,
+): PlaceIndex<T> => {
+  const entries: IndexedPlace<T>[] = [];
+  const ids = new Map<string, T>();
+  const exact = new Map<string, number>();
+  const tokenPostings = new Map<string, number[]>();
+  const gramPostings = new Map<string, number[]>();
+
+  places.forEach((place) => {
+    if (!place) return;
+    const { name, placeId } = describe(place);
+    if (!name) return;
+    if (placeId) {
+      if (ids.has(placeId)) return;
+      ids.set(placeId, place);
+    }
+    const normalised = normalisePlaceName(name);
+    if (!normalised) return;
+    const position = entries.length;
+    const grams = trigrams(normalised);
+    const tokens = tokenise(normalised);
+    entries.push({ place, tokens, distinctive: countDistinctive(tokens), gramCount: grams.size });
+    if (!exact.has(normalised)) exact.set(normalised, position);
+    tokens.forEach((token) => addPosting(tokenPostings, token, position));
+    grams.forEach((gram) => addPosting(gramPostings, gram, position));
+  });
+
+  const match = (name: string) => {
+    const normalised = normalisePlaceName(name ?? '');
+    if (!normalised) return undefined;
+    const exactHit = exact.get(normalised);
+    if (exactHit != null) return entries[exactHit].place;
+
+    const queryTokens = tokenise(normalised);
+    // "Museum" or "Art Gallery" names no particular place; only an exact name will do.
+    const queryDistinctive = countDistinctive(queryTokens);
+    if (queryDistinctive === 0) return undefined;
+    const queryGrams = trigrams(normalised);
+    const sharedTokens = new Map<number, number>();
+    queryTokens.forEach((token) => {
+      tokenPostings.get(token)?.forEach((position) => {
+        sharedTokens.set(position, (sharedTokens.get(position) ?? 0) + 1);
+      });
+    });
+    const sharedGrams = new Map<number, number>();
+    queryGrams.forEach((gram) => {
+      gramPostings.get(gram)?.forEach((position) => {
+        sharedGrams.set(position, (sharedGrams.get(position) ?? 0) + 1);
+      });
+    });
+
+    let best: number | undefined;
+    let bestScore = 0;
+    sharedGrams.forEach((shared, position) => {
+      const entry = entries[position];
+      let score = (2 * shared) / (queryGrams.size + entry.gramCount);
+      const tokenHits = sharedTokens.get(position) ?? 0;
+      const shorter =
+        queryTokens.length <= entry.tokens.length
+          ? { tokens: queryTokens.length, distinctive: queryDistinctive }
+          : { tokens: entry.tokens.length, distinctive: entry.distinctive };
+      if (shorter.distinctive >= MIN_CONTAINED_WORDS && tokenHits === shorter.tokens) {
+        score = Math.max(score, CONTAINED_SCORE);
+      }
+      if (score < MIN_MATCH_SCORE) return;
+      // Ties go to the earlier (higher-ranked) candidate.
+      if (best == null || score > bestScore || (score === bestScore && position < best)) {
+        best = position;
+        bestScore = score;
+      }
+    });
+    return best != null ? entries[best].place : undefined;
+  };
+
+  return {
+    size: entries.length,
+    byId: (placeId) => ids.get(placeId),
+    match,
+  };
+};
+
+const indexCache = new WeakMap<PlaceCandidate[], PlaceIndex>();
+
+/** Index for a candidate list, built once per list instance. */
+export const getPlaceIndex = (places: PlaceCandidate[]): PlaceIndex => {
+  let index = indexCache.get(places);
+  if (!index) {
+    index = createPlaceIndex(places);
+    indexCache.set(places, index);
+  }
+  return index;
+};
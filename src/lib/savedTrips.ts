@@ -0,0 +1,192 @@
+import { supabase } from './supabase';
+import { SavedItineraryRecord, SavedTripSummary, TripItinerary } from '../types/plans';
+
+/**
+ * Server side of saved trips: reads and writes against the `itineraries`
+ * table. Screens go through the local store in `itineraryStore`, which calls
+ * into this module from its sync queue.
+ */
+
+export const SAVED_TRIPS_PAGE_SIZE = 20;
+
+// Everything the list renders, with the budget fields read out of the JSON
+// column server-side so the itinerary itself stays on the server.
+const SUMMARY_COLUMNS = [
+  'id',
+  'user_id',
+  'trip_name',
+  'destination',
+  'start_date',
+  'end_date',
+  'created_at',
+  'currency:itinerary_data->currency',
+  'budget_usd:itinerary_data->budget_usd',
+  'budget_converted:itinerary_data->budget_converted',
+  'daily_budget_usd:itinerary_data->daily_budget_usd',
+  'daily_budget_converted:itinerary_data->daily_budget_converted',
+];
+
+// Older projects created the table without `updated_at`; once the server
+// reports it missing, stop sending it and version trips by `created_at`.
+let hasUpdatedAt = true;
+
+const isMissingColumn = (error: { code?: string } | null) => error?.code === '42703';
+
+/** Run a query, retrying once without `updated_at` if the table lacks it. */
+const withUpdatedAtFallback = async <R extends { error: { code?: string } | null }>(
+  run: () => PromiseLike<R>,
+): Promise<R> => {
+  const result = await run();
+  if (result.error && hasUpdatedAt && isMissingColumn(result.error)) {
+    hasUpdatedAt = false;
+    return run();
+  }
+  return result;
+};
+
+/**
+ * The error of a failed query, with the response's HTTP `status` attached so
+ * callers can tell a server rejection from a request that never got through
+ * (status 0, which supabase reports with an empty error `code`).
+ */
+const requestError = (result: { error: object | null; status?: number }) =>
+  Object.assign(result.error ?? new Error('Request failed'), { status: result.status ?? 0 });
+
+/** Version of a trip's itinerary; changes whenever the row is written. */
+export const tripVersion = (trip: Pick<SavedTripSummary, 'created_at' | 'updated_at'>) => {
+  const stamp = trip.updated_at ?? trip.created_at;
+  const parsed = Date.parse(stamp);
+  return Number.isNaN(parsed) ? stamp : String(parsed);
+};
+
+export type SavedTripsCursor = Pick<SavedTripSummary, 'id' | 'created_at'>;
+
+/**
+ * One page of the user's trips, newest first. Pass the last trip of the
+ * previous page as `after` to continue; ties on `created_at` are broken by id.
+ */
+export const fetchSavedTripsPage = async (
+  userId: string,
+  after?: SavedTripsCursor,
+  pageSize = SAVED_TRIPS_PAGE_SIZE,
+): Promise<{ trips: SavedTripSummary[]; hasMore: boolean }> => {
+  const { data, error } = await withUpdatedAtFallback(() => {
+    const columns = hasUpdatedAt ? [...SUMMARY_COLUMNS, 'updated_at'] : SUMMARY_COLUMNS;
+    let query = supabase
+      .from('itineraries')
+      .select(columns.join(', '))
+      .eq('user_id', userId)
+      .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(pageSize + 1);
+    if (after) {
+      const createdAt = `"${after.created_at}"`;
+      query = query.or(
+        `created_at.lt.${createdAt},and(created_at.eq.${createdAt},id.lt.${after.id})`,
+      );
+    }
+    return query;
+  });
+  if (error) {
+    throw error;
+  }
+
+  const rows = (data ?? []) as unknown as SavedTripSummary[];
+  return { trips: rows.slice(0, pageSize), hasMore: rows.length > pageSize };
+};
+
+/** The stored itinerary of a trip and its row version, or `null` if the row is gone. */
+export const downloadSavedItinerary = async (
+  tripId: string,
+): Promise<{ itinerary: TripItinerary; updated_at?: string } | null> => {
+  const result = await withUpdatedAtFallback(() =>
+    supabase
+      .from('itineraries')
+      .select(hasUpdatedAt ? 'itinerary_data, updated_at' : 'itinerary_data')
+      .eq('id', tripId)
+      .maybeSingle(),
+  );
+  if (result.error) {
+    throw requestError(result);
+  }
+  const row = result.data as { itinerary_data: TripItinerary | null; updated_at?: string } | null;
+  if (!row) return null;
+  if (!row.itinerary_data) {
+    throw new Error('This trip has no itinerary saved.');
+  }
+  return { itinerary: row.itinerary_data, updated_at: row.updated_at };
+};
+
+/**
+ * Write new trips. Rows carry client-generated ids, so replaying a batch
+ * after a lost response is harmless.
+ */
+export const upsertSavedTrips = async (rows: SavedItineraryRecord[]) => {
+  if (!rows.length) return;
+  const result = await withUpdatedAtFallback(() =>
+    supabase
+      .from('itineraries')
+      .upsert(
+        hasUpdatedAt ? rows : rows.map(({ updated_at: _omit, ...row }) => row),
+        { onConflict: 'id' },
+      ),
+  );
+  if (result.error) {
+    throw requestError(result);
+  }
+};
+
+/**
+ * Rename a trip with a compare-and-set on `updated_at`. When another device
+ * wrote the row first, the name is applied again on top of its version.
+ * Returns the new row version, or `null` if the trip no longer exists.
+ */
+export const renameSavedTripOnServer = async (
+  tripId: string,
+  tripName: string,
+  known?: { itinerary: TripItinerary; updated_at?: string },
+): Promise<{ itinerary: TripItinerary; updated_at?: string } | null> => {
+  let base = known;
+  for (let attempt = 0; attempt < 3; attempt++) {
+    if (!base) {
+      const current = await downloadSavedItinerary(tripId);
+      if (!current) return null;
+      base = current;
+    }
+    const expected = base.updated_at;
+    const itinerary: TripItinerary = { ...base.itinerary, trip_name: tripName };
+    const updatedAt = new Date().toISOString();
+
+    const result = await withUpdatedAtFallback(() => {
+      let query = supabase
+        .from('itineraries')
+        .update(
+          hasUpdatedAt
+            ? { trip_name: tripName, itinerary_data: itinerary, updated_at: updatedAt }
+            : { trip_name: tripName, itinerary_data: itinerary },
+        )
+        .eq('id', tripId);
+      if (hasUpdatedAt && expected) {
+        query = query.eq('updated_at', expected);
+      }
+      return query.select('id');
+    });
+    if (result.error) {
+      throw requestError(result);
+    }
+    if (Array.isArray(result.data) && result.data.length > 0) {
+      return { itinerary, updated_at: hasUpdatedAt ? updatedAt : undefined };
+    }
+    // Lost the race (or the row is gone): reload and try again.
+    base = undefined;
+  }
+  throw new Error('This trip kept changing on the server while renaming it.');
+};
+
+export const deleteSavedTripsOnServer = async (tripIds: string[]) => {
+  if (!tripIds.length) return;
+  const result = await supabase.from('itineraries').delete().in('id', tripIds);
+  if (result.error) {
+    throw requestError(result);
+  }
+};
@@ -0,0 +1,120 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { AppState } from 'react-native';
+
+/**
+ * Small persisted preferences, read in one multiGet before the app renders and
+ * then served synchronously, so providers start with the saved values instead
+ * of defaults (no theme or currency flash). Writes update memory at once and
+ * reach storage in one debounced multiSet.
+ *
+ * The larger `plangenie.cache.*` snapshots and saved trips are not included;
+ * they load lazily on first use.
+ */
+
+export const SETTING_KEYS = {
+  currency: 'plangenie.currency',
+  mealTimes: 'plangenie.meal-times',
+  themeMode: 'plangenie.theme-mode',
+  lastDestination: 'plangenie.last-destination',
+} as const;
+
+export type SettingName = keyof typeof SETTING_KEYS;
+
+const PERSIST_DELAY_MS = 300;
+
+const values = new Map<SettingName, string>();
+const pending = new Set<SettingName>();
+let hydrated: Promise<void> | null = null;
+let ready = false;
+let persistTimer: ReturnType<typeof setTimeout> | null = null;
+
+const names = Object.keys(SETTING_KEYS) as SettingName[];
+
+/** Load every setting at once. Safe to call repeatedly; resolves even if storage fails. */
+export const hydrateSettings = () => {
+  if (!hydrated) {
+    hydrated = (async () => {
+      try {
+        const entries = await AsyncStorage.multiGet(names.map((name) => SETTING_KEYS[name]));
+        entries.forEach(([, value], i) => {
+          // Values set while loading are newer than what was stored.
+          if (value != null && !values.has(names[i])) values.set(names[i], value);
+        });
+      } catch (error) {
+        console.warn('Failed to load settings', error);
+      } finally {
+        ready = true;
+      }
+    })();
+  }
+  return hydrated;
+};
+
+export const areSettingsHydrated = () => ready;
+
+/** The stored value, or null when unset or before `hydrateSettings` has finished. */
+export const getSetting = (name: SettingName): string | null => values.get(name) ?? null;
+
+export const getJsonSetting = <T>(name: SettingName): T | null => {
+  const raw = getSetting(name);
+  if (!raw) return null;
+  try {
+    return JSON.parse(raw) as T;
+  } catch (error) {
+    console.warn(`Ignoring unreadable setting ${name}`, error);
+    return null;
+  }
+};
+
+export const flushSettings = async () => {
+  if (persistTimer) {
+    clearTimeout(persistTimer);
+    persistTimer = null;
+  }
+  if (!pending.size) return;
+  const changed = Array.from(pending);
+  pending.clear();
+  const writes = changed.filter((name) => values.has(name));
+  const removals = changed.filter((name) => !values.has(name));
+  try {
+    await Promise.all([
+      writes.length
+        ? AsyncStorage.multiSet(writes.map((name) => [SETTING_KEYS[name], values.get(name)!]))
+        : undefined,
+      removals.length
+        ? AsyncStorage.multiRemove(removals.map((name) => SETTING_KEYS[name]))
+        : undefined,
+    ]);
+  } catch (error) {
+    console.warn('Failed to save settings', error);
+  }
+};
+
+const schedulePersist = () => {
+  if (persistTimer) return;
+  persistTimer = setTimeout(() => {
+    persistTimer = null;
+    void flushSettings();
+  }, PERSIST_DELAY_MS);
+};
+
+/** Update a setting; `null` removes it. */
+export const setSetting = (name: SettingName, value: string | null) => {
+  if (value == null) {
+    if (!values.has(name)) return;
+    values.delete(name);
+  } else {
+    if (values.get(name) === value) return;
+    values.set(name, value);
+  }
+  pending.add(name);
+  schedulePersist();
+};
+
+export const setJsonSetting = (name: SettingName, value: unknown) =>
+  setSetting(name, JSON.stringify(value));
+
+// The debounce may not get to run once the app is backgrounded.
+AppState.addEventListener('change', (state) => {
+  if (state !== 'active') void flushSettings();
+});
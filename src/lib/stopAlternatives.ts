@@ -0,0 +1,117 @@
+import { ItineraryStop } from '../types/plans';
+import { StopReplacementRequest, requestStopReplacements } from './api';
+import { createLimiter } from './concurrency';
+import { normalisePlaceName } from './placeIndex';
+
+// Two spare options per stop covers the usual "no, another one" double tap.
+const ALTERNATIVES_PER_STOP = 2;
+// Roughly a week of six-stop days; older entries are dropped first.
+const MAX_CACHED_STOPS = 48;
+
+type Prefetch = { job: Promise<void>; started: boolean };
+
+const alternatives = new Map<string, ItineraryStop[]>();
+const pending = new Map<string, Prefetch>();
+// Prefetches run one at a time so they never crowd out user-initiated requests.
+const background = createLimiter(1);
+// Bumped by `clearStopAlternatives`, so prefetches from an older plan that
+// finish afterwards are not cached.
+let generation = 0;
+
+const stopKey = (stop: ItineraryStop) =>
+  `${stop.date}|${stop.category}|${normalisePlaceName(stop.title ?? '')}`;
+
+const remember = (key: string, options: ItineraryStop[]) => {
+  alternatives.delete(key);
+  if (!options.length) return;
+  alternatives.set(key, options);
+  while (alternatives.size > MAX_CACHED_STOPS) {
+    const oldest = alternatives.keys().next().value;
+    if (oldest === undefined) break;
+    alternatives.delete(oldest);
+  }
+};
+
+const isReplaceable = (stop: ItineraryStop) => stop.category !== 'transport';
+
+/**
+ * Take a cached alternative for `stop`, skipping anything already on the day.
+ * The remaining options move over to the chosen stop, so replacing it again is
+ * also served from the cache.
+ */
+export const takeStopAlternative = (
+  stop: ItineraryStop,
+  dayStops: ItineraryStop[],
+): ItineraryStop | undefined => {
+  const key = stopKey(stop);
+  const queue = alternatives.get(key);
+  if (!queue) return undefined;
+  alternatives.delete(key);
+
+  const onDay = new Set(dayStops.map((item) => normalisePlaceName(item.title ?? '')));
+  const index = queue.findIndex((option) => !onDay.has(normalisePlaceName(option.title)));
+  if (index < 0) return undefined;
+
+  const chosen = { ...queue[index], dayIndex: stop.dayIndex, date: stop.date };
+  remember(stopKey(chosen), queue.slice(index + 1));
+  return chosen;
+};
+
+/**
+ * Resolves once a prefetch already running for `stop` has finished. One still
+ * queued behind other prefetches is not waited for; fetching directly is
+ * quicker than sitting out the queue.
+ */
+export const waitForStopAlternative = (stop: ItineraryStop) => {
+  const prefetch = pending.get(stopKey(stop));
+  return prefetch?.started ? prefetch.job : Promise.resolve();
+};
+
+/**
+ * Fetch alternatives for every replaceable stop of a day in one background
+ * request. Stops that already have alternatives, or a prefetch in flight, are
+ * skipped, so calling this on every day change is cheap.
+ */
+export const prefetchStopAlternatives = (request: StopReplacementRequest) => {
+  const indices = request.existingStops
+    .map((stop, index) => ({ stop, index }))
+    .filter(
+      ({ stop }) =>
+        isReplaceable(stop) && !alternatives.has(stopKey(stop)) && !pending.has(stopKey(stop)),
+    )
+    .map(({ index }) => index);
+  if (!indices.length) return Promise.resolve();
+
+  const keys = indices.map((index) => stopKey(request.existingStops[index]));
+  const startedIn = generation;
+  const prefetch: Prefetch = { job: Promise.resolve(), started: false };
+  prefetch.job = background(async () => {
+    if (startedIn !== generation) return;
+    prefetch.started = true;
+    const result = await requestStopReplacements({
+      ...request,
+      replaceIndices: indices,
+      optionsPerStop: ALTERNATIVES_PER_STOP,
+    });
+    if (startedIn !== generation) return;
+    indices.forEach((index, position) => remember(keys[position], result[index] ?? []));
+  })
+    .catch((error) => {
+      console.warn('Failed to prefetch stop alternatives', error);
+    })
+    .finally(() => {
+      keys.forEach((key) => {
+        if (pending.get(key) === prefetch) pending.delete(key);
+      });
+    });
+
+  keys.forEach((key) => pending.set(key, prefetch));
+  return prefetch.job;
+};
+
+/** Forget every cached alternative, and drop prefetches that have not reported back. */
+export const clearStopAlternatives = () => {
+  generation += 1;
+  alternatives.clear();
+  pending.clear();
+};
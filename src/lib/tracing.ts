@@ -0,0 +1,255 @@
+import type { CallBudget } from './http';
+
+/**
+ * Lightweight tracing for the planning pipeline.
+ *
+ * A trace is a tree of spans: plan → stage → city stay → day → slot, with a
+ * span for every external call (Places, Geocoding, Distance Matrix,
+ * Open-Meteo, OpenAI) under whichever step made it. Spans are handed down
+ * explicitly, the same way abort signals are. When tracing is off,
+ * `startTrace` returns `undefined` and every `span?.…` along the way is a
+ * no-op.
+ */
+
+export type SpanAttributes = Record<string, string | number | boolean | undefined>;
+
+export type Span = {
+  readonly name: string;
+  /** Requests made under this span are charged to this budget; see `withCallBudget`. */
+  readonly budget?: CallBudget;
+  /** Start a span nested under this one. */
+  child: (name: string, attrs?: SpanAttributes) => Span;
+  /** Add or overwrite attributes. */
+  set: (attrs: SpanAttributes) => void;
+  /** Add to a counter on this span, e.g. `retries`. */
+  count: (counter: string, by?: number) => void;
+  /**
+   * Close the span, recording `error` if given. Later calls are ignored. Steps
+   * that recover from a failure can mark it with a `failed` attribute instead.
+   */
+  end: (error?: unknown) => void;
+};
+
+export type TraceJson = {
+  name: string;
+  /** Offset from the start of the trace. */
+  startMs: number;
+  /** `null` for spans that were never closed (e.g. abandoned on abort). */
+  durationMs: number | null;
+  attrs: SpanAttributes;
+  counts: Record<string, number>;
+  error?: string;
+  children: TraceJson[];
+};
+
+/** External calls of one service within a trace. */
+export type CallSummary = {
+  calls: number;
+  /** Calls that went to the network rather than a cache or a shared request. */
+  network: number;
+  cacheHits: number;
+  coalesced: number;
+  retries: number;
+  failures: number;
+  responseBytes: number;
+  totalMs: number;
+};
+
+export type Trace = Span & {
+  toJSON: () => TraceJson;
+  /** External calls made during the trace, by service. */
+  summary: () => Record<string, CallSummary>;
+};
+
+type SpanRecord = {
+  name: string;
+  start: number;
+  end?: number;
+  attrs: SpanAttributes;
+  counts: Record<string, number>;
+  error?: string;
+  children: SpanRecord[];
+};
+
+const RECENT_TRACES = 5;
+
+let enabled = typeof __DEV__ !== 'undefined' && __DEV__;
+const recent: Trace[] = [];
+
+const now = () =>
+  typeof performance !== 'undefined' && typeof performance.now === 'function'
+    ? performance.now()
+    : Date.now();
+
+export const isTracingEnabled = () => enabled;
+
+export const setTracingEnabled = (value: boolean) => {
+  enabled = value;
+};
+
+const createRecord = (name: string, attrs?: SpanAttributes): SpanRecord => ({
+  name,
+  start: now(),
+  attrs: { ...attrs },
+  counts: {},
+  children: [],
+});
+
+const wrap = (record: SpanRecord): Span => ({
+  name: record.name,
+  child: (name, attrs) => {
+    const child = createRecord(name, attrs);
+    record.children.push(child);
+    return wrap(child);
+  },
+  set: (attrs) => {
+    Object.assign(record.attrs, attrs);
+  },
+  count: (counter, by = 1) => {
+    record.counts[counter] = (record.counts[counter] ?? 0) + by;
+  },
+  end: (error) => {
+    if (record.end != null) return;
+    record.end = now();
+    if (error !== undefined) {
+      record.error = error instanceof Error ? error.message : String(error);
+    }
+  },
+});
+
+const toJson = (record: SpanRecord, origin: number): TraceJson => ({
+  name: record.name,
+  startMs: Math.round(record.start - origin),
+  durationMs: record.end != null ? Math.round(record.end - record.start) : null,
+  attrs: record.attrs,
+  counts: record.counts,
+  error: record.error,
+  children: record.children.map((child) => toJson(child, origin)),
+});
+
+const summarise = (root: SpanRecord) => {
+  const byService: Record<string, CallSummary> = {};
+  const visit = (record: SpanRecord) => {
+    const service = record.attrs.service;
+    if (typeof service === 'string') {
+      let entry = byService[service];
+      if (!entry) {
+        entry = {
+          calls: 0,
+          network: 0,
+          cacheHits: 0,
+          coalesced: 0,
+          retries: 0,
+          failures: 0,
+          responseBytes: 0,
+          totalMs: 0,
+        };
+        byService[service] = entry;
+      }
+      entry.calls += 1;
+      if (record.attrs.cache === 'hit' || record.attrs.cache === 'stale') entry.cacheHits += 1;
+      else if (record.attrs.cache === 'coalesced') entry.coalesced += 1;
+      else entry.network += 1;
+      entry.retries += record.counts.retries ?? 0;
+      if (record.error || record.attrs.failed) entry.failures += 1;
+      entry.responseBytes += Number(record.attrs.responseBytes ?? 0);
+      if (record.end != null) entry.totalMs += Math.round(record.end - record.start);
+    }
+    record.children.forEach(visit);
+  };
+  visit(root);
+  return byService;
+};
+
+/**
+ * Start a new trace, or return `undefined` when tracing is off. The last few
+ * traces are kept for `getRecentTraces`.
+ */
+export const startTrace = (name: string, attrs?: SpanAttributes): Trace | undefined => {
+  if (!enabled) return undefined;
+  const root = createRecord(name, attrs);
+  const trace: Trace = {
+    ...wrap(root),
+    toJSON: () => toJson(root, root.start),
+    summary: () => summarise(root),
+  };
+  recent.push(trace);
+  if (recent.length > RECENT_TRACES) recent.shift();
+  return trace;
+};
+
+/** The most recent traces as JSON, oldest first. */
+export const getRecentTraces = () => recent.map((trace) => trace.toJSON());
+
+/**
+ * Run `task` in a child span of `parent`, closing it with the outcome. With
+ * no parent the task runs untraced.
+ */
+export const withSpan = async <T>(
+  parent: Span | undefined,
+  name: string,
+  attrs: SpanAttributes | undefined,
+  task: (span: Span | undefined) => Promise<T>,
+): Promise<T> => {
+  if (!parent) return task(undefined);
+  const span = parent.child(name, attrs);
+  try {
+    const result = await task(span);
+    span.end();
+    return result;
+  } catch (error) {
+    span.end(error);
+    throw error;
+  }
+};
+
+/**
+ * Run one call to an external service in its own span. The `service`
+ * attribute is what `summary` groups by; the task adds `cache`, `status` and
+ * `responseBytes` as it learns them.
+ */
+export const traceCall = <T>(
+  parent: Span | undefined,
+  service: string,
+  attrs: SpanAttributes | undefined,
+  task: (span: Span | undefined) => Promise<T>,
+) => withSpan(parent, service, { ...attrs, service }, task);
+
+/** `withSpan` for synchronous steps, such as filling one slot of a day. */
+export const withSpanSync = <T>(
+  parent: Span | undefined,
+  name: string,
+  attrs: SpanAttributes | undefined,
+  task: (span: Span | undefined) => T,
+): T => {
+  if (!parent) return task(undefined);
+  const span = parent.child(name, attrs);
+  try {
+    const result = task(span);
+    span.end();
+    return result;
+  } catch (error) {
+    span.end(error);
+    throw error;
+  }
+};
+
+/** Read a JSON body, recording its size on `span` when tracing. */
+export const readJson = async <T>(response: Response, span?: Span): Promise<T> => {
+  if (!span) return (await response.json()) as T;
+  const text = await response.text();
+  span.set({ status: response.status, responseBytes: text.length });
+  return JSON.parse(text) as T;
+};
+
+/** One line per service, for logging at the end of a plan in development. */
+export const formatCallSummary = (summary: Record<string, CallSummary>) =>
+  Object.entries(summary)
+    .sort(([, a], [, b]) => b.totalMs - a.totalMs)
+    .map(
+      ([service, s]) =>
+        `${service}: ${s.calls} calls (${s.network} network, ${s.cacheHits} cached, ` +
+        `${s.coalesced} shared), ${s.retries} retries, ${s.failures} failed, ` +
+        `${Math.round(s.responseBytes / 1024)} KB, ${s.totalMs} ms`,
+    )
+    .join('\n');
@@ -2,21 +2,18 @@
   createContext,
   useCallback,
   useContext,
-  useEffect,
   useMemo,
   useState,
   ReactNode,
 } from 'react';
-import AsyncStorage from '@react-native-async-storage/async-storage';
 
-const STORAGE_KEY = 'plangenie.currency';
+import { getSetting, setSetting } from '@/lib/settings';
 
 export type SupportedCurrency = 'USD' | 'EUR' | 'MXN' | 'GBP' | 'CAD' | 'JPY';
 
 type CurrencyContextValue = {
   currency: SupportedCurrency;
   setCurrency: (currency: SupportedCurrency) => Promise<void>;
-  converting: boolean;
   convertFromUsd: (amount: number) => number;
   formatAmount: (amountUsd: number, opts?: { minimumFractionDigits?: number }) => string;
   getRate: (currency?: SupportedCurrency) => number;
@@ -39,34 +36,18 @@ export const currencyOptions = Object.entries(rates).map(([value, meta]) => ({
   label: `${meta.label} (${value})`,
 }));
 
-export const CurrencyProvider = ({ children }: { children: ReactNode }) => {
-  const [currency, setCurrencyState] = useState<SupportedCurrency>('USD');
-  const [converting, setConverting] = useState(true);
-
-  useEffect(() => {
-    const load = async () => {
-      try {
-        const stored = await AsyncStorage.getItem(STORAGE_KEY);
-        if (stored && rates[stored as SupportedCurrency]) {
-          setCurrencyState(stored as SupportedCurrency);
-        }
-      } catch (error) {
-        console.warn('Failed to load currency preference', error);
-      } finally {
-        setConverting(false);
-      }
-    };
+const readStoredCurrency = (): SupportedCurrency => {
+  const stored = getSetting('currency');
+  return stored && rates[stored as SupportedCurrency] ? (stored as SupportedCurrency) : 'USD';
+};
 
-    void load();
-  }, []);
+export const CurrencyProvider = ({ children }: { children: ReactNode }) => {
+  // Settings are hydrated before the providers mount, so this is the saved value.
+  const [currency, setCurrencyState] = useState<SupportedCurrency>(readStoredCurrency);
 
   const persistCurrency = useCallback(async (next: SupportedCurrency) => {
     setCurrencyState(next);
-    try {
-      await AsyncStorage.setItem(STORAGE_KEY, next);
-    } catch (error) {
-      console.warn('Failed to persist currency selection', error);
-    }
+    setSetting('currency', next);
   }, []);
 
   const convertFromUsd = useCallback(
@@ -100,12 +81,11 @@ export const CurrencyProvider = ({ children }: { children: ReactNode }) => {
     () => ({
       currency,
       setCurrency: persistCurrency,
-      converting,
       convertFromUsd,
       formatAmount,
       getRate,
     }),
-    [currency, persistCurrency, converting, convertFromUsd, formatAmount, getRate],
+    [currency, persistCurrency, convertFromUsd, formatAmount, getRate],
   );
 
   return <CurrencyContext.Provider value={value}>{children}</CurrencyContext.Provider>;
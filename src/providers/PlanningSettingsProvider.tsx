@@ -2,12 +2,12 @@
   createContext,
   useCallback,
   useContext,
-  useEffect,
   useMemo,
   useState,
   ReactNode,
 } from 'react';
-import AsyncStorage from '@react-native-async-storage/async-storage';
+
+import { getJsonSetting, setJsonSetting } from '@/lib/settings';
 
 export type MealTimeKey = 'breakfast' | 'lunch' | 'dinner';
 
@@ -19,8 +19,6 @@ type PlanningSettingsContextValue = {
   resetMealTimes: () => Promise<void>;
 };
 
-const STORAGE_KEY = 'plangenie.meal-times';
-
 const defaultMealTimes: MealTimes = {
   breakfast: '08:00',
   lunch: '15:00',
@@ -43,35 +41,22 @@ export const normaliseMealTime = (value: string): string => {
   return `${safeHour}:${safeMinute}`;
 };
 
+const readStoredMealTimes = (): MealTimes => {
+  const parsed = getJsonSetting<Partial<MealTimes>>('mealTimes');
+  if (!parsed) return defaultMealTimes;
+  return {
+    breakfast: normaliseMealTime(parsed.breakfast ?? defaultMealTimes.breakfast),
+    lunch: normaliseMealTime(parsed.lunch ?? defaultMealTimes.lunch),
+    dinner: normaliseMealTime(parsed.dinner ?? defaultMealTimes.dinner),
+  };
+};
+
 export const PlanningSettingsProvider = ({ children }: { children: ReactNode }) => {
-  const [mealTimes, setMealTimes] = useState<MealTimes>(defaultMealTimes);
-
-  useEffect(() => {
-    const load = async () => {
-      try {
-        const raw = await AsyncStorage.getItem(STORAGE_KEY);
-        if (!raw) return;
-        const parsed = JSON.parse(raw) as Partial<MealTimes> | null;
-        if (!parsed) return;
-        setMealTimes((prev) => ({
-          breakfast: normaliseMealTime(parsed.breakfast ?? prev.breakfast),
-          lunch: normaliseMealTime(parsed.lunch ?? prev.lunch),
-          dinner: normaliseMealTime(parsed.dinner ?? prev.dinner),
-        }));
-      } catch (error) {
-        console.warn('Failed to load meal times', error);
-      }
-    };
-
-    void load();
-  }, []);
+  // Settings are hydrated before the providers mount, so this is the saved value.
+  const [mealTimes, setMealTimes] = useState<MealTimes>(readStoredMealTimes);
 
   const persist = useCallback(async (next: MealTimes) => {
-    try {
-      await AsyncStorage.setItem(STORAGE_KEY, JSON.stringify(next));
-    } catch (error) {
-      console.warn('Failed to save meal times', error);
-    }
+    setJsonSetting('mealTimes', next);
   }, []);
 
   const updateMealTime = useCallback(
@@ -7,7 +7,6 @@
   useState,
   ReactNode,
 } from 'react';
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import {
   MD3DarkTheme,
   MD3LightTheme,
@@ -20,13 +19,12 @@ import {
   Theme as NavigationTheme,
 } from '@react-navigation/native';
 
-const THEME_STORAGE_KEY = 'plangenie.theme-mode';
+import { getSetting, setSetting } from '@/lib/settings';
 
 type ThemeMode = 'light' | 'dark';
 
 type ThemeContextValue = {
   mode: ThemeMode;
-  isReady: boolean;
   paperTheme: MD3Theme;
   navigationTheme: NavigationTheme;
   toggleTheme: () => void;
@@ -70,33 +68,18 @@ const { LightTheme: PaperNavigationLightTheme, DarkTheme: PaperNavigationDarkThe
     reactNavigationDark: NavigationDarkTheme,
   });
 
-export const ThemeProvider = ({ children }: { children: ReactNode }) => {
-  const [mode, setMode] = useState<ThemeMode>('light');
-  const [isReady, setIsReady] = useState(false);
-
-  useEffect(() => {
-    const loadThemePreference = async () => {
-      try {
-        const stored = await AsyncStorage.getItem(THEME_STORAGE_KEY);
-        if (stored === 'light' || stored === 'dark') {
-          setMode(stored);
-        }
-      } catch (error) {
-        console.warn('Failed to read saved theme mode', error);
-      } finally {
-        setIsReady(true);
-      }
-    };
+const readStoredMode = (): ThemeMode => {
+  const stored = getSetting('themeMode');
+  return stored === 'dark' ? 'dark' : 'light';
+};
 
-    void loadThemePreference();
-  }, []);
+export const ThemeProvider = ({ children }: { children: ReactNode }) => {
+  // Settings are hydrated before the providers mount, so this is the saved value.
+  const [mode, setMode] = useState<ThemeMode>(readStoredMode);
 
   useEffect(() => {
-    if (!isReady) return;
-    AsyncStorage.setItem(THEME_STORAGE_KEY, mode).catch((error) => {
-      console.warn('Failed to persist theme mode', error);
-    });
-  }, [isReady, mode]);
+    setSetting('themeMode', mode);
+  }, [mode]);
 
   const paperTheme = useMemo(() => {
     const base = mode === 'light' ? createLightTheme() : createDarkTheme();
@@ -148,13 +131,12 @@ export const ThemeProvider = ({ children }: { children: ReactNode }) => {
   const value = useMemo(
     () => ({
       mode,
-      isReady,
       paperTheme,
       navigationTheme,
       toggleTheme,
       setMode,
     }),
-    [mode, isReady, paperTheme, navigationTheme, toggleTheme],
+    [mode, paperTheme, navigationTheme, toggleTheme],
   );
 
   return <ThemeContext.Provider value={value}>{children}</ThemeContext.Provider>;
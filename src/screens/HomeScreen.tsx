@@ -14,7 +14,6 @@ import {
 } from "@react-navigation/native";
 import { NativeStackNavigationProp } from "@react-navigation/native-stack";
 import { BottomTabNavigationProp } from "@react-navigation/bottom-tabs";
-import AsyncStorage from "@react-native-async-storage/async-storage";
 import * as Location from "expo-location";
 
 import { HomeStackParamList } from "../navigation/HomeStack.types";
@@ -22,8 +21,8 @@ import { TabParamList } from "../navigation/MainTabs";
 import { TripItinerary } from "../types/plans";
 import { supabase } from "../lib/supabase";
 import { GOOGLE_API_KEY } from "../lib/env";
+import { setSetting } from "../lib/settings";
 
-const LAST_DESTINATION_KEY = "plangenie.last-destination";
 const LOCATION_ERROR_MESSAGE = "Couldn't get your location. Try again later.";
 
 type HomeScreenNavigationProp = CompositeNavigationProp<
@@ -142,7 +141,7 @@ const HomeScreen = () => {
         }
 
         setCity(detectedCity);
-        await AsyncStorage.setItem(LAST_DESTINATION_KEY, detectedCity);
+        setSetting("lastDestination", detectedCity);
 
         const { data, error } = await supabase
           .from("itineraries")
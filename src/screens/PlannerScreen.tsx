@@ -24,7 +24,7 @@ import {
 } from 'react-native-paper';
 import { addDays, differenceInCalendarDays, format } from 'date-fns';
 
-import { PreferenceOption } from '../types/plans';
+import { PlanningProgress, PlanningStage, PreferenceOption } from '../types/plans';
 import usePlanner from '../hooks/usePlanner';
 import PlanPreview from '../components/PlanPreview';
 import { TabParamList } from '../navigation/MainTabs';
@@ -53,6 +53,47 @@ const serialiseParams = (params: PlannerRoute['params']) => {
   }
 };
 
+// Share of the progress bar each planning stage accounts for.
+const STAGE_WEIGHTS: Record<PlanningStage, number> = {
+  geocode: 0.1,
+  places: 0.15,
+  weather: 0.05,
+  locate: 0.05,
+  generate: 0.65,
+};
+
+const STAGE_LABELS: Record<PlanningStage, string> = {
+  geocode: 'Finding your destination...',
+  places: 'Collecting places to visit...',
+  weather: 'Checking the forecast...',
+  locate: 'Mapping the area...',
+  generate: 'Generating your personalized plan...',
+};
+
+const describeProgress = ({ stages, daysReady, dayCount }: PlanningProgress) => {
+  let fraction = 0;
+  let label: string | undefined;
+  (Object.keys(STAGE_WEIGHTS) as PlanningStage[]).forEach((stage) => {
+    const status = stages[stage];
+    if (status === 'done' || status === 'failed') {
+      fraction += STAGE_WEIGHTS[stage];
+    } else if (status === 'running') {
+      // Stages run side by side; name the earliest one still going.
+      label = label ?? STAGE_LABELS[stage];
+      if (stage === 'generate' && dayCount > 0) {
+        fraction += (STAGE_WEIGHTS.generate * daysReady) / dayCount;
+        if (dayCount > 1 && daysReady < dayCount) {
+          label = `Planning day ${daysReady + 1} of ${dayCount}...`;
+        }
+      }
+    }
+  });
+  return {
+    fraction: Math.min(1, Math.max(0.05, fraction)),
+    label: label ?? STAGE_LABELS.geocode,
+  };
+};
+
 const PlannerScreen = () => {
   const theme = useTheme();
   const { width } = useWindowDimensions();
@@ -62,8 +103,6 @@ const PlannerScreen = () => {
   const [showEndPicker, setShowEndPicker] = useState(false);
   const [showTripNameDialog, setShowTripNameDialog] = useState(false);
   const [tripNameInput, setTripNameInput] = useState('');
-  const [progress, setProgress] = useState(0);
-  const [progressVisible, setProgressVisible] = useState(false);
   const [paramsHydratedKey, setParamsHydratedKey] = useState<string | null>(null);
 
   const {
@@ -71,8 +110,10 @@ const PlannerScreen = () => {
     updateField,
     togglePreference,
     submit,
+    cancel,
     canSubmit,
     loading,
+    progress: planningProgress,
     error,
     itinerary,
     saveItinerary,
@@ -81,6 +122,7 @@ const PlannerScreen = () => {
     removeStop,
     replaceStop,
     mutatingStop,
+    setActiveDayIndex,
   } = usePlanner();
 
   const formattedStart = useMemo(() => format(form.startDate, 'PPP'), [form.startDate]);
@@ -181,33 +223,6 @@ const PlannerScreen = () => {
 
 
 
-  useEffect(() => {
-    let interval: NodeJS.Timeout | undefined;
-    let timeout: NodeJS.Timeout | undefined;
-
-    if (loading) {
-      setProgressVisible(true);
-      setProgress(0.1);
-      interval = setInterval(() => {
-        setProgress((prev) => {
-          if (prev >= 0.9) return prev;
-          return Number((prev + 0.07).toFixed(2));
-        });
-      }, 400);
-    } else if (progressVisible) {
-      setProgress(1);
-      timeout = setTimeout(() => {
-        setProgressVisible(false);
-        setProgress(0);
-      }, 300);
-    }
-
-    return () => {
-      if (interval) clearInterval(interval);
-      if (timeout) clearTimeout(timeout);
-    };
-  }, [loading, progressVisible]);
-
   const onDateChange = (
     key: 'startDate' | 'endDate',
     setVisible: (value: boolean) => void,
@@ -244,13 +259,19 @@ const PlannerScreen = () => {
   };
 
   const renderProgress = () => {
-    if (!progressVisible) return null;
+    if (!planningProgress) return null;
+    const { fraction, label } = describeProgress(planningProgress);
     return (
       <View style={styles.progressContainer}>
-        <ProgressBar progress={progress} style={styles.progressBar} />
-        <Text variant="bodySmall" style={styles.progressLabel}>
-          Generating your personalized plan...
-        </Text>
+        <ProgressBar progress={fraction} style={styles.progressBar} />
+        <View style={styles.progressRow}>
+          <Text variant="bodySmall" style={styles.progressLabel}>
+            {label}
+          </Text>
+          <Button compact onPress={cancel}>
+            Cancel
+          </Button>
+        </View>
       </View>
     );
   };
@@ -385,7 +406,7 @@ const PlannerScreen = () => {
           icon="calendar-month"
           onPress={submit}
           loading={loading}
-          disabled={!canSubmit || loading || invalidRange}
+          disabled={!canSubmit || invalidRange}
           style={styles.submitButton}
         >
           Generate itinerary
@@ -397,12 +418,13 @@ const PlannerScreen = () => {
         <View style={[styles.resultsContainer, { width: width - 32 }]}>
           <PlanPreview
             itinerary={itinerary}
-            onSave={handleSavePress}
+            onSave={loading ? undefined : handleSavePress}
             saving={saving}
             loading={loading}
-            onRemoveStop={removeStop}
-            onReplaceStop={replaceStop}
+            onRemoveStop={loading ? undefined : removeStop}
+            onReplaceStop={loading ? undefined : replaceStop}
             mutatingStop={mutatingStop}
+            onActiveDayChange={setActiveDayIndex}
           />
         </View>
       )}
@@ -560,7 +582,13 @@ const styles = StyleSheet.create({
     borderRadius: 8,
     height: 8,
   },
+  progressRow: {
+    flexDirection: 'row',
+    alignItems: 'center',
+    justifyContent: 'space-between',
+  },
   progressLabel: {
+    flex: 1,
     color: '#475569',
   },
 });
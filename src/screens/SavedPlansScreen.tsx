@@ -1,5 +1,5 @@
-﻿import React, { useCallback, useMemo, useState } from 'react';
-import { RefreshControl, ScrollView, StyleSheet, View } from 'react-native';
+﻿import React, { useCallback, useEffect, useRef, useState } from 'react';
+import { FlatList, RefreshControl, StyleSheet, View } from 'react-native';
 import { differenceInCalendarDays, format } from 'date-fns';
 import {
   ActivityIndicator,
@@ -15,9 +15,18 @@ import {
 } from 'react-native-paper';
 import { useFocusEffect } from '@react-navigation/native';
 
-import { supabase } from '../lib/supabase';
+import {
+  deleteTrip,
+  loadStoredTrips,
+  mergeServerTrips,
+  openTrip as openStoredTrip,
+  renameTrip,
+  subscribeStoredTrips,
+  syncStoredTrips,
+} from '../lib/itineraryStore';
+import { SavedTripsCursor, fetchSavedTripsPage } from '../lib/savedTrips';
 import { useAuth } from '../providers/AuthProvider';
-import { SavedItineraryRecord, TripItinerary } from '../types/plans';
+import { SavedTripSummary, TripItinerary } from '../types/plans';
 import PlanPreview from '../components/PlanPreview';
 
 const currencySymbols: Record<string, string> = {
@@ -29,40 +38,92 @@ const currencySymbols: Record<string, string> = {
   JPY: '\u00a5',
 };
 
+// Keyset order of the server pages: newest first, ties broken by id.
+const isNewerThan = (a: SavedTripsCursor, b: SavedTripsCursor) =>
+  a.created_at !== b.created_at ? a.created_at > b.created_at : a.id > b.id;
+
 const SavedPlansScreen = () => {
   const theme = useTheme();
   const { user } = useAuth();
 
-  const [trips, setTrips] = useState<SavedItineraryRecord[]>([]);
+  const [trips, setTrips] = useState<SavedTripSummary[]>([]);
+  const [hasMore, setHasMore] = useState(false);
+  // Last row of the last server page fetched; the next page starts after it.
+  const [cursor, setCursor] = useState<SavedTripsCursor | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [refreshing, setRefreshing] = useState(false);
   const [error, setError] = useState<string | null>(null);
-  const [deletingId, setDeletingId] = useState<string | null>(null);
   const [confirmingDelete, setConfirmingDelete] = useState<string | null>(null);
-  const [renamingTrip, setRenamingTrip] = useState<SavedItineraryRecord | null>(null);
+  const [renamingTrip, setRenamingTrip] = useState<SavedTripSummary | null>(null);
   const [renameValue, setRenameValue] = useState('');
-  const [renaming, setRenaming] = useState(false);
   const [selectedTrip, setSelectedTrip] = useState<TripItinerary | null>(null);
   const [selectedTripId, setSelectedTripId] = useState<string | null>(null);
+  const [openingId, setOpeningId] = useState<string | null>(null);
+  const listRef = useRef<FlatList<SavedTripSummary>>(null);
+
+  // The library shows what is stored on this device straight away and follows
+  // every local change and sync result from then on.
+  useEffect(() => {
+    if (!user) return undefined;
+    let active = true;
+    const reload = () => {
+      void loadStoredTrips(user.id).then((stored) => {
+        if (!active) return;
+        setTrips(stored);
+        if (stored.length) setLoading(false);
+      });
+    };
+    reload();
+    const unsubscribe = subscribeStoredTrips(user.id, reload);
+    return () => {
+      active = false;
+      unsubscribe();
+    };
+  }, [user]);
 
+  // Only summary columns are fetched here, so refreshing on every focus is cheap.
   const fetchTrips = useCallback(async () => {
     if (!user) return;
     setError(null);
-    setLoading(true);
-    const { data, error: dbError } = await supabase
-      .from('itineraries')
-      .select('*')
-      .eq('user_id', user.id)
-      .order('created_at', { ascending: false });
-
-    if (dbError) {
-      setError(dbError.message);
-    } else {
-      setTrips((data ?? []) as SavedItineraryRecord[]);
+    try {
+      await syncStoredTrips(user.id);
+      const page = await fetchSavedTripsPage(user.id);
+      await mergeServerTrips(user.id, page);
+      setCursor(page.trips[page.trips.length - 1] ?? null);
+      setHasMore(page.hasMore);
+    } catch (caught) {
+      setError(caught instanceof Error ? caught.message : 'We could not load your trips.');
     }
     setLoading(false);
   }, [user]);
 
+  // Continue from the last server page, not the last trip on the device: after a
+  // refocus only page one is fresh, and the trips stored below it must be
+  // fetched again to pick up renames and deletes made elsewhere. Pages are read
+  // until they reach past the oldest trip on screen.
+  const loadMore = useCallback(async () => {
+    if (!user || !hasMore || !cursor || loadingMore || loading) return;
+    const oldestShown = trips[trips.length - 1];
+    setLoadingMore(true);
+    try {
+      let after = cursor;
+      let more = true;
+      while (more) {
+        const page = await fetchSavedTripsPage(user.id, after);
+        await mergeServerTrips(user.id, page, after);
+        const last = page.trips[page.trips.length - 1];
+        if (last) after = last;
+        setCursor(after);
+        setHasMore(page.hasMore);
+        more = page.hasMore && !!last && !!oldestShown && isNewerThan(last, oldestShown);
+      }
+    } catch (caught) {
+      setError(caught instanceof Error ? caught.message : 'We could not load more trips.');
+    }
+    setLoadingMore(false);
+  }, [cursor, hasMore, loading, loadingMore, trips, user]);
+
   useFocusEffect(
     useCallback(() => {
       void fetchTrips();
@@ -75,82 +136,130 @@ const SavedPlansScreen = () => {
     setRefreshing(false);
   }, [fetchTrips]);
 
+  const openTrip = useCallback(
+    async (trip: SavedTripSummary) => {
+      if (!user) return;
+      setOpeningId(trip.id);
+      setError(null);
+      try {
+        const itinerary = await openStoredTrip(user.id, trip);
+        setSelectedTrip(itinerary);
+        setSelectedTripId(trip.id);
+        listRef.current?.scrollToOffset({ offset: 0, animated: true });
+      } catch (caught) {
+        setError(caught instanceof Error ? caught.message : 'We could not open this trip.');
+      } finally {
+        setOpeningId(null);
+      }
+    },
+    [user],
+  );
+
+  // Deletes and renames apply locally at once; the sync queue sends them on.
   const handleDelete = useCallback(
     async (tripId: string) => {
-      setDeletingId(tripId);
-      const { error: deleteError } = await supabase
-        .from('itineraries')
-        .delete()
-        .eq('id', tripId);
-      if (deleteError) {
-        setError(deleteError.message);
-      } else {
-        setTrips((prev) => prev.filter((plan) => plan.id !== tripId));
-        if (selectedTripId === tripId) {
-          setSelectedTrip(null);
-          setSelectedTripId(null);
-        }
+      if (!user) return;
+      await deleteTrip(user.id, tripId);
+      if (selectedTripId === tripId) {
+        setSelectedTrip(null);
+        setSelectedTripId(null);
       }
-      setDeletingId(null);
       setConfirmingDelete(null);
     },
-    [selectedTripId],
+    [selectedTripId, user],
   );
 
-  const openRename = useCallback((trip: SavedItineraryRecord) => {
+  const openRename = useCallback((trip: SavedTripSummary) => {
     setRenamingTrip(trip);
     setRenameValue(trip.trip_name);
   }, []);
 
   const handleRename = useCallback(async () => {
-    if (!renamingTrip) return;
+    if (!renamingTrip || !user) return;
     const newName = renameValue.trim();
     if (newName.length === 0) return;
 
-    setRenaming(true);
-    setError(null);
-
-    try {
-      const itineraryData = renamingTrip.itinerary_data as TripItinerary;
-      const updatedData: TripItinerary = {
-        ...itineraryData,
-        trip_name: newName,
-      };
-
-      const { error: dbError } = await supabase
-        .from('itineraries')
-        .update({ trip_name: newName, itinerary_data: updatedData })
-        .eq('id', renamingTrip.id);
+    await renameTrip(user.id, renamingTrip.id, newName);
+    if (selectedTripId === renamingTrip.id) {
+      setSelectedTrip((current) => (current ? { ...current, trip_name: newName } : current));
+    }
+    setRenamingTrip(null);
+  }, [renamingTrip, renameValue, selectedTripId, user]);
 
-      if (dbError) {
-        throw dbError;
-      }
+  const renderTrip = ({ item: trip }: { item: SavedTripSummary }) => {
+    const durationDays =
+      differenceInCalendarDays(new Date(trip.end_date), new Date(trip.start_date)) + 1;
+    const currency = trip.currency ?? 'USD';
+    const symbol = currencySymbols[currency] ?? '$';
+    const totalBudget = trip.budget_converted ?? trip.budget_usd ?? null;
+    const dailyBudget =
+      trip.daily_budget_converted ??
+      trip.daily_budget_usd ??
+      (totalBudget != null ? totalBudget / Math.max(durationDays, 1) : null);
+    const budgetLabel =
+      dailyBudget != null ? `${symbol}${dailyBudget.toFixed(0)} per day` : 'Flexible budget';
 
-      setTrips((prev) =>
-        prev.map((record) =>
-          record.id === renamingTrip.id
-            ? { ...record, trip_name: newName, itinerary_data: updatedData }
-            : record,
-        ),
-      );
-
-      if (selectedTripId === renamingTrip.id) {
-        setSelectedTrip(updatedData);
-      }
+    return (
+      <Surface style={styles.tripCard} elevation={1}>
+        <List.Accordion
+          title={trip.trip_name}
+          description={`${trip.destination} • ${durationDays} days • ${budgetLabel}`}
+          left={(props) => <List.Icon {...props} icon="calendar" />}
+          right={(props) => (
+            <View style={styles.cardActions}>
+              <IconButton
+                {...props}
+                icon="pencil"
+                onPress={() => openRename(trip)}
+              />
+              <IconButton
+                {...props}
+                icon="delete"
+                onPress={() => setConfirmingDelete(trip.id)}
+              />
+            </View>
+          )}
+        >
+          <List.Item
+            title="Trip snapshot"
+            description={`${format(new Date(trip.start_date), 'LLL d, yyyy')} -> ${format(
+              new Date(trip.end_date),
+              'LLL d, yyyy',
+            )}`}
+            left={(props) => <List.Icon {...props} icon="timeline" />}
+          />
+          <Button
+            mode="contained-tonal"
+            icon="eye"
+            onPress={() => void openTrip(trip)}
+            loading={openingId === trip.id}
+            disabled={openingId === trip.id}
+            style={styles.viewButton}
+          >
+            View itinerary
+          </Button>
+        </List.Accordion>
+      </Surface>
+    );
+  };
 
-      setRenamingTrip(null);
-    } catch (caught) {
-      const message =
-        caught instanceof Error
-          ? caught.message
-          : 'We could not rename this trip right now.';
-      setError(message);
-    } finally {
-      setRenaming(false);
-    }
-  }, [renamingTrip, renameValue, selectedTripId]);
+  const renderHeader = () => (
+    <View style={styles.header}>
+      <Text variant="titleLarge" style={styles.title}>
+        Saved itineraries
+      </Text>
+      {selectedTrip ? (
+        <View style={styles.previewContainer}>
+          <PlanPreview itinerary={selectedTrip} saving={false} />
+        </View>
+      ) : null}
+      {error && trips.length > 0 ? (
+        <Text style={{ color: theme.colors.error }}>{error}</Text>
+      ) : null}
+    </View>
+  );
 
-  const renderContent = () => {
+  const renderEmpty = () => {
     if (loading) {
       return (
         <View style={styles.centerContent}>
@@ -164,112 +273,40 @@ const SavedPlansScreen = () => {
       return (
         <View style={styles.centerContent}>
           <Text style={[styles.centerText, { color: theme.colors.error }]}>{error}</Text>
-          <Button onPress={() => fetchTrips()} style={{ marginTop: 8 }}>
+          <Button onPress={() => fetchTrips(true)} style={{ marginTop: 8 }}>
             Try again
           </Button>
         </View>
       );
     }
 
-    if (trips.length === 0) {
-      return (
-        <View style={styles.centerContent}>
-          <Text style={styles.centerText}>
-            No itineraries yet. Generate your first multi-day adventure!
-          </Text>
-        </View>
-      );
-    }
-
     return (
-      <List.Section>
-        {trips.map((trip) => {
-          const itineraryData = trip.itinerary_data as TripItinerary | null;
-          const durationDays =
-            differenceInCalendarDays(new Date(trip.end_date), new Date(trip.start_date)) +
-            1;
-          const currency = itineraryData?.currency ?? 'USD';
-          const symbol = currencySymbols[currency] ?? '$';
-          const totalBudget =
-            itineraryData?.budget_converted ?? itineraryData?.budget_usd ?? null;
-          const dailyBudget =
-            itineraryData?.daily_budget_converted ??
-            itineraryData?.daily_budget_usd ??
-            (totalBudget != null
-              ? totalBudget / Math.max(durationDays, 1)
-              : null);
-          const budgetLabel =
-            dailyBudget != null
-              ? `${symbol}${dailyBudget.toFixed(0)} per day`
-              : 'Flexible budget';
-
-          return (
-            <Surface key={trip.id} style={styles.tripCard} elevation={1}>
-              <List.Accordion
-                title={trip.trip_name}
-                description={`${trip.destination} • ${durationDays} days • ${budgetLabel}`}
-                left={(props) => <List.Icon {...props} icon="calendar" />}
-                right={(props) => (
-                  <View style={styles.cardActions}>
-                    <IconButton
-                      {...props}
-                      icon="pencil"
-                      onPress={() => openRename(trip)}
-                      disabled={deletingId === trip.id}
-                    />
-                    <IconButton
-                      {...props}
-                      icon="delete"
-                      onPress={() => setConfirmingDelete(trip.id)}
-                      disabled={deletingId === trip.id}
-                    />
-                  </View>
-                )}
-              >
-                <List.Item
-                  title="Trip snapshot"
-                  description={`${format(new Date(trip.start_date), 'LLL d, yyyy')} -> ${format(
-                    new Date(trip.end_date),
-                    'LLL d, yyyy',
-                  )}`}
-                  left={(props) => <List.Icon {...props} icon="timeline" />}
-                />
-                <Button
-                  mode="contained-tonal"
-                  icon="eye"
-                  onPress={() => {
-                    if (itineraryData) {
-                      setSelectedTrip(itineraryData);
-                      setSelectedTripId(trip.id);
-                    }
-                  }}
-                  style={styles.viewButton}
-                >
-                  View itinerary
-                </Button>
-              </List.Accordion>
-            </Surface>
-          );
-        })}
-      </List.Section>
+      <View style={styles.centerContent}>
+        <Text style={styles.centerText}>
+          No itineraries yet. Generate your first multi-day adventure!
+        </Text>
+      </View>
     );
   };
 
   return (
-    <ScrollView
-      style={[styles.container, { backgroundColor: theme.colors.background }]}
-      contentContainerStyle={styles.content}
-      refreshControl={<RefreshControl refreshing={refreshing} onRefresh={onRefresh} />}
-    >
-      <Text variant="titleLarge" style={styles.title}>
-        Saved itineraries
-      </Text>
-      {renderContent()}
-      {selectedTrip ? (
-        <View style={styles.previewContainer}>
-          <PlanPreview itinerary={selectedTrip} saving={false} />
-        </View>
-      ) : null}
+    <>
+      <FlatList
+        ref={listRef}
+        style={[styles.container, { backgroundColor: theme.colors.background }]}
+        contentContainerStyle={styles.content}
+        data={loading ? [] : trips}
+        keyExtractor={(trip) => trip.id}
+        renderItem={renderTrip}
+        ListHeaderComponent={renderHeader()}
+        ListEmptyComponent={renderEmpty()}
+        ListFooterComponent={
+          loadingMore ? <ActivityIndicator animating style={styles.footer} /> : null
+        }
+        onEndReached={() => void loadMore()}
+        onEndReachedThreshold={0.5}
+        refreshControl={<RefreshControl refreshing={refreshing} onRefresh={onRefresh} />}
+      />
 
       <Portal>
         <Dialog visible={!!confirmingDelete} onDismiss={() => setConfirmingDelete(null)}>
@@ -285,7 +322,6 @@ const SavedPlansScreen = () => {
                   void handleDelete(confirmingDelete);
                 }
               }}
-              loading={deletingId === confirmingDelete}
             >
               Delete
             </Button>
@@ -305,13 +341,13 @@ const SavedPlansScreen = () => {
           </Dialog.Content>
           <Dialog.Actions>
             <Button onPress={() => setRenamingTrip(null)}>Cancel</Button>
-            <Button onPress={handleRename} loading={renaming} disabled={renaming}>
+            <Button onPress={handleRename}>
               Save
             </Button>
           </Dialog.Actions>
         </Dialog>
       </Portal>
-    </ScrollView>
+    </>
   );
 };
 
@@ -323,6 +359,9 @@ const styles = StyleSheet.create({
     padding: 16,
     gap: 16,
   },
+  header: {
+    gap: 16,
+  },
   title: {
     fontWeight: '700',
   },
@@ -350,6 +389,9 @@ const styles = StyleSheet.create({
     flexDirection: 'row',
     alignItems: 'center',
   },
+  footer: {
+    paddingVertical: 16,
+  },
 });
 
 export default SavedPlansScreen;
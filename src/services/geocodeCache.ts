@@ -0,0 +1,86 @@
+import { createPersistentCache } from "../lib/cache";
+import type { Span } from "../lib/tracing";
+
+export type GeocodeKind = "country" | "locality" | "admin_area" | "unknown";
+
+/**
+ * Provider-neutral geocode result shared by `geocodePlace` (Geocoding API)
+ * and `geocodeCity` (Places text search), so either path can answer the other.
+ */
+export type GeocodeRecord = {
+  kind: GeocodeKind;
+  /** Short display name, e.g. "Paris" or "Japan". */
+  name: string;
+  /** Full formatted address, e.g. "Paris, France". */
+  address: string;
+  country?: string;
+  countryCode?: string;
+  lat: number;
+  lng: number;
+  placeId: string;
+  types: string[];
+};
+
+const GEOCODE_TTL_MS = 30 * 24 * 60 * 60 * 1000;
+
+const geocodeCache = createPersistentCache<GeocodeRecord>({
+  storageKey: "plangenie.cache.geocode",
+  maxEntries: 200,
+  ttlMs: GEOCODE_TTL_MS,
+});
+
+const inFlight = new Map<string, Promise<GeocodeRecord | null>>();
+
+export function normaliseGeocodeQuery(query: string) {
+  return query
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase()
+    .replace(/\s*,\s*/g, ", ")
+    .replace(/\s+/g, " ")
+    .trim();
+}
+
+export function geocodeKindFromTypes(types: string[] = []): GeocodeKind {
+  if (types.includes("country")) return "country";
+  if (types.includes("locality")) return "locality";
+  if (types.some((t) => t.startsWith("administrative_area_level"))) return "admin_area";
+  return "unknown";
+}
+
+/**
+ * Resolve `query` through the shared cache, calling `resolve` only on a miss.
+ * Concurrent lookups of the same query share one request. A `null` result is
+ * returned to the caller but never cached. `span`, when given, records
+ * whether the cache answered.
+ */
+export async function cachedGeocode(
+  query: string,
+  resolve: () => Promise<GeocodeRecord | null>,
+  span?: Span,
+): Promise<GeocodeRecord | null> {
+  const key = normaliseGeocodeQuery(query);
+  const pending = inFlight.get(key);
+  if (pending) {
+    span?.set({ cache: "coalesced" });
+    return pending;
+  }
+
+  const request = (async () => {
+    const cached = await geocodeCache.get(key);
+    span?.set({ cache: cached ? "hit" : "miss" });
+    if (cached) return cached;
+    const record = await resolve();
+    if (record) {
+      void geocodeCache.set(key, record);
+      // A formatted address always resolves to the same place, so cache it as an alias.
+      const alias = normaliseGeocodeQuery(record.address);
+      if (alias && alias !== key) void geocodeCache.set(alias, record);
+    }
+    return record;
+  })().finally(() => {
+    inFlight.delete(key);
+  });
+  inFlight.set(key, request);
+  return request;
+}
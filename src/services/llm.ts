@@ -0,0 +1,229 @@
+import { withAbort } from "../lib/abort";
+import { createPersistentCache } from "../lib/cache";
+import { hashText } from "../lib/hash";
+import { httpFetch, withRequestSlot } from "../lib/http";
+import { traceCall } from "../lib/tracing";
+import type { Span } from "../lib/tracing";
+
+export const OPENAI_CHAT_COMPLETIONS_ENDPOINT = "https://api.openai.com/v1/chat/completions";
+
+// A streamed multi-day itinerary can take a while; this only stops a hung connection.
+const STREAM_TIMEOUT_MS = 120000;
+
+export type ChatMessage = { role: "system" | "user" | "assistant"; content: string };
+
+export type ChatRequest = {
+  model: string;
+  messages: ChatMessage[];
+  temperature?: number;
+  maxTokens?: number;
+  responseFormat?: "json_object";
+};
+
+export type ChatCallOptions<T> = {
+  apiKey: string;
+  /**
+   * Turn the reply text into the value handed back to callers. Throw to
+   * reject the reply; rejected replies are never cached.
+   */
+  parse: (content: string) => T;
+  ttlMs?: number;
+  /**
+   * Stream the reply and receive each text delta as it arrives. Not called
+   * when the result comes from the cache or from a request already in flight.
+   */
+  onText?: (delta: string) => void;
+  /**
+   * Stop waiting once aborted. The request itself runs to completion and is
+   * cached, since an identical call is likely to follow a resubmit.
+   */
+  signal?: AbortSignal;
+  /** Span to record the call under, with its cache outcome and reply size. */
+  span?: Span;
+};
+
+export type LlmCacheStats = {
+  hits: number;
+  misses: number;
+  /** Calls that joined an identical request already in flight. */
+  coalesced: number;
+};
+
+const LLM_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+const llmCache = createPersistentCache<unknown>({
+  storageKey: "plangenie.cache.llm",
+  // Whole itineraries are a few KB each.
+  maxEntries: 60,
+  ttlMs: LLM_TTL_MS,
+});
+
+const inFlight = new Map<string, Promise<unknown>>();
+const stats: LlmCacheStats = { hits: 0, misses: 0, coalesced: 0 };
+
+export function getLlmCacheStats(): LlmCacheStats {
+  return { ...stats };
+}
+
+const collapse = (text: string) => text.replace(/\s+/g, " ").trim();
+
+export function chatCacheKey(request: ChatRequest) {
+  const prompt = request.messages.map((m) => `${m.role}:${collapse(m.content)}`).join("\n");
+  return [
+    request.model.trim().toLowerCase(),
+    (request.temperature ?? 1).toFixed(2),
+    request.responseFormat ?? "text",
+    request.maxTokens ?? "-",
+    hashText(prompt),
+  ].join("~");
+}
+
+function requestBody(request: ChatRequest, stream: boolean) {
+  return JSON.stringify({
+    model: request.model,
+    temperature: request.temperature,
+    max_tokens: request.maxTokens,
+    messages: request.messages,
+    response_format: request.responseFormat ? { type: request.responseFormat } : undefined,
+    stream: stream || undefined,
+  });
+}
+
+async function sendChatCompletion(request: ChatRequest, apiKey: string, span?: Span): Promise<string> {
+  const response = await httpFetch(OPENAI_CHAT_COMPLETIONS_ENDPOINT, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Authorization: `Bearer ${apiKey}`,
+    },
+    body: requestBody(request, false),
+    span,
+  });
+
+  if (!response.ok) {
+    const message = await response.text();
+    throw new Error(`OpenAI request failed: ${response.status} ${message}`);
+  }
+
+  const payload = await response.json();
+  return (payload.choices?.[0]?.message?.content as string | undefined) ?? "";
+}
+
+// React Native's fetch buffers the whole body, but XMLHttpRequest reports
+// partial responseText on progress events, which is enough to read SSE. It
+// still takes a slot from the shared client, but is never retried, since the
+// caller has already seen part of the reply.
+function streamChatCompletion(
+  request: ChatRequest,
+  apiKey: string,
+  onText: (delta: string) => void,
+  span: Span | undefined,
+): Promise<string> {
+  return withRequestSlot(OPENAI_CHAT_COMPLETIONS_ENDPOINT, () =>
+    new Promise<string>((resolve, reject) => {
+      const xhr = new XMLHttpRequest();
+      let seen = 0;
+      let pending = "";
+      let content = "";
+
+      const consume = () => {
+        const text = xhr.responseText ?? "";
+        pending += text.slice(seen);
+        seen = text.length;
+        const lines = pending.split("\n");
+        pending = lines.pop() ?? "";
+        for (const line of lines) {
+          const trimmed = line.trim();
+          if (!trimmed.startsWith("data:")) continue;
+          const data = trimmed.slice(5).trim();
+          if (!data || data === "[DONE]") continue;
+          try {
+            const delta = JSON.parse(data).choices?.[0]?.delta?.content;
+            if (typeof delta === "string" && delta) {
+              content += delta;
+              onText(delta);
+            }
+          } catch {
+            // Keep-alive or malformed event; the final parse decides.
+          }
+        }
+      };
+
+      xhr.open("POST", OPENAI_CHAT_COMPLETIONS_ENDPOINT);
+      xhr.setRequestHeader("Content-Type", "application/json");
+      xhr.setRequestHeader("Authorization", `Bearer ${apiKey}`);
+      xhr.onprogress = () => {
+        if (xhr.status >= 200 && xhr.status < 300) consume();
+      };
+      xhr.onload = () => {
+        if (xhr.status < 200 || xhr.status >= 300) {
+          reject(new Error(`OpenAI request failed: ${xhr.status} ${xhr.responseText}`));
+          return;
+        }
+        consume();
+        pending += "\n";
+        consume();
+        resolve(content);
+      };
+      xhr.onerror = () => reject(new Error("OpenAI stream failed."));
+      xhr.ontimeout = () => reject(new Error("OpenAI stream timed out."));
+      xhr.timeout = STREAM_TIMEOUT_MS;
+      xhr.send(requestBody(request, true));
+    }),
+    { span },
+  );
+}
+
+/**
+ * Chat completion behind a persistent cache.
+ *
+ * Requests are keyed on the model, temperature, response format and the
+ * whitespace-normalised prompt. Identical calls made while one is in flight
+ * share its promise, and parsed results are stored for `ttlMs`.
+ */
+export function cachedChatCompletion<T>(request: ChatRequest, options: ChatCallOptions<T>): Promise<T> {
+  return traceCall(options.span, "openai", { model: request.model }, (span) =>
+    runChatCompletion(request, options, span),
+  );
+}
+
+async function runChatCompletion<T>(
+  request: ChatRequest,
+  options: ChatCallOptions<T>,
+  span: Span | undefined,
+): Promise<T> {
+  const key = chatCacheKey(request);
+  const pending = inFlight.get(key);
+  if (pending) {
+    stats.coalesced += 1;
+    span?.set({ cache: "coalesced" });
+    return withAbort(pending as Promise<T>, options.signal);
+  }
+
+  const { signal } = options;
+  const onText = options.onText;
+
+  const call = (async () => {
+    const cached = await llmCache.get(key);
+    if (cached !== undefined) {
+      stats.hits += 1;
+      span?.set({ cache: "hit" });
+      return cached as T;
+    }
+    stats.misses += 1;
+    span?.set({ cache: "miss", stream: !!onText });
+    const content = onText
+      ? await streamChatCompletion(request, options.apiKey, (delta) => {
+          if (!signal?.aborted) onText(delta);
+        }, span)
+      : await sendChatCompletion(request, options.apiKey, span);
+    span?.set({ responseBytes: content.length });
+    const value = options.parse(content);
+    void llmCache.set(key, value, options.ttlMs ?? LLM_TTL_MS);
+    return value;
+  })().finally(() => {
+    inFlight.delete(key);
+  });
+  inFlight.set(key, call);
+  return withAbort(call, signal);
+}
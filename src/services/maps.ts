@@ -1,12 +1,20 @@
 import Constants from "expo-constants";
 import type { PlaceLite, PriceLevel } from "../types";
+import { createLimiter } from "../lib/concurrency";
+import { createPersistentCache } from "../lib/cache";
+import { haversineKm } from "../lib/geo";
+import type { LatLng } from "../lib/geo";
+import { httpFetch } from "../lib/http";
+import { readJson, traceCall } from "../lib/tracing";
+import type { Span } from "../lib/tracing";
+import { cachedGeocode, geocodeKindFromTypes } from "./geocodeCache";
+import { cachedPlacesRequest, placesCacheKey, quantiseCoordinate, quantiseRadius } from "./placesCache";
+import type { GeocodeKind, GeocodeRecord } from "./geocodeCache";
 
 const GOOGLE_KEY: string =
   (Constants?.expoConfig?.extra as any)?.GOOGLE_MAPS_API_KEY ?? "";
 
-type GeocodeKind = "country" | "locality" | "admin_area" | "unknown";
-
-export async function geocodePlace(input: string): Promise<{
+export type GeocodedPlace = {
   kind: GeocodeKind;
   name: string;
   country?: string;
@@ -14,14 +22,38 @@ export async function geocodePlace(input: string): Promise<{
   lat: number;
   lng: number;
   placeId: string;
-}> {
+};
+
+export async function geocodePlace(input: string, span?: Span): Promise<GeocodedPlace> {
+  const record = await traceCall(span, "geocode", { query: input }, (callSpan) =>
+    cachedGeocode(input, () => resolveGeocode(input, callSpan), callSpan),
+  );
+
+  if (!record) {
+    throw new Error("No geocoding results.");
+  }
+
+  const name = (record.kind === "country" && record.country) || record.address || input;
+
+  return {
+    kind: record.kind,
+    name,
+    country: record.country,
+    countryCode: record.countryCode,
+    lat: record.lat,
+    lng: record.lng,
+    placeId: record.placeId,
+  };
+}
+
+async function resolveGeocode(input: string, span?: Span): Promise<GeocodeRecord> {
   const url =
     "https://maps.googleapis.com/maps/api/geocode/json?address=" +
     encodeURIComponent(input) +
     `&key=${GOOGLE_KEY}`;
 
-  const res = await fetch(url);
-  const json = await res.json();
+  const res = await httpFetch(url, { span });
+  const json = await readJson<any>(res, span);
 
   if (!json.results?.[0]) {
     throw new Error("No geocoding results.");
@@ -30,30 +62,29 @@ export async function geocodePlace(input: string): Promise<{
   const types: string[] = r.types || [];
   const comps: any[] = r.address_components || [];
 
-  let kind: GeocodeKind = "unknown";
-  if (types.includes("country")) kind = "country";
-  else if (types.includes("locality")) kind = "locality";
-  else if (types.some((t) => t.startsWith("administrative_area_level")))
-    kind = "admin_area";
-
+  const kind = geocodeKindFromTypes(types);
   const countryComp = comps.find((c) => c.types?.includes("country"));
-  const name =
-    (types.includes("country") && countryComp?.long_name) ||
-    r.formatted_address ||
-    input;
+  const localityComp = comps.find((c) => c.types?.includes("locality"));
+  const address: string = r.formatted_address || input;
 
   return {
     kind,
-    name,
+    name:
+      (kind === "country" && countryComp?.long_name) ||
+      localityComp?.long_name ||
+      address.split(",")[0].trim() ||
+      input,
+    address,
     country: countryComp?.long_name,
     countryCode: countryComp?.short_name,
     lat: r.geometry.location.lat,
     lng: r.geometry.location.lng,
     placeId: r.place_id,
+    types,
   };
 }
 
-export async function nearbyPlaces(opts: {
+export type NearbyQuery = {
   lat: number;
   lng: number;
   radiusMeters: number;
@@ -61,30 +92,57 @@ export async function nearbyPlaces(opts: {
   minRating?: number;
   priceLevels?: PriceLevel[];
   maxResults?: number;
-}): Promise<PlaceLite[]> {
-  const {
-    lat,
-    lng,
-    radiusMeters,
-    includedTypes,
-    minRating = 4.1,
-    priceLevels,
-    maxResults = 12,
-  } = opts;
+};
+
+const NEARBY_MAX_RESULTS = 20;
+
+const NEARBY_FIELD_MASK =
+  "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.priceLevel,places.websiteUri,places.googleMapsUri,places.types";
+
+// Searches are snapped to the cache grid so the cached payload matches its key
+// exactly; rating/price filters run client-side, so budgets share entries.
+function searchNearby(opts: {
+  lat: number;
+  lng: number;
+  radiusMeters: number;
+  includedTypes: string[];
+  maxResults: number;
+}, span?: Span): Promise<PlaceLite[]> {
+  const request = {
+    lat: quantiseCoordinate(opts.lat),
+    lng: quantiseCoordinate(opts.lng),
+    radiusMeters: quantiseRadius(opts.radiusMeters),
+    includedTypes: opts.includedTypes,
+    maxResults: Math.min(opts.maxResults, NEARBY_MAX_RESULTS),
+  };
+  const key = placesCacheKey({ endpoint: "nearby", fieldMask: NEARBY_FIELD_MASK, ...request });
+  const types = request.includedTypes.join(",");
+  return traceCall(span, "places.searchNearby", { types }, (callSpan) =>
+    cachedPlacesRequest(key, () => fetchNearby(request, callSpan), callSpan),
+  );
+}
+
+async function fetchNearby(opts: {
+  lat: number;
+  lng: number;
+  radiusMeters: number;
+  includedTypes: string[];
+  maxResults: number;
+}, span?: Span): Promise<PlaceLite[]> {
+  const { lat, lng, radiusMeters, includedTypes, maxResults } = opts;
   const endpoint = "https://places.googleapis.com/v1/places:searchNearby";
 
-  const fieldMask =
-    "places.id,places.displayName,places.formattedAddress,places.location,places.rating,places.userRatingCount,places.priceLevel,places.websiteUri,places.googleMapsUri,places.types";
+  const fieldMask = NEARBY_FIELD_MASK;
 
   const body = {
     includedTypes,
-    maxResultCount: Math.min(maxResults, 20),
+    maxResultCount: maxResults,
     locationRestriction: {
       circle: { center: { latitude: lat, longitude: lng }, radius: radiusMeters },
     },
   };
 
-  const res = await fetch(endpoint, {
+  const res = await httpFetch(endpoint, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
@@ -92,6 +150,7 @@ export async function nearbyPlaces(opts: {
       "X-Goog-FieldMask": fieldMask,
     },
     body: JSON.stringify(body),
+    span,
   });
 
   if (!res.ok) {
@@ -99,58 +158,302 @@ export async function nearbyPlaces(opts: {
     throw new Error(`Places error: ${res.status} ${txt}`);
   }
 
-  const json = await res.json();
+  const json = await readJson<any>(res, span);
   const places = (json.places || []) as any[];
 
-  const filtered = places
+  return places.map<PlaceLite>((p) => ({
+    id: p.id,
+    name: p.displayName?.text ?? "Unknown",
+    address: p.formattedAddress,
+    lat: p.location?.latitude,
+    lng: p.location?.longitude,
+    googleMapsUri:
+      p.googleMapsUri ||
+      `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(
+        p.displayName?.text ?? ""
+      )}&query_place_id=${encodeURIComponent(p.id)}`,
+    rating: p.rating,
+    userRatingsTotal: p.userRatingCount,
+    priceLevel: p.priceLevel as PriceLevel | undefined,
+    websiteUri: p.websiteUri,
+    types: p.types,
+  }));
+}
+
+function applyNearbyFilters(places: PlaceLite[], query: NearbyQuery): PlaceLite[] {
+  const { minRating = 4.1, priceLevels } = query;
+  return places
     .filter((p) => !minRating || (p.rating ?? 0) >= minRating)
     .filter((p) =>
       priceLevels && priceLevels.length
         ? priceLevels.includes(p.priceLevel as PriceLevel)
         : true
-    )
-    .map<PlaceLite>((p) => ({
-      id: p.id,
-      name: p.displayName?.text ?? "Unknown",
-      address: p.formattedAddress,
-      lat: p.location?.latitude,
-      lng: p.location?.longitude,
-      googleMapsUri:
-        p.googleMapsUri ||
-        `https://www.google.com/maps/search/?api=1&query=${encodeURIComponent(
-          p.displayName?.text ?? ""
-        )}&query_place_id=${encodeURIComponent(p.id)}`,
-      rating: p.rating,
-      userRatingsTotal: p.userRatingCount,
-      priceLevel: p.priceLevel as PriceLevel | undefined,
-      websiteUri: p.websiteUri,
-      types: p.types,
-    }));
-
-  return filtered;
+    );
 }
 
-export async function getTravelTimeMinutes(args: {
-  from: { lat: number; lng: number };
-  to: { lat: number; lng: number };
-  mode?: "driving" | "walking" | "bicycling" | "transit";
-}): Promise<{ minutes: number; distanceKm?: number }> {
-  const { from, to, mode = "transit" } = args;
+export async function nearbyPlaces(opts: NearbyQuery, span?: Span): Promise<PlaceLite[]> {
+  const places = await searchNearby(
+    {
+      lat: opts.lat,
+      lng: opts.lng,
+      radiusMeters: opts.radiusMeters,
+      includedTypes: opts.includedTypes,
+      maxResults: opts.maxResults ?? 12,
+    },
+    span,
+  );
+  return applyNearbyFilters(places, opts);
+}
+
+type NearbyRequestGroup = {
+  lat: number;
+  lng: number;
+  radiusMeters: number;
+  includedTypes: string[];
+  maxResults: number;
+  members: number[];
+};
+
+/**
+ * Run several nearby searches as one batch.
+ *
+ * Queries around the same circle share a single request when their type lists
+ * overlap (culture and landmarks both ask for `tourist_attraction`), or when
+ * their combined result count fits under the API cap. A shared request asks
+ * for the union of the types, and each query keeps the results carrying one of
+ * its own types. The remaining requests run concurrently. Rating and
+ * price filters are applied client-side per query, and every result is tagged
+ * with its query's `tag` as `_category`. The returned lists line up with `queries`.
+ * A search that fails leaves its queries empty; the batch only rejects when
+ * every search failed.
+ */
+export async function nearbyPlacesBatch<T extends string>(
+  queries: Array<NearbyQuery & { tag: T }>,
+  opts: { concurrency?: number; span?: Span } = {},
+): Promise<Array<Array<PlaceLite & { _category: T }>>> {
+  const groups: NearbyRequestGroup[] = [];
+  queries.forEach((query, index) => {
+    const maxResults = Math.min(query.maxResults ?? 12, NEARBY_MAX_RESULTS);
+    const sameCircle = (group: NearbyRequestGroup) =>
+      group.lat === query.lat &&
+      group.lng === query.lng &&
+      group.radiusMeters === query.radiusMeters;
+    const target =
+      groups.find(
+        (group) =>
+          sameCircle(group) && query.includedTypes.some((type) => group.includedTypes.includes(type)),
+      ) ??
+      groups.find(
+        (group) => sameCircle(group) && group.maxResults + maxResults <= NEARBY_MAX_RESULTS,
+      );
+    if (!target) {
+      groups.push({
+        lat: query.lat,
+        lng: query.lng,
+        radiusMeters: query.radiusMeters,
+        includedTypes: [...query.includedTypes],
+        maxResults,
+        members: [index],
+      });
+      return;
+    }
+    const merged = new Set(target.includedTypes);
+    const addsTypes = query.includedTypes.some((type) => !merged.has(type));
+    query.includedTypes.forEach((type) => merged.add(type));
+    target.includedTypes = Array.from(merged);
+    target.maxResults = addsTypes
+      ? Math.min(target.maxResults + maxResults, NEARBY_MAX_RESULTS)
+      : Math.max(target.maxResults, maxResults);
+    target.members.push(index);
+  });
+
+  const run = createLimiter(opts.concurrency ?? 4);
+  const results: Array<Array<PlaceLite & { _category: T }>> = queries.map(() => []);
+  const failures: unknown[] = [];
+
+  await Promise.all(
+    groups.map((group) =>
+      run(async () => {
+        let places: PlaceLite[];
+        try {
+          places = await searchNearby(group, opts.span);
+        } catch (error) {
+          // A failed search leaves its queries empty; the rest of the batch still counts.
+          console.warn("Nearby search failed", error);
+          failures.push(error);
+          return;
+        }
+        for (const index of group.members) {
+          const query = queries[index];
+          const wanted = new Set(query.includedTypes);
+          const matching =
+            group.members.length === 1
+              ? places
+              : places.filter((p) => !p.types?.length || p.types.some((type) => wanted.has(type)));
+          results[index] = applyNearbyFilters(matching, query)
+            .slice(0, query.maxResults ?? 12)
+            .map((p) => ({ ...p, _category: query.tag }));
+        }
+      }),
+    ),
+  );
+
+  // With nothing at all to work with, let the caller fall back as it would on any error.
+  if (groups.length && failures.length === groups.length) throw failures[0];
+  return results;
+}
+
+export type TravelMode = "driving" | "walking" | "bicycling" | "transit";
+
+export type TravelEstimate = {
+  minutes: number;
+  distanceKm?: number;
+  /** True when the value comes from the offline speed model rather than the API. */
+  estimated?: boolean;
+};
+
+// Offline fallback: straight-line distance stretched by a detour factor, at a
+// typical door-to-door speed, plus a fixed overhead for boarding/parking.
+const SPEED_MODEL: Record<TravelMode, { kmh: number; detour: number; overheadMin: number }> = {
+  walking: { kmh: 4.8, detour: 1.25, overheadMin: 0 },
+  bicycling: { kmh: 15, detour: 1.25, overheadMin: 2 },
+  driving: { kmh: 80, detour: 1.25, overheadMin: 10 },
+  transit: { kmh: 75, detour: 1.25, overheadMin: 25 },
+};
+
+export function estimateTravel(from: LatLng, to: LatLng, mode: TravelMode = "transit"): TravelEstimate {
+  const model = SPEED_MODEL[mode];
+  const roadKm = haversineKm(from, to) * model.detour;
+  return {
+    minutes: Math.max(1, Math.round((roadKm / model.kmh) * 60 + model.overheadMin)),
+    distanceKm: Math.round(roadKm),
+    estimated: true,
+  };
+}
+
+const travelCache = createPersistentCache<TravelEstimate>({
+  storageKey: "plangenie.cache.travel",
+  maxEntries: 300,
+  ttlMs: 30 * 24 * 60 * 60 * 1000,
+});
+
+// ~1 km cells: legs between the same neighbourhoods share an entry.
+const travelCellKey = (point: LatLng) => `${point.lat.toFixed(2)},${point.lng.toFixed(2)}`;
+
+const travelKey = (from: LatLng, to: LatLng, mode: TravelMode) =>
+  `${travelCellKey(from)}>${travelCellKey(to)}:${mode}`;
+
+// Distance Matrix bills every origin x destination element, but a route only
+// needs the consecutive legs. Asking for a few legs per request keeps the
+// unused elements down (4 legs: 16 billed, 4 used) while a long route still
+// needs only a handful of requests, sent together. This also stays well under
+// the API's 25-per-side and 100-element limits.
+const MATRIX_LEGS_PER_REQUEST = 4;
+
+/**
+ * Travel time for every consecutive leg of `stops`.
+ *
+ * Cached legs are answered locally; the rest are resolved with Distance Matrix
+ * requests of up to MATRIX_LEGS_PER_REQUEST legs each, sent concurrently. Legs
+ * the API cannot answer (or all of them, when offline) fall back to
+ * `estimateTravel`.
+ */
+export async function getRouteTravelTimes(args: {
+  stops: LatLng[];
+  mode?: TravelMode;
+  span?: Span;
+}): Promise<TravelEstimate[]> {
+  const { stops, mode = "transit" } = args;
+  return traceCall(args.span, "distanceMatrix", { mode, legs: stops.length - 1 }, (span) =>
+    resolveRouteTravelTimes(stops, mode, span),
+  );
+}
+
+type MatrixLeg = { from: LatLng; to: LatLng; key: string; index: number };
+
+async function resolveRouteTravelTimes(
+  stops: LatLng[],
+  mode: TravelMode,
+  span: Span | undefined,
+): Promise<TravelEstimate[]> {
+  const legs = stops.slice(1).map((to, i) => ({ from: stops[i], to, key: travelKey(stops[i], to, mode) }));
+  const results: Array<TravelEstimate | undefined> = await Promise.all(
+    legs.map((leg) => travelCache.get(leg.key)),
+  );
+
+  const missing = legs.map((leg, i) => ({ ...leg, index: i })).filter((leg) => !results[leg.index]);
+  span?.set({ cache: missing.length ? "miss" : "hit", cachedLegs: legs.length - missing.length });
+
+  if (missing.length && GOOGLE_KEY) {
+    const chunks = Array.from({ length: Math.ceil(missing.length / MATRIX_LEGS_PER_REQUEST) }, (_, i) =>
+      missing.slice(i * MATRIX_LEGS_PER_REQUEST, (i + 1) * MATRIX_LEGS_PER_REQUEST),
+    );
+    span?.set({ requests: chunks.length });
+    await Promise.all(
+      chunks.map(async (chunk) => {
+        try {
+          const answered = await requestMatrixLegs(chunk, mode, span);
+          answered.forEach((value, i) => {
+            if (!value) return;
+            results[chunk[i].index] = value;
+            void travelCache.set(chunk[i].key, value);
+          });
+        } catch (error) {
+          span?.set({ failed: true });
+          console.warn("Distance Matrix request failed", error);
+        }
+      }),
+    );
+  }
+
+  return legs.map((leg, i) => results[i] ?? estimateTravel(leg.from, leg.to, mode));
+}
+
+// One Distance Matrix request for `legs`; only the element on each leg's
+// origin row and destination column is read.
+async function requestMatrixLegs(
+  legs: MatrixLeg[],
+  mode: TravelMode,
+  span: Span | undefined,
+): Promise<Array<TravelEstimate | undefined>> {
+  const origins = Array.from(new Map(legs.map((leg) => [travelCellKey(leg.from), leg.from])).entries());
+  const destinations = Array.from(new Map(legs.map((leg) => [travelCellKey(leg.to), leg.to])).entries());
+  const formatPoints = (points: Array<[string, LatLng]>) =>
+    points.map(([, p]) => `${p.lat},${p.lng}`).join("|");
   const url =
     "https://maps.googleapis.com/maps/api/distancematrix/json" +
-    `?origins=${from.lat},${from.lng}` +
-    `&destinations=${to.lat},${to.lng}` +
+    `?origins=${encodeURIComponent(formatPoints(origins))}` +
+    `&destinations=${encodeURIComponent(formatPoints(destinations))}` +
     `&mode=${mode}` +
     `&key=${GOOGLE_KEY}`;
 
-  const res = await fetch(url);
-  const json = await res.json();
+  const res = await httpFetch(url, { span });
+  const json = await readJson<any>(res, span);
+  const originIndex = new Map(origins.map(([key], i) => [key, i]));
+  const destinationIndex = new Map(destinations.map(([key], i) => [key, i]));
+  return legs.map((leg) => {
+    const el =
+      json.rows?.[originIndex.get(travelCellKey(leg.from)) ?? -1]?.elements?.[
+        destinationIndex.get(travelCellKey(leg.to)) ?? -1
+      ];
+    if (el?.status !== "OK") return undefined;
+    return {
+      minutes: Math.round((el.duration?.value ?? 0) / 60),
+      distanceKm: Math.round((el.distance?.value ?? 0) / 1000),
+    };
+  });
+}
 
-  const el = json.rows?.[0]?.elements?.[0];
-  if (el?.status !== "OK") {
-    return { minutes: 0 };
-  }
-  const minutes = Math.round((el.duration?.value ?? 0) / 60);
-  const distanceKm = Math.round((el.distance?.value ?? 0) / 1000);
-  return { minutes, distanceKm };
+export async function getTravelTimeMinutes(args: {
+  from: { lat: number; lng: number };
+  to: { lat: number; lng: number };
+  mode?: TravelMode;
+  span?: Span;
+}): Promise<TravelEstimate> {
+  const [leg] = await getRouteTravelTimes({
+    stops: [args.from, args.to],
+    mode: args.mode,
+    span: args.span,
+  });
+  return leg;
 }
@@ -1,11 +1,14 @@
 import Constants from "expo-constants";
 import type { CityStay, Interest } from "../types";
+import type { Span } from "../lib/tracing";
+import { cachedChatCompletion } from "./llm";
 
 export async function proposeCitiesForCountry(params: {
   country: string;
   totalNights: number;
   interests: Interest[];
   budgetPerDay?: number;
+  span?: Span;
 }): Promise<CityStay[]> {
   const OPENAI_API_KEY: string =
     (Constants?.expoConfig?.extra as any)?.OPENAI_API_KEY ?? "";
@@ -29,43 +32,39 @@ export async function proposeCitiesForCountry(params: {
     }
   };
 
-  const res = await fetch("https://api.openai.com/v1/chat/completions", {
-    method: "POST",
-    headers: {
-      Authorization: `Bearer ${OPENAI_API_KEY}`,
-      "Content-Type": "application/json",
-    },
-    body: JSON.stringify({
+  return cachedChatCompletion(
+    {
       model: "gpt-4",
       temperature: 0.4,
       messages: [
         { role: "system", content: system },
         { role: "user", content: JSON.stringify(user) },
       ],
-      response_format: { type: "json_object" },
-    }),
-  });
-
-  if (!res.ok) {
-    const t = await res.text();
-    throw new Error(`OpenAI error: ${res.status} ${t}`);
-  }
-
-  const data = await res.json();
-  const text = data.choices?.[0]?.message?.content || "{}";
-  let parsed: any = {};
-  try {
-    parsed = JSON.parse(text);
-  } catch {
-    parsed = {};
-  }
+      responseFormat: "json_object",
+    },
+    {
+      apiKey: OPENAI_API_KEY,
+      span: params.span,
+      parse: (text) => {
+        let parsed: any = {};
+        try {
+          parsed = JSON.parse(text || "{}");
+        } catch {
+          parsed = {};
+        }
 
-  const arr = Array.isArray(parsed) ? parsed : parsed?.data || [];
-  return (arr as any[]).map((c) => ({
-    city: c.city,
-    country: c.country || params.country,
-    lat: c.lat,
-    lng: c.lng,
-    nights: Math.max(1, Math.round(c.nights)),
-  }));
+        const arr = Array.isArray(parsed) ? parsed : parsed?.data || [];
+        const cities: CityStay[] = (arr as any[]).map((c) => ({
+          city: c.city,
+          country: c.country || params.country,
+          lat: c.lat,
+          lng: c.lng,
+          nights: Math.max(1, Math.round(c.nights)),
+        }));
+        // Throwing keeps an empty answer out of the cache.
+        if (!cities.length) throw new Error("Could not propose cities for the country.");
+        return cities;
+      },
+    },
+  );
 }
@@ -0,0 +1,94 @@
+import { createPersistentCache } from "../lib/cache";
+import type { Span } from "../lib/tracing";
+
+// ~0.005° is roughly 550 m of latitude: close enough that two searches from
+// the same neighbourhood return the same places.
+const CELL_DEGREES = 0.005;
+const RADIUS_BUCKET_METERS = 500;
+
+const PLACES_TTL_MS = 24 * 60 * 60 * 1000;
+const PLACES_STALE_MS = 7 * 24 * 60 * 60 * 1000;
+
+const placesCache = createPersistentCache<unknown>({
+  storageKey: "plangenie.cache.places",
+  // Each entry holds up to 20 places; keep the snapshot well under AsyncStorage limits.
+  maxEntries: 120,
+  ttlMs: PLACES_TTL_MS,
+  staleTtlMs: PLACES_STALE_MS,
+});
+
+const inFlight = new Map<string, Promise<unknown>>();
+
+/** Snap a coordinate to the centre of its cache cell. */
+export function quantiseCoordinate(value: number) {
+  return Number((Math.round(value / CELL_DEGREES) * CELL_DEGREES).toFixed(4));
+}
+
+export function quantiseRadius(meters: number) {
+  return Math.max(RADIUS_BUCKET_METERS, Math.round(meters / RADIUS_BUCKET_METERS) * RADIUS_BUCKET_METERS);
+}
+
+export function placesCacheKey(parts: {
+  endpoint: "nearby" | "text";
+  fieldMask: string;
+  lat?: number;
+  lng?: number;
+  radiusMeters?: number;
+  includedTypes?: string[];
+  textQuery?: string;
+  maxResults?: number;
+}) {
+  return [
+    parts.endpoint,
+    parts.lat != null && parts.lng != null
+      ? `${quantiseCoordinate(parts.lat)},${quantiseCoordinate(parts.lng)}`
+      : "-",
+    parts.radiusMeters != null ? quantiseRadius(parts.radiusMeters) : "-",
+    parts.includedTypes ? [...parts.includedTypes].sort().join("|") : "-",
+    parts.textQuery ? parts.textQuery.trim().toLowerCase().replace(/\s+/g, " ") : "-",
+    parts.maxResults ?? "-",
+    parts.fieldMask,
+  ].join("~");
+}
+
+function refresh<T>(key: string, fetcher: () => Promise<T>): Promise<T> {
+  const pending = inFlight.get(key);
+  if (pending) return pending as Promise<T>;
+  const request = fetcher()
+    .then((value) => {
+      void placesCache.set(key, value);
+      return value;
+    })
+    .finally(() => {
+      inFlight.delete(key);
+    });
+  inFlight.set(key, request);
+  return request;
+}
+
+/**
+ * Serve a Places response from cache.
+ *
+ * Fresh entries are returned directly. Stale entries are returned at once
+ * while a background refresh runs. Misses wait for `fetcher`. Concurrent
+ * requests for the same key share a single network call. `span`, when given,
+ * records which of these happened.
+ */
+export async function cachedPlacesRequest<T>(
+  key: string,
+  fetcher: () => Promise<T>,
+  span?: Span,
+): Promise<T> {
+  const hit = await placesCache.lookup(key);
+  if (hit) {
+    span?.set({ cache: hit.stale ? "stale" : "hit" });
+    if (hit.stale) {
+      refresh(key, fetcher).catch((error) => {
+        console.warn("Background Places refresh failed", error);
+      });
+    }
+    return hit.value as T;
+  }
+  span?.set({ cache: inFlight.has(key) ? "coalesced" : "miss" });
+  return refresh(key, fetcher);
+}
@@ -0,0 +1,224 @@
+import { isAbortError, withAbort } from "../lib/abort";
+import { createPersistentCache } from "../lib/cache";
+import type { LatLng } from "../lib/geo";
+import { httpFetch } from "../lib/http";
+import { readJson, traceCall } from "../lib/tracing";
+import type { Span } from "../lib/tracing";
+import type { DayWeather } from "../types";
+
+const OPEN_METEO_FORECAST_ENDPOINT = "https://api.open-meteo.com/v1/forecast";
+const DAILY_FIELDS = "weathercode,temperature_2m_max,temperature_2m_min,precipitation_probability_max";
+
+// Open-Meteo forecasts 16 days ahead, today included.
+const FORECAST_DAYS = 16;
+// 0.1° (~11 km) is about the resolution of the forecast models, so every
+// point in a city shares one cell.
+const CELL_DEGREES = 0.1;
+const WEATHER_TTL_MS = 3 * 60 * 60 * 1000;
+const WET_DAY_CHANCE = 0.6;
+
+const weatherCache = createPersistentCache<DayWeather>({
+  storageKey: "plangenie.cache.weather",
+  // A 16-day forecast for a dozen cities, with room to spare.
+  maxEntries: 400,
+  ttlMs: WEATHER_TTL_MS,
+});
+
+const inFlight = new Map<string, Promise<DayWeather | undefined>>();
+
+/** Forecast for a point on a date (YYYY-MM-DD), from what has been loaded. */
+export type WeatherLookup = (point: LatLng, dateISO: string) => DayWeather | undefined;
+
+export function weatherCodeToSummary(code: number | null | undefined) {
+  if (code == null) return "Mixed conditions";
+  if (code === 0) return "Clear sky";
+  if ([1, 2, 3].includes(code)) return "Partly cloudy";
+  if ([45, 48].includes(code)) return "Foggy";
+  if ([51, 53, 55, 56, 57].includes(code)) return "Drizzle";
+  if ([61, 63, 65, 66, 67].includes(code)) return "Rain";
+  if ([71, 73, 75, 77].includes(code)) return "Snow";
+  if ([80, 81, 82].includes(code)) return "Showers";
+  if ([95, 96, 99].includes(code)) return "Thunderstorms";
+  return "Varied weather";
+}
+
+/** Likely rain or snow: a high precipitation chance, or a wet code when the chance is unknown. */
+export function isWetDay(weather?: DayWeather) {
+  if (!weather) return false;
+  if (weather.precipitationChance != null) return weather.precipitationChance >= WET_DAY_CHANCE;
+  return weather.code != null && weather.code >= 51;
+}
+
+/** One line for a day, e.g. "Rain, 12–18°C, 80% chance of rain". */
+export function describeWeather(weather: DayWeather) {
+  const parts = [weather.summary];
+  if (weather.lowC != null && weather.highC != null) {
+    parts.push(`${Math.round(weather.lowC)}–${Math.round(weather.highC)}°C`);
+  }
+  if (weather.precipitationChance != null && weather.precipitationChance >= 0.3) {
+    parts.push(`${Math.round(weather.precipitationChance * 100)}% chance of rain`);
+  }
+  return parts.join(", ");
+}
+
+/** Outlook for a whole trip, e.g. "Mostly partly cloudy, 11–24°C, rain likely on 2 days". */
+export function summariseWeather(days: Array<DayWeather | undefined>) {
+  const known = days.filter((day): day is DayWeather => !!day);
+  if (!known.length) return undefined;
+  const counts = new Map<string, number>();
+  known.forEach((day) => counts.set(day.summary, (counts.get(day.summary) ?? 0) + 1));
+  const [common] = Array.from(counts).sort((a, b) => b[1] - a[1])[0];
+  const parts = [known.length > 1 ? `Mostly ${common.toLowerCase()}` : common];
+  const lows = known.map((day) => day.lowC).filter((t): t is number => t != null);
+  const highs = known.map((day) => day.highC).filter((t): t is number => t != null);
+  if (lows.length && highs.length) {
+    parts.push(`${Math.round(Math.min(...lows))}–${Math.round(Math.max(...highs))}°C`);
+  }
+  const wet = known.filter((day) => isWetDay(day)).length;
+  if (wet) parts.push(`rain likely on ${wet} ${wet === 1 ? "day" : "days"}`);
+  return parts.join(", ");
+}
+
+function toCell(point: LatLng): LatLng {
+  const snap = (value: number) => Number((Math.round(value / CELL_DEGREES) * CELL_DEGREES).toFixed(1));
+  return { lat: snap(point.lat), lng: snap(point.lng) };
+}
+
+function cellKey(cell: LatLng) {
+  return `${cell.lat},${cell.lng}`;
+}
+
+function isoDate(date: Date) {
+  return date.toISOString().slice(0, 10);
+}
+
+// Dates from start to end inclusive, clipped to what is forecastable today.
+function forecastDates(startISO: string, endISO: string) {
+  const today = new Date();
+  const first = isoDate(today);
+  today.setUTCDate(today.getUTCDate() + FORECAST_DAYS - 1);
+  const last = isoDate(today);
+
+  const dates: string[] = [];
+  const cursor = new Date(`${startISO.slice(0, 10)}T00:00:00Z`);
+  const end = endISO.slice(0, 10) < last ? endISO.slice(0, 10) : last;
+  if (Number.isNaN(cursor.getTime())) return dates;
+  while (isoDate(cursor) <= end) {
+    const date = isoDate(cursor);
+    if (date >= first) dates.push(date);
+    cursor.setUTCDate(cursor.getUTCDate() + 1);
+  }
+  return dates;
+}
+
+function toNumber(value: unknown) {
+  return typeof value === "number" && Number.isFinite(value) ? value : null;
+}
+
+// One request for every cell; Open-Meteo answers a list of coordinates with a
+// list of forecasts in the same order.
+async function fetchForecasts(cells: LatLng[], startISO: string, endISO: string, span?: Span) {
+  const url =
+    `${OPEN_METEO_FORECAST_ENDPOINT}?latitude=${cells.map((cell) => cell.lat).join(",")}` +
+    `&longitude=${cells.map((cell) => cell.lng).join(",")}` +
+    `&daily=${DAILY_FIELDS}&timezone=auto&start_date=${startISO}&end_date=${endISO}`;
+  const response = await httpFetch(url, { span });
+  if (!response.ok) {
+    throw new Error(`Open-Meteo request failed: ${response.status} ${await response.text()}`);
+  }
+  const json = await readJson<any>(response, span);
+  const forecasts: any[] = Array.isArray(json) ? json : [json];
+
+  const found = new Map<string, DayWeather>();
+  cells.forEach((cell, i) => {
+    const daily = forecasts[i]?.daily ?? {};
+    const dates: unknown[] = Array.isArray(daily.time) ? daily.time : [];
+    dates.forEach((date, d) => {
+      if (typeof date !== "string") return;
+      const code = toNumber(daily.weathercode?.[d]);
+      const chance = toNumber(daily.precipitation_probability_max?.[d]);
+      const weather: DayWeather = {
+        date,
+        code,
+        summary: weatherCodeToSummary(code),
+        highC: toNumber(daily.temperature_2m_max?.[d]),
+        lowC: toNumber(daily.temperature_2m_min?.[d]),
+        precipitationChance: chance != null ? chance / 100 : null,
+      };
+      const key = `${cellKey(cell)}|${date}`;
+      found.set(key, weather);
+      void weatherCache.set(key, weather);
+    });
+  });
+  return found;
+}
+
+/**
+ * Daily forecasts for every point over a date range, in at most one request.
+ *
+ * Points are snapped to a grid and each cell/date is cached, so a city that
+ * was already looked up (or is being looked up) costs nothing, and all the
+ * cells still missing go out together. Dates outside the forecast horizon are
+ * skipped. A failed request is logged and leaves those days without weather;
+ * only an abort rejects.
+ */
+export function loadWeather(
+  points: LatLng[],
+  startISO: string,
+  endISO: string,
+  options: { span?: Span; signal?: AbortSignal } = {},
+): Promise<WeatherLookup> {
+  const found = new Map<string, DayWeather>();
+  const lookup: WeatherLookup = (point, dateISO) => found.get(`${cellKey(toCell(point))}|${dateISO}`);
+  const dates = forecastDates(startISO, endISO);
+  const cells = Array.from(new Map(points.map(toCell).map((cell) => [cellKey(cell), cell])).values());
+  if (!dates.length || !cells.length) return Promise.resolve(lookup);
+
+  return traceCall(options.span, "openMeteo", { locations: cells.length, days: dates.length }, async (span) => {
+    const missing: LatLng[] = [];
+    const waits: Promise<unknown>[] = [];
+    for (const cell of cells) {
+      let cellMissing = false;
+      for (const date of dates) {
+        const key = `${cellKey(cell)}|${date}`;
+        const cached = await weatherCache.get(key);
+        if (cached) {
+          found.set(key, cached);
+          continue;
+        }
+        const pending = inFlight.get(key);
+        if (pending) {
+          waits.push(pending.then((weather) => weather && found.set(key, weather)));
+          continue;
+        }
+        cellMissing = true;
+      }
+      if (cellMissing) missing.push(cell);
+    }
+
+    if (missing.length) {
+      const request = fetchForecasts(missing, dates[0], dates[dates.length - 1], span);
+      const keys = missing.flatMap((cell) => dates.map((date) => `${cellKey(cell)}|${date}`));
+      keys.forEach((key) => {
+        inFlight.set(key, request.then((result) => result.get(key), () => undefined));
+      });
+      waits.push(
+        request
+          .then((result) => result.forEach((weather, key) => found.set(key, weather)))
+          .catch((error) => {
+            span?.set({ failed: true });
+            console.warn("Weather lookup failed", error);
+          })
+          .finally(() => keys.forEach((key) => inFlight.delete(key))),
+      );
+    }
+    span?.set({ cache: missing.length ? "miss" : waits.length ? "coalesced" : "hit" });
+
+    try {
+      await withAbort(Promise.all(waits), options.signal);
+    } catch (error) {
+      if (isAbortError(error)) throw error;
+    }
+    return lookup;
+  });
+}
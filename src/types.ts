@@ -32,6 +32,26 @@ export interface Activity extends PlaceLite {
   end?: string;
   estimatedCost: number;
   notes?: string;
+  /** Estimated transfer from the previous stop of the day, when known. */
+  travelMinutesFromPrevious?: number;
+  travelModeFromPrevious?: "walking" | "transit";
+}
+
+export interface MealTimes {
+  breakfast: string; // "HH:MM", local time
+  lunch: string;
+  dinner: string;
+}
+
+export interface DayWeather {
+  date: string; // YYYY-MM-DD, local to the forecast location
+  /** WMO weather code as reported by Open-Meteo. */
+  code: number | null;
+  summary: string;
+  highC: number | null;
+  lowC: number | null;
+  /** 0..1 */
+  precipitationChance: number | null;
 }
 
 export interface DayPlan {
@@ -45,6 +65,8 @@ export interface DayPlan {
   dinner: Activity;
   evening?: Activity;
   totalEstimatedCost: number;
+  /** Forecast for the day, when it is within the forecast horizon. */
+  weather?: DayWeather;
 }
 
 export interface CityStay {
@@ -17,6 +17,17 @@ export type PlannerFormValues = {
   budgetUsd?: number;
 };
 
+export type PlanningStage = 'geocode' | 'places' | 'weather' | 'locate' | 'generate';
+
+export type PlanningStageStatus = 'pending' | 'running' | 'done' | 'failed';
+
+export type PlanningProgress = {
+  stages: Record<PlanningStage, PlanningStageStatus>;
+  /** Days of the itinerary shown so far, out of `dayCount`. */
+  daysReady: number;
+  dayCount: number;
+};
+
 export type ItineraryStopCategory = 'food' | 'activity' | 'transport' | 'break' | 'misc';
 
 export type ItineraryStop = {
@@ -27,6 +38,8 @@ export type ItineraryStop = {
   description: string;
   google_maps_url: string;
   photo_url: string;
+  /** Places photo resource name, used to request sized variants and cache them. */
+  photo_name?: string;
   website_url?: string;
   estimated_cost: string;
   estimated_price_usd: number;
@@ -77,5 +90,19 @@ export type SavedItineraryRecord = {
   end_date: string;
   itinerary_data: TripItinerary;
   created_at: string;
+  updated_at?: string;
 };
 
+/** List row for a saved trip: the record without its itinerary, plus budget fields. */
+export type SavedTripSummary = Omit<SavedItineraryRecord, 'itinerary_data'> &
+  Partial<
+    Pick<
+      TripItinerary,
+      | 'currency'
+      | 'budget_usd'
+      | 'budget_converted'
+      | 'daily_budget_usd'
+      | 'daily_budget_converted'
+    >
+  >;
+
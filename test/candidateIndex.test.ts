@@ -0,0 +1,189 @@
+/**
+ * Activity picks of the day planner, checked against a copy of the sort-based
+ * scan they replaced over randomised pools.
+ *
+ *   npm test
+ */
+import "../bench/plan/shims";
+
+import assert from "node:assert/strict";
+import { test } from "node:test";
+
+import { slotsForDay } from "../src/engine/candidatePool";
+import type { ActivityCandidate, CityStayPool } from "../src/engine/candidatePool";
+import { chooseActivityCandidate, estimateActivityCostFromPriceLevel } from "../src/engine/createPlan";
+import type { Interest, PriceLevel } from "../src/types";
+
+const MIN_ACTIVITY_SLOT_COST = 8;
+const CATEGORIES: Interest[] = ["culture", "museums", "parks", "art", "landmarks", "shopping", "food"];
+const NAMES = ["Atlas", "Borough", "Canal", "Dome", "Easel", "Forum", "Gallery", "Harbour"];
+
+type ActivitySelection = { place: ActivityCandidate; cost: number; category: Interest };
+
+type Options = Parameters<typeof chooseActivityCandidate>[0];
+
+// Copy of chooseActivityCandidate from before the sort was replaced.
+function sortedPick(options: Options): ActivitySelection | undefined {
+  const { sortedCandidates, usedIds, blockedIds, allowReuse, budgetRemaining, slotsRemaining } = options;
+
+  const skipUsed = (candidate: ActivityCandidate) => !allowReuse && usedIds.has(candidate.id);
+
+  let base = sortedCandidates.filter((candidate) => !skipUsed(candidate));
+  if (!base.length) {
+    base = [...sortedCandidates];
+  }
+  let withoutBlocked = base.filter((candidate) => !blockedIds.has(candidate.id));
+  if (!withoutBlocked.length) {
+    withoutBlocked = base;
+  }
+  let available = withoutBlocked;
+  if (!available.length) {
+    available = [...sortedCandidates];
+  }
+  if (!available.length) return undefined;
+
+  const scored = available.map<ActivitySelection>((candidate) => {
+    const category = (candidate._category ?? "landmarks") as Interest;
+    const cost = estimateActivityCostFromPriceLevel(category, candidate.priceLevel);
+    return { place: candidate, category, cost };
+  });
+
+  const nonFood = scored.filter((item) => item.category !== "food");
+  const pool = nonFood.length ? nonFood : scored;
+
+  const safeRemaining = Math.max(0, budgetRemaining);
+  const reserve = Math.max(0, slotsRemaining * MIN_ACTIVITY_SLOT_COST);
+  const baseAllowance = Math.max(0, Math.min(safeRemaining - reserve, safeRemaining));
+  const tolerance = Math.max(5, baseAllowance * 0.5);
+  const limit = baseAllowance + tolerance;
+
+  const affordable = pool.filter((item) => item.cost <= limit + 2 || safeRemaining === 0);
+  const consider = (affordable.length ? affordable : pool).slice();
+
+  consider.sort((a, b) => {
+    if (affordable.length) {
+      const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
+      if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
+      const reviewsDiff = (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
+      if (reviewsDiff !== 0) return reviewsDiff;
+      const costDiff = a.cost - b.cost;
+      if (costDiff !== 0) return costDiff;
+      return (a.place.name ?? "").localeCompare(b.place.name ?? "");
+    }
+    const costDiff = a.cost - b.cost;
+    if (costDiff !== 0) return costDiff;
+    const ratingDiff = (b.place.rating ?? 0) - (a.place.rating ?? 0);
+    if (Math.abs(ratingDiff) > 0.15) return ratingDiff;
+    return (b.place.userRatingsTotal ?? 0) - (a.place.userRatingsTotal ?? 0);
+  });
+
+  return consider[0];
+}
+
+// Small deterministic PRNG, so a failure can be replayed.
+function mulberry32(seed: number) {
+  return () => {
+    seed |= 0;
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function place(id: string, fields: Partial<ActivityCandidate>): ActivityCandidate {
+  return { id, name: id, lat: 48.85, lng: 2.35, googleMapsUri: "", _category: "landmarks", ...fields };
+}
+
+function randomPlaces(count: number, prefix: string, rand: () => number, categories: Interest[]) {
+  const pick = <T>(values: T[]) => values[Math.floor(rand() * values.length)];
+  return Array.from({ length: count }, (_, i) =>
+    place(`${prefix}${i}`, {
+      // Few names and one-decimal ratings, so ties and rating cycles are common.
+      name: pick(NAMES),
+      rating: rand() < 0.05 ? undefined : Math.round((3.8 + rand() * 1.2) * 10) / 10,
+      userRatingsTotal: rand() < 0.3 ? pick([10, 100, 1000]) : Math.floor(rand() * 5000),
+      priceLevel: rand() < 0.2 ? undefined : (Math.floor(rand() * 5) as PriceLevel),
+      _category: pick(categories),
+    }),
+  );
+}
+
+test("a rating cycle is resolved exactly as the sort resolved it", () => {
+  // 4.5/10 beats 4.3/1000, which beats 4.4/100, which beats 4.5/10.
+  const candidates = [
+    place("a", { rating: 4.5, userRatingsTotal: 10 }),
+    place("b", { rating: 4.3, userRatingsTotal: 1000 }),
+    place("c", { rating: 4.4, userRatingsTotal: 100 }),
+  ];
+  for (const order of [[0, 1, 2], [0, 2, 1], [1, 0, 2], [1, 2, 0], [2, 0, 1], [2, 1, 0]]) {
+    const options: Options = {
+      sortedCandidates: order.map((i) => candidates[i]),
+      usedIds: new Set(),
+      blockedIds: new Set(),
+      allowReuse: false,
+      budgetRemaining: 100,
+      slotsRemaining: 1,
+    };
+    assert.equal(chooseActivityCandidate(options)?.place.id, sortedPick(options)?.place.id, `order ${order}`);
+  }
+});
+
+test("activity picks match the sort-based scan over random pools", () => {
+  let picks = 0;
+  for (const size of [1, 3, 8, 20, 60, 150, 250]) {
+    for (const dayCount of [1, 2, 5, 14, 30]) {
+      const rand = mulberry32(size * 100 + dayCount);
+      for (let trial = 0; trial < 6; trial++) {
+        const pool: CityStayPool = {
+          dayCount,
+          meals: randomPlaces(Math.ceil(size / 2), "m", rand, ["food"]),
+          activities: randomPlaces(size, "a", rand, CATEGORIES),
+          nightlife: randomPlaces(Math.ceil(size / 4), "n", rand, ["nightlife"]),
+        };
+        const budgetPerDay = [0, 20, 45, 80, 150, 400][Math.floor(rand() * 6)];
+
+        for (let day = 0; day < dayCount; day++) {
+          const slots = slotsForDay(pool, day);
+          const label = `pool ${size}, ${dayCount} days, trial ${trial}, day ${day}`;
+          const used = new Set<string>();
+          const blocked = new Set(slots.meals.slice(0, 3).map((meal) => meal.id));
+          const allowReuse = new Set(slots.activities.map((a) => a.id)).size < 2;
+          let budget = Math.max(0, budgetPerDay - 40);
+
+          for (let slot = 0; slot < 4 && slots.activities.length; slot++) {
+            const options: Options = {
+              sortedCandidates: slots.activities,
+              usedIds: used,
+              blockedIds: blocked,
+              allowReuse,
+              budgetRemaining: budget,
+              slotsRemaining: 3 - slot,
+            };
+            const expected = sortedPick(options);
+            assert.deepEqual(chooseActivityCandidate(options), expected, `${label}, slot ${slot}`);
+            picks++;
+            if (!expected) break;
+            used.add(expected.place.id);
+            blocked.add(expected.place.id);
+            budget = Math.max(0, budget - expected.cost);
+          }
+
+          if (slots.nightlife.length) {
+            const options: Options = {
+              sortedCandidates: slots.nightlife,
+              usedIds: used,
+              blockedIds: blocked,
+              allowReuse: true,
+              budgetRemaining: Math.max(12, budget),
+              slotsRemaining: 0,
+            };
+            assert.deepEqual(chooseActivityCandidate(options), sortedPick(options), `${label}, evening`);
+            picks++;
+          }
+        }
+      }
+    }
+  }
+  assert.ok(picks > 5000);
+});
@@ -0,0 +1,98 @@
+/**
+ * Call budgets and retries of the shared HTTP client, with `fetch` scripted.
+ *
+ *   npm test
+ */
+import assert from "node:assert/strict";
+import { beforeEach, test } from "node:test";
+
+import { createCallBudget, httpFetch, isCallBudgetError, withCallBudget } from "../src/lib/http";
+import { setTracingEnabled, startTrace } from "../src/lib/tracing";
+
+type Reply = (url: string) => Response | Promise<Response>;
+
+let reply: Reply = () => new Response("{}", { status: 200 });
+globalThis.fetch = (async (input: RequestInfo | URL) => reply(String(input))) as typeof fetch;
+
+const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+if (!process.env.TEST_VERBOSE) console.warn = () => undefined;
+
+beforeEach(() => {
+  reply = () => new Response("{}", { status: 200 });
+});
+
+test("each run's requests are charged to its own budget", async () => {
+  const first = createCallBudget({ "a.test": 10 });
+  const second = createCallBudget({ "a.test": 10 });
+  const firstRun = withCallBudget(undefined, first).child("geocode");
+
+  // The first run is superseded while its request is still out; the request
+  // finishes, and is retried, after the second run has started.
+  let slowCalls = 0;
+  reply = async (url) => {
+    const busy = url.endsWith("/slow") && ++slowCalls === 1;
+    await delay(20);
+    return new Response("{}", { status: busy ? 503 : 200 });
+  };
+  const late = httpFetch("https://a.test/slow", { span: firstRun, retries: 1 });
+  await delay(5);
+  const secondRun = withCallBudget(undefined, second);
+  await httpFetch("https://a.test/fast", { span: secondRun.child("geocode") });
+  await late;
+
+  assert.deepEqual(first.used, { "a.test": 2 });
+  assert.deepEqual(second.used, { "a.test": 1 });
+});
+
+test("a spent budget refuses further requests to that host", async () => {
+  const budget = createCallBudget({ "b.test": 2 });
+  const span = withCallBudget(undefined, budget);
+  const results = await Promise.allSettled(
+    Array.from({ length: 3 }, () => httpFetch("https://b.test/x", { span })),
+  );
+  assert.deepEqual(
+    results.map((result) => result.status),
+    ["fulfilled", "fulfilled", "rejected"],
+  );
+  assert.ok(isCallBudgetError((results[2] as PromiseRejectedResult).reason));
+  assert.deepEqual(budget.refused, { "b.test": 1 });
+
+  // Requests outside a run are not counted against anything.
+  assert.equal((await httpFetch("https://b.test/x")).status, 200);
+});
+
+test("the budget follows traced spans too", async () => {
+  setTracingEnabled(true);
+  try {
+    const budget = createCallBudget({ "c.test": 5 });
+    const trace = startTrace("plan")!;
+    const run = withCallBudget(trace, budget);
+    const call = run.child("stage").child("places");
+    await httpFetch("https://c.test/x", { span: call });
+    call.end();
+    assert.deepEqual(budget.used, { "c.test": 1 });
+    assert.equal(trace.toJSON().children[0].children[0].name, "places");
+  } finally {
+    setTracingEnabled(false);
+  }
+});
+
+test("retryable responses release their body before backing off", async () => {
+  let cancelled = 0;
+  let calls = 0;
+  reply = () => {
+    calls += 1;
+    if (calls > 1) return new Response("{}", { status: 200 });
+    const body = new ReadableStream({
+      pull: (controller) => controller.enqueue(new TextEncoder().encode("busy")),
+      cancel: () => {
+        cancelled += 1;
+      },
+    });
+    return new Response(body, { status: 429 });
+  };
+  const response = await httpFetch("https://d.test/x", { retries: 1 });
+  assert.equal(response.status, 200);
+  assert.equal(cancelled, 1);
+});
@@ -0,0 +1,165 @@
+/**
+ * Sync queue of the saved-trip store, run against the real supabase client
+ * with `fetch` swapped for a scripted server.
+ *
+ *   npm test
+ */
+import "../bench/plan/shims";
+
+import assert from "node:assert/strict";
+import { beforeEach, test } from "node:test";
+
+type Sent = { method: string; url: string; body: string };
+type Reply = () => Response | Promise<Response>;
+
+const sent: Sent[] = [];
+let reply: Reply = () => new Response(null, { status: 201 });
+
+// supabase captures `fetch` when the client is created, so this goes first.
+globalThis.fetch = (async (input: RequestInfo | URL, init?: RequestInit) => {
+  sent.push({ method: init?.method ?? "GET", url: String(input), body: String(init?.body ?? "") });
+  return reply();
+}) as typeof fetch;
+
+// Required rather than imported so it loads after the swap above.
+const store = require("../src/lib/itineraryStore") as typeof import("../src/lib/itineraryStore");
+
+const offline: Reply = () => {
+  throw new TypeError("Network request failed");
+};
+const ok: Reply = () => new Response(null, { status: 201 });
+const status = (code: number, body: object = {}): Reply => () =>
+  new Response(JSON.stringify(body), { status: code, headers: { "content-type": "application/json" } });
+
+const itinerary = (name: string) =>
+  ({ trip_name: name, destination: "Lisbon", start_date: "2026-05-01", end_date: "2026-05-03", days: [] }) as any;
+
+let users = 0;
+
+// Opening a store flushes whatever the last session left; let that pass first
+// so each test counts only its own requests.
+const newUser = async () => {
+  const userId = `user-${++users}`;
+  await store.loadStoredTrips(userId);
+  await new Promise((resolve) => setTimeout(resolve, 5));
+  return userId;
+};
+
+const save = (userId: string, name = "Lisbon") =>
+  store.saveTrip(userId, {
+    trip_name: name,
+    destination: "Lisbon",
+    start_date: "2026-05-01",
+    end_date: "2026-05-03",
+    itinerary_data: itinerary(name),
+  });
+
+// Requests about one trip; a late timer from an earlier test cannot leak in.
+const requestsFor = (tripId: string) =>
+  sent.filter((request) => request.url.includes(tripId) || request.body.includes(tripId));
+
+if (!process.env.TEST_VERBOSE) console.warn = () => undefined;
+
+beforeEach(() => {
+  reply = ok;
+});
+
+test("network failures never drop a queued save", async () => {
+  const userId = await newUser();
+  reply = offline;
+  const trip = await save(userId);
+
+  for (let i = 0; i < 12; i++) await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 12);
+
+  // The server has never seen the trip, but its unsent insert keeps it listed.
+  const merged = await store.mergeServerTrips(userId, { trips: [], hasMore: false });
+  assert.deepEqual(
+    merged.map((summary) => summary.id),
+    [trip.id],
+  );
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  const last = requestsFor(trip.id).at(-1)!;
+  assert.equal(last.method, "POST");
+
+  // Once sent, nothing is left to retry.
+  await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 13);
+});
+
+test("5xx and 429 responses are retried without limit", async () => {
+  const userId = await newUser();
+  const trip = await save(userId);
+  let calls = 0;
+  reply = () => (++calls % 2 ? status(503)() : status(429)());
+
+  for (let i = 0; i < 10; i++) await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 10);
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 11);
+});
+
+test("a change the server keeps rejecting is dropped after five tries", async () => {
+  const userId = await newUser();
+  const trip = await save(userId);
+  reply = status(400, { code: "23502", message: "null value in column", details: null, hint: null });
+
+  for (let i = 0; i < 5; i++) await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 5);
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 5);
+});
+
+test("offline attempts do not count towards dropping a rejected change", async () => {
+  const userId = await newUser();
+  const trip = await save(userId);
+  reply = offline;
+  for (let i = 0; i < 6; i++) await store.syncStoredTrips(userId);
+
+  reply = status(400, { code: "23502", message: "null value in column", details: null, hint: null });
+  await store.syncStoredTrips(userId);
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).at(-1)!.method, "POST");
+  assert.equal(requestsFor(trip.id).length, 8);
+});
+
+test("edits to an unsent trip fold into its insert", async () => {
+  const userId = await newUser();
+  reply = offline;
+  const trip = await save(userId, "Draft");
+  await store.syncStoredTrips(userId);
+  await store.renameTrip(userId, trip.id, "Lisbon long weekend");
+  await store.renameTrip(userId, trip.id, "Lisbon in May");
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  const requests = requestsFor(trip.id);
+  assert.deepEqual(
+    requests.map((request) => request.method),
+    ["POST", "POST"],
+  );
+  const [row] = JSON.parse(requests[1].body);
+  assert.equal(row.trip_name, "Lisbon in May");
+  assert.equal(row.itinerary_data.trip_name, "Lisbon in May");
+});
+
+test("deleting a trip the server never saw sends nothing", async () => {
+  const userId = await newUser();
+  reply = offline;
+  const trip = await save(userId);
+  await store.deleteTrip(userId, trip.id);
+
+  reply = ok;
+  await store.syncStoredTrips(userId);
+  assert.equal(requestsFor(trip.id).length, 0);
+  assert.deepEqual(await store.loadStoredTrips(userId), []);
+});
@@ -0,0 +1,51 @@
+/**
+ * Streaming extraction of array elements, as used for itinerary days.
+ *
+ *   npm test
+ */
+import assert from "node:assert/strict";
+import { test } from "node:test";
+
+import { createJsonArrayStreamParser } from "../src/lib/jsonStream";
+
+const doc =
+  '```json\n{"days": [{"date":"d1","stops":[{"title":"A \\"}{[ x"}]}, {"date":"d2","stops":[]},\n' +
+  ' {"date":"d3","summary":{"pace":"x]"}}], "trip_name":"T"}\n```';
+
+// Feed `text` in chunks of `size` characters.
+const feed = (parser: { push: (text: string) => void }, text: string, size: number) => {
+  for (let i = 0; i < text.length; i += size) parser.push(text.slice(i, i + size));
+};
+
+if (!process.env.TEST_VERBOSE) console.warn = () => undefined;
+
+test("reports every element with its index, however the text is chunked", () => {
+  for (const size of [1, 3, 7, doc.length]) {
+    const seen: string[] = [];
+    const parser = createJsonArrayStreamParser("days", (day, index) => seen.push(`${index}:${day.date}`));
+    feed(parser, doc, size);
+    assert.deepEqual(seen, ["0:d1", "1:d2", "2:d3"], `chunk size ${size}`);
+    assert.equal(parser.count, 3);
+  }
+});
+
+test("an unparseable element is skipped but keeps its index", () => {
+  const seen: string[] = [];
+  const parser = createJsonArrayStreamParser("days", (day, index) => seen.push(`${index}:${day.date}`));
+  feed(parser, '{"days": [{"date":"d1"}, {"date": d2}, {"date":"d3"}]}', 5);
+  assert.deepEqual(seen, ["0:d1", "2:d3"]);
+  assert.equal(parser.count, 3);
+});
+
+test("errors from the callback propagate without derailing the scan", () => {
+  const seen: string[] = [];
+  const parser = createJsonArrayStreamParser("days", (day, index) => {
+    if (day.date === "d2") throw new Error("bad day");
+    seen.push(`${index}:${day.date}`);
+  });
+  parser.push('{"days": [{"date":"d1"}, {"date":"d2"');
+  assert.throws(() => parser.push('}, {"date":"d3"'), /bad day/);
+  parser.push('}]}');
+  assert.deepEqual(seen, ["0:d1", "2:d3"]);
+  assert.equal(parser.count, 3);
+});
@@ -0,0 +1,35 @@
+/**
+ * Matching model-written stop titles to place candidates by name.
+ *
+ *   npm test
+ */
+import assert from "node:assert/strict";
+import { test } from "node:test";
+
+import { createPlaceIndex } from "../src/lib/placeIndex";
+
+const names = [
+  "Park Hyatt Paris",
+  "Rodin Museum",
+  "Musée d'Orsay",
+  "Jardin du Luxembourg",
+  "La Sainte-Chapelle de Paris",
+  "Notre-Dame Cathedral",
+];
+const index = createPlaceIndex(names.map((name, i) => ({ name, placeId: `p${i}` })));
+const match = (title: string) => index.match(title)?.name;
+
+test("spelling variants and partial names find their place", () => {
+  assert.equal(match("Musee d Orsay"), "Musée d'Orsay");
+  assert.equal(match("Jardin Luxembourg"), "Jardin du Luxembourg");
+  assert.equal(match("Sainte Chapelle"), "La Sainte-Chapelle de Paris");
+  assert.equal(match("The Rodin Museum"), "Rodin Museum");
+  assert.equal(match("Notre Dame"), "Notre-Dame Cathedral");
+});
+
+test("a single word does not match every name containing it", () => {
+  assert.equal(match("Park"), undefined);
+  assert.equal(match("Museum"), undefined);
+  assert.equal(match("Paris"), undefined);
+  assert.equal(match("Hyatt"), undefined);
+});